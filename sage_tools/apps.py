@@ -4,3 +4,21 @@ from django.apps import AppConfig
 class SageToolsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "sage_tools"
+
+    def ready(self):
+        from django.core import checks
+
+        from sage_tools.mixins.views.access import check_login_urls
+
+        checks.register(check_login_urls, checks.Tags.urls)
+
+        if self.apps.is_installed("django.contrib.auth"):
+            from django.contrib.auth.signals import user_logged_in
+
+            from sage_tools.mixins.views.access import record_login_time
+            from sage_tools.services.group import GroupMembershipService
+
+            GroupMembershipService.connect_signals()
+            user_logged_in.connect(
+                record_login_time, dispatch_uid="sage_tools_record_login_time"
+            )
@@ -1,5 +1,6 @@
 from .base import Encryptor
 from .dummy import DummyEncryptor
 from .fernet_encrypt import FernetEncryptor
+from .registry import EncryptorRegistry
 
-__all__ = ["Encryptor", "DummyEncryptor", "FernetEncryptor"]
+__all__ = ["Encryptor", "DummyEncryptor", "FernetEncryptor", "EncryptorRegistry"]
@@ -0,0 +1,286 @@
+"""Micro-benchmarks for the encryptors in `sage_tools.encryptors`.
+
+The harness measures encrypt and decrypt throughput (operations and bytes
+per second) for every encryptor across a range of payload sizes and thread
+counts, and reports the results as JSON so they can be stored and compared
+between releases.
+
+Usage:
+    python -m sage_tools.encryptors.benchmark
+    python -m sage_tools.encryptors.benchmark --sizes 16 4096 --threads 1 4
+    python -m sage_tools.encryptors.benchmark --encryptor myapp.crypto.MyEncryptor
+
+"""
+
+import argparse
+import inspect
+import json
+import platform
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from django.utils.module_loading import import_string
+
+from .base import Encryptor
+from .dummy import DummyEncryptor
+from .fernet_encrypt import FernetEncryptor
+
+try:
+    from cryptography.fernet import Fernet
+except ImportError:
+    raise ImportError("Install `cryptography` package. Run `pip install cryptography`.")
+
+DEFAULT_SIZES = (16, 256, 4096, 65536, 1048576)
+DEFAULT_THREADS = (1, 4)
+OPERATIONS = ("encrypt", "decrypt")
+
+
+@dataclass
+class BenchmarkResult:
+    """A data class representing a single benchmark measurement."""
+
+    encryptor: str
+    operation: str
+    payload_size: int
+    threads: int
+    operations: int
+    seconds: float
+    ops_per_second: float
+    bytes_per_second: float
+
+
+class EncryptorBenchmark:
+    """Measures encrypt/decrypt throughput of a set of encryptors.
+
+    Each (encryptor, operation, payload size, thread count) combination is run
+    for at least `duration` seconds. The threads share one encryptor instance,
+    which is how encryptors are used in a Django process.
+
+    Parameters
+    ----------
+    encryptors : dict
+        Maps a display name to an `Encryptor` instance.
+    sizes : sequence of int
+        Payload sizes in bytes.
+    threads : sequence of int
+        Thread counts to run each measurement with.
+    duration : float
+        Minimum wall-clock time, in seconds, spent on each measurement.
+
+    Examples
+    --------
+    >>> benchmark = EncryptorBenchmark({"dummy": DummyEncryptor()}, sizes=[16])
+    >>> results = benchmark.run()
+    >>> print(benchmark.to_json(results))
+
+    """
+
+    def __init__(
+        self,
+        encryptors: Dict[str, Encryptor],
+        sizes: Sequence[int] = DEFAULT_SIZES,
+        threads: Sequence[int] = DEFAULT_THREADS,
+        duration: float = 0.5,
+    ):
+        if not encryptors:
+            raise ValueError("At least one encryptor is required")
+        if any(size <= 0 for size in sizes):
+            raise ValueError("Payload sizes must be positive integers")
+        if any(count <= 0 for count in threads):
+            raise ValueError("Thread counts must be positive integers")
+        if duration <= 0:
+            raise ValueError("Duration must be a positive number of seconds")
+
+        self.encryptors = encryptors
+        self.sizes = sizes
+        self.threads = threads
+        self.duration = duration
+
+    @classmethod
+    def default_encryptors(cls) -> Dict[str, Encryptor]:
+        """Returns the encryptors shipped with `sage_tools`."""
+        return {
+            "DummyEncryptor": DummyEncryptor(),
+            "FernetEncryptor": FernetEncryptor(Fernet.generate_key()),
+        }
+
+    @classmethod
+    def build_encryptor(
+        cls, dotted_path: str, secret_key: Optional[str] = None
+    ) -> Encryptor:
+        """Imports and instantiates an encryptor class from its dotted path.
+
+        Classes whose constructor takes a key receive `secret_key`, or a
+        freshly generated Fernet key when none is given.
+
+        """
+        encryptor_class = import_string(dotted_path)
+        if not (
+            inspect.isclass(encryptor_class) and issubclass(encryptor_class, Encryptor)
+        ):
+            raise TypeError(f"{dotted_path} is not an Encryptor subclass")
+
+        parameters = [
+            parameter
+            for parameter in inspect.signature(encryptor_class).parameters.values()
+            if parameter.default is inspect.Parameter.empty
+            and parameter.kind
+            in (
+                inspect.Parameter.POSITIONAL_ONLY,
+                inspect.Parameter.POSITIONAL_OR_KEYWORD,
+            )
+        ]
+        if parameters:
+            return encryptor_class(secret_key or Fernet.generate_key())
+        return encryptor_class()
+
+    def run(self) -> List[BenchmarkResult]:
+        """Runs every configured measurement and returns the results."""
+        results = []
+        for name, encryptor in self.encryptors.items():
+            for size in self.sizes:
+                payload = "x" * size
+                token = encryptor.encrypt(payload)
+                for thread_count in self.threads:
+                    results.append(
+                        self._measure(
+                            name,
+                            "encrypt",
+                            lambda: encryptor.encrypt(payload),
+                            size,
+                            thread_count,
+                        )
+                    )
+                    results.append(
+                        self._measure(
+                            name,
+                            "decrypt",
+                            lambda: encryptor.decrypt(token),
+                            size,
+                            thread_count,
+                        )
+                    )
+        return results
+
+    def _measure(
+        self,
+        name: str,
+        operation: str,
+        func: Callable[[], object],
+        size: int,
+        thread_count: int,
+    ) -> BenchmarkResult:
+        """Calls `func` repeatedly from `thread_count` threads for at least
+        `duration` seconds."""
+        counts = [0] * thread_count
+        barrier = threading.Barrier(thread_count + 1)
+        deadline = [0.0]
+
+        def worker(index):
+            barrier.wait()
+            calls = 0
+            while True:
+                func()
+                calls += 1
+                if time.perf_counter() >= deadline[0]:
+                    break
+            counts[index] = calls
+
+        workers = [
+            threading.Thread(target=worker, args=(index,))
+            for index in range(thread_count)
+        ]
+        for thread in workers:
+            thread.start()
+
+        started = time.perf_counter()
+        deadline[0] = started + self.duration
+        barrier.wait()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        total = sum(counts)
+        return BenchmarkResult(
+            encryptor=name,
+            operation=operation,
+            payload_size=size,
+            threads=thread_count,
+            operations=total,
+            seconds=round(elapsed, 6),
+            ops_per_second=round(total / elapsed, 2),
+            bytes_per_second=round(total * size / elapsed, 2),
+        )
+
+    @staticmethod
+    def to_json(results: Iterable[BenchmarkResult], indent: int = 2) -> str:
+        """Serializes benchmark results, together with the environment they
+        were measured in, to a JSON string."""
+        data = {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "results": [asdict(result) for result in results],
+        }
+        return json.dumps(data, indent=indent)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point for the benchmark harness."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark sage_tools encryptors and print JSON results."
+    )
+    parser.add_argument(
+        "--encryptor",
+        action="append",
+        dest="encryptors",
+        metavar="DOTTED_PATH",
+        help="Encryptor class to benchmark. May be repeated. "
+        "Defaults to the encryptors shipped with sage_tools.",
+    )
+    parser.add_argument(
+        "--secret-key", help="Key passed to encryptors that require one."
+    )
+    parser.add_argument(
+        "--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES), metavar="BYTES"
+    )
+    parser.add_argument(
+        "--threads", nargs="+", type=int, default=list(DEFAULT_THREADS), metavar="N"
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=0.5,
+        help="Seconds spent on each measurement.",
+    )
+    parser.add_argument("--output", help="Write the JSON report to this file.")
+    args = parser.parse_args(argv)
+
+    if args.encryptors:
+        encryptors = {
+            path.rsplit(".", 1)[-1]: EncryptorBenchmark.build_encryptor(
+                path, args.secret_key
+            )
+            for path in args.encryptors
+        }
+    else:
+        encryptors = EncryptorBenchmark.default_encryptors()
+
+    benchmark = EncryptorBenchmark(
+        encryptors, sizes=args.sizes, threads=args.threads, duration=args.duration
+    )
+    report = benchmark.to_json(benchmark.run())
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            output.write(report)
+    else:
+        sys.stdout.write(report + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
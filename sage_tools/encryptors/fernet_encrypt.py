@@ -1,7 +1,12 @@
+import base64
+import binascii
+import struct
+from typing import Optional, Union
+
 from .base import Encryptor
 
 try:
-    from cryptography.fernet import Fernet
+    from cryptography.fernet import Fernet, InvalidToken
 except ImportError:
     raise ImportError("Install `cryptography` package. Run `pip install cryptography`.")
 
@@ -20,8 +25,11 @@ class FernetEncryptor(Encryptor):
     -------
     encrypt(data: str) -> str
         Encrypts the given data using Fernet encryption.
-    decrypt(data: str) -> str
-        Decrypts the given data using Fernet encryption.
+    decrypt(data: str, ttl: int = None) -> str
+        Decrypts the given data using Fernet encryption, optionally rejecting
+        tokens older than `ttl` seconds.
+    read_timestamp(data: str) -> int
+        Returns the creation time embedded in a token without decrypting it.
 
     Examples
     --------
@@ -56,23 +64,68 @@ class FernetEncryptor(Encryptor):
         encrypted_value = self.fernet.encrypt(data)
         return encrypted_value.decode("utf-8")
 
-    def decrypt(self, data: str) -> str:
+    def decrypt(self, data: str, ttl: Optional[int] = None) -> str:
         """Decrypts the given data using Fernet encryption.
 
         Parameters
         ----------
         data : str
             The data to be decrypted.
+        ttl : int, optional
+            Maximum age of the token in seconds. Fernet compares it with the
+            timestamp embedded in the token and rejects expired tokens before
+            verifying the signature or decrypting anything.
 
         Returns
         -------
         str
             The decrypted data.
 
+        Raises
+        ------
+        InvalidToken
+            If the token is malformed, tampered with, or older than `ttl`.
+
         """
         self._validate_data(data)
         data = self._encode_data(data)
-        return self.fernet.decrypt(data).decode("utf-8")
+        return self.fernet.decrypt(data, ttl=ttl).decode("utf-8")
+
+    @staticmethod
+    def read_timestamp(data: Union[str, bytes]) -> int:
+        """Returns the creation timestamp embedded in a Fernet token.
+
+        Only the token header is decoded; the signature is not verified, so
+        the result must not be trusted for anything but expiry bookkeeping.
+        Use `decrypt(data, ttl=...)` to check a token's age authoritatively.
+
+        Parameters
+        ----------
+        data : str or bytes
+            The Fernet token.
+
+        Returns
+        -------
+        int
+            The Unix timestamp at which the token was created.
+
+        Raises
+        ------
+        InvalidToken
+            If the data does not start with a valid Fernet header.
+
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        try:
+            # 12 base64 characters decode to the 1-byte version and the
+            # 8-byte big-endian timestamp.
+            header = base64.urlsafe_b64decode(data[:12])
+        except (TypeError, binascii.Error):
+            raise InvalidToken  # noqa: B904
+        if len(header) != 9 or header[0] != 0x80:
+            raise InvalidToken
+        return struct.unpack(">Q", header[1:])[0]
 
     def _validate_data(self, data):
         """Validates the data to ensure it is either a string or bytes.
@@ -0,0 +1,89 @@
+import threading
+from typing import Dict, Tuple, Type, Union
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from .base import Encryptor
+from .fernet_encrypt import FernetEncryptor
+
+
+class EncryptorRegistry:
+    """Process-wide registry of encryptor instances.
+
+    Building a `FernetEncryptor` derives the signing and encryption keys from
+    the secret key, so creating one per request is wasted work. The registry
+    keeps a single instance per (encryptor class, key material) pair and hands
+    it out to every caller. Encryptors are stateless once built, so the same
+    instance can be shared safely between threads.
+
+    Methods
+    -------
+    get(secret_key, encryptor_class=FernetEncryptor) -> Encryptor
+        Returns the shared encryptor for the given key, building it on first use.
+    reset() -> None
+        Drops every cached encryptor, e.g. after a key rotation or in tests.
+
+    Examples
+    --------
+    >>> secret_key = Fernet.generate_key()
+    >>> EncryptorRegistry.get(secret_key) is EncryptorRegistry.get(secret_key)
+    True
+
+    """
+
+    _instances: Dict[Tuple[Type[Encryptor], bytes], Encryptor] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(
+        cls,
+        secret_key: Union[str, bytes],
+        encryptor_class: Type[Encryptor] = FernetEncryptor,
+    ) -> Encryptor:
+        """Returns the shared encryptor instance for the given key.
+
+        Parameters
+        ----------
+        secret_key : str or bytes
+            The key material the encryptor is built with.
+        encryptor_class : type, optional
+            The encryptor class to instantiate, `FernetEncryptor` by default.
+
+        Returns
+        -------
+        Encryptor
+            The cached encryptor instance.
+
+        """
+        cache_key = (encryptor_class, cls._normalize_key(secret_key))
+        encryptor = cls._instances.get(cache_key)
+        if encryptor is None:
+            with cls._lock:
+                encryptor = cls._instances.get(cache_key)
+                if encryptor is None:
+                    encryptor = encryptor_class(secret_key)
+                    cls._instances[cache_key] = encryptor
+        return encryptor
+
+    @classmethod
+    def reset(cls) -> None:
+        """Drops every cached encryptor so the next lookup builds a new
+        one."""
+        with cls._lock:
+            cls._instances.clear()
+
+    @staticmethod
+    def _normalize_key(secret_key: Union[str, bytes]) -> bytes:
+        """Returns the key material as bytes so `str` and `bytes` keys share a
+        cache entry."""
+        if isinstance(secret_key, str):
+            return secret_key.encode("utf-8")
+        return bytes(secret_key)
+
+
+@receiver(setting_changed)
+def reset_encryptor_registry(*, setting, **kwargs):
+    """Clears the registry when the Fernet secret key is changed."""
+    if setting == "FERNET_SECRET_KEY":
+        EncryptorRegistry.reset()
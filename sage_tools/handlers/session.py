@@ -1,20 +1,47 @@
+import asyncio
+import functools
 import logging
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
 from datetime import timedelta
-from typing import Any, Optional
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.http import HttpRequest
-from django.utils import timezone
 
 try:
     from cryptography.fernet import InvalidToken
 except ImportError:
     raise ImportError("Install `cryptography` package. Run `pip install cryptography`.")
 
-from sage_tools.encryptors import FernetEncryptor
+from sage_tools.encryptors import EncryptorRegistry, FernetEncryptor
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+_DELETED = object()
+# sh1:<expires_at>:<value> -- the expiry is tracked by SessionHandler.
+ENVELOPE_PREFIX = "sh1:"
+# sh2:<ttl>:<fernet token> -- the expiry is the token timestamp plus ttl,
+# verified by Fernet itself when the token is decrypted.
+TTL_ENVELOPE_PREFIX = "sh2:"
+
 
 class SessionHandler:
     """Manages session variables with encryption and a custom expiry time for
@@ -27,93 +54,609 @@ class SessionHandler:
     lifespan, after which it is considered expired and automatically
     removed.
 
+    Several operations can be grouped with `batch()`, which stages them and
+    applies the net result to the session in a single mutation when the
+    block exits.
+
+    Decrypted values are memoized on the request object, so reading the same
+    key several times during a request decrypts it only once. The memo is
+    keyed on the stored ciphertext and is invalidated by `set`, `delete` and
+    `flush`.
+
+    Expired entries are swept opportunistically: on a handler's first
+    session access, every expired entry in the session is removed, at most
+    once every `SESSION_HANDLER_PURGE_INTERVAL` seconds (300 by default, 0
+    disables it) per session. The `purge_session_handler_entries` management command
+    compacts the whole session store the same way.
+
+    Each entry is stored as a single versioned string. Encrypted values
+    keep only their TTL next to the Fernet token, because the token already
+    carries its creation time; `get` lets `FernetEncryptor.decrypt(ttl=...)`
+    reject expired values before any decryption happens. Entries written by
+    older versions as `value`/`created_at`/`lifespan` dicts are still read,
+    and are rewritten as envelopes when they are refreshed. Unencrypted
+    values that are not strings keep the dict format, because an envelope
+    would turn them into text.
+
+    For ASGI views, `aget`, `aset`, `adelete`, `aexists`, `arefresh` and
+    `abatch` use the session's native async methods (Django 5.0+) instead of
+    hopping to a thread. Fernet work stays on the event loop unless the
+    payload exceeds `SESSION_HANDLER_ASYNC_OFFLOAD_SIZE` bytes (64 KiB by
+    default), in which case it runs in a shared executor bounded by
+    `SESSION_HANDLER_ASYNC_MAX_WORKERS` threads (4 by default).
+
     """
 
+    cache_attribute = "_session_handler_cache"
+    purge_marker_key = "_session_handler_purged_at"
+
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_lock = threading.Lock()
+
     def __init__(self, request: HttpRequest) -> None:
         """Initializes the SessionHandler with the current request and uses the
-        secret key from Django settings for encryption."""
+        shared encryptor for the secret key from Django settings."""
         self.request = request
-        self.fernet = FernetEncryptor(settings.FERNET_SECRET_KEY)
+        self.fernet = EncryptorRegistry.get(settings.FERNET_SECRET_KEY)
+        self._pending: Optional[Dict[str, Any]] = None
+        self._purge_checked = False
 
     def set(
         self, key: str, value: str, lifespan=timedelta(minutes=10), encrypt=True
     ) -> None:
         """Encrypts and sets a session variable with a specified lifespan."""
-        if not isinstance(key, str) or not key:
-            raise ValueError("Key must be a non-empty string")
-        if not isinstance(lifespan, timedelta) or lifespan.total_seconds() <= 0:
-            raise ValueError("Lifespan must be a positive timedelta object")
-
+        self._validate(key, lifespan)
         try:
-            encrypted_value = (
-                self.fernet.encrypt(value.encode("utf-8")) if encrypt else value
-            )
-            self.request.session[key] = {
-                "value": encrypted_value,
-                "created_at": timezone.now().timestamp(),
-                "lifespan": lifespan.total_seconds(),
-            }
+            session_info = self._encode_value(value, lifespan, encrypt)
+            self._get_cache().pop(key, None)
+            self._store(key, session_info)
         except Exception as e:
             logger.error(f"Error encrypting session data for key {key}: {str(e)}")
 
     def get(self, key: str, decrypt=True) -> Optional[str]:
         """Retrieves, decrypts, and returns the value of a session variable if
         it has not expired."""
-        session_info = self.request.session.get(key)
-        if session_info and self._is_valid_session_data(session_info):
-            created_at = session_info.get("created_at")
-            expiry = session_info.get("lifespan", 0)
-            if timezone.now().timestamp() - created_at < expiry:
-                encrypted_value = session_info.get("value")
-                try:
-                    return (
-                        self.fernet.decrypt(encrypted_value)
-                        if decrypt
-                        else encrypted_value
-                    )
-                except InvalidToken:
-                    logger.error(
-                        f"Invalid token for session key {key}. Possible data tampering."
-                    )
-            else:
-                self.delete(key)
-        return None
+        value, expired = self._read(key, self._load(key), decrypt)
+        if expired:
+            self.delete(key)
+        return value
 
     def delete(self, key: str) -> Optional[Any]:
         """Deletes a session variable, if it exists."""
+        self._get_cache().pop(key, None)
+        if self._pending is not None:
+            value = self._load(key)
+            self._pending[key] = _DELETED
+            return value
+        self._maybe_purge()
         return self.request.session.pop(key, None)
 
     def is_expired(self, key: str) -> bool:
         """Checks if a session variable has expired."""
-        session_info = self.request.session.get(key)
-        if session_info and self._is_valid_session_data(session_info):
-            created_at = session_info.get("created_at")
-            lifespan = session_info.get("lifespan", 0)
-            return timezone.now().timestamp() - created_at >= lifespan
-        return True
+        return self._is_entry_expired(self._load(key))
 
     def refresh(self, key: str, lifespan=timedelta(minutes=10)) -> bool:
         """Refreshes the lifespan of an existing session variable, if it exists
-        and has not expired."""
-        if not self.is_expired(key):
-            session_info = self.request.session.get(key)
-            if session_info:
-                session_info["created_at"] = timezone.now().timestamp()
-                session_info["lifespan"] = lifespan.total_seconds()
-                self.request.session[key] = session_info
-                return True
-        return False
+        and has not expired.
+
+        Encrypted values are not re-encrypted: their TTL is extended so that
+        it runs `lifespan` past the current time. Legacy dict entries are
+        rewritten as envelopes.
+
+        """
+        session_info = self._refreshed_entry(self._load(key), lifespan)
+        if session_info is None:
+            return False
+        self._store(key, session_info)
+        return True
 
     def exists(self, key: str) -> bool:
         """Checks if a session variable exists and has not expired."""
-        return key in self.request.session and not self.is_expired(key)
+        session_info = self._load(key)
+        return session_info is not None and not self._is_entry_expired(session_info)
+
+    async def aset(
+        self, key: str, value: str, lifespan=timedelta(minutes=10), encrypt=True
+    ) -> None:
+        """Async variant of `set`.
+
+        The value is encrypted in a worker thread only when it is larger
+        than `SESSION_HANDLER_ASYNC_OFFLOAD_SIZE` bytes.
+
+        """
+        self._validate(key, lifespan)
+        try:
+            session_info = await self._run_crypto(
+                len(value) if encrypt else 0,
+                self._encode_value,
+                value,
+                lifespan,
+                encrypt,
+            )
+            self._get_cache().pop(key, None)
+            await self._astore(key, session_info)
+        except Exception as e:
+            logger.error(f"Error encrypting session data for key {key}: {str(e)}")
+
+    async def aget(self, key: str, decrypt=True) -> Optional[str]:
+        """Async variant of `get`.
+
+        The value is decrypted in a worker thread only when it is larger
+        than `SESSION_HANDLER_ASYNC_OFFLOAD_SIZE` bytes and has not been
+        decrypted earlier in the request.
+
+        """
+        session_info = await self._aload(key)
+        value, expired = await self._run_crypto(
+            self._decrypt_size(key, session_info) if decrypt else 0,
+            self._read,
+            key,
+            session_info,
+            decrypt,
+        )
+        if expired:
+            await self.adelete(key)
+        return value
+
+    async def adelete(self, key: str) -> Optional[Any]:
+        """Async variant of `delete`."""
+        self._get_cache().pop(key, None)
+        if self._pending is not None:
+            value = await self._aload(key)
+            self._pending[key] = _DELETED
+            return value
+        await self._amaybe_purge()
+        return await self._asession("pop", key, None)
+
+    async def ais_expired(self, key: str) -> bool:
+        """Async variant of `is_expired`."""
+        return self._is_entry_expired(await self._aload(key))
+
+    async def arefresh(self, key: str, lifespan=timedelta(minutes=10)) -> bool:
+        """Async variant of `refresh`."""
+        session_info = self._refreshed_entry(await self._aload(key), lifespan)
+        if session_info is None:
+            return False
+        await self._astore(key, session_info)
+        return True
+
+    async def aexists(self, key: str) -> bool:
+        """Async variant of `exists`."""
+        session_info = await self._aload(key)
+        return session_info is not None and not self._is_entry_expired(session_info)
+
+    def purge_expired(self) -> int:
+        """Removes every expired SessionHandler entry from the session and
+        returns how many were removed."""
+        expired = self.expired_keys(self.request.session)
+        if expired:
+            with self.batch():
+                for key in expired:
+                    self.delete(key)
+        return len(expired)
+
+    @classmethod
+    def expired_keys(
+        cls, session_data: Mapping[str, Any], now: Optional[float] = None
+    ) -> List[str]:
+        """Returns the keys of expired SessionHandler entries in a mapping of
+        session data.
+
+        Values that were not written by SessionHandler are ignored.
+
+        """
+        now = time.time() if now is None else now
+        expired = []
+        for key, session_info in session_data.items():
+            entry = cls.decode_entry(session_info)
+            if entry and now >= entry[1]:
+                expired.append(key)
+        return expired
+
+    @staticmethod
+    def encode_entry(value: str, expires_at: float) -> str:
+        """Packs a value and its absolute expiry into an envelope.
+
+        The envelope is a single string, `sh1:<expires_at>:<value>`, where
+        `expires_at` is a Unix timestamp in whole seconds. It is used for
+        values stored without encryption, which carry no timestamp of their
+        own.
+
+        Raises `TypeError` for values that are not strings, which are stored
+        as dict entries instead.
+
+        """
+        if not isinstance(value, str):
+            raise TypeError(
+                f"Envelopes hold strings, got {type(value).__name__}; store it "
+                "as a dict entry instead."
+            )
+        return f"{ENVELOPE_PREFIX}{math.ceil(expires_at)}:{value}"
+
+    @staticmethod
+    def encode_ttl_entry(token: str, lifespan: timedelta) -> str:
+        """Packs a Fernet token and its lifespan into an envelope.
+
+        The envelope is `sh2:<ttl>:<token>`. The token's embedded creation
+        time plus `ttl` seconds is the expiry, which Fernet verifies on
+        decryption.
+
+        """
+        return f"{TTL_ENVELOPE_PREFIX}{math.ceil(lifespan.total_seconds())}:{token}"
+
+    @classmethod
+    def decode_entry(cls, session_info: Any) -> Optional[Tuple[str, float]]:
+        """Returns the `(value, expires_at)` pair of a stored entry, or None if
+        it was not written by SessionHandler.
+
+        Envelopes and legacy dict entries are both understood. The expiry of
+        an encrypted entry is read from the token header without verifying
+        it; an unreadable header makes the entry count as expired.
+
+        """
+        envelope = cls._split_envelope(session_info)
+        if envelope:
+            prefix, number, value = envelope
+            if prefix == ENVELOPE_PREFIX:
+                return value, float(number)
+            try:
+                return value, float(FernetEncryptor.read_timestamp(value) + number)
+            except InvalidToken:
+                return value, 0.0
+        if isinstance(session_info, dict) and all(
+            k in session_info for k in ["value", "created_at", "lifespan"]
+        ):
+            return (
+                session_info["value"],
+                session_info["created_at"] + session_info["lifespan"],
+            )
+        return None
+
+    @contextmanager
+    def batch(self) -> Iterator["SessionHandler"]:
+        """Stages `set`, `delete` and `refresh` calls and applies them to the
+        session as one mutation when the block exits.
+
+        Reads inside the block see the staged values. Keys whose staged
+        value equals the stored one are skipped, so the session is only
+        marked modified when something actually changed. If the block
+        raises, the staged operations are discarded. Nested blocks are
+        merged into the outermost one.
+
+        Example:
+            with SessionHandler(request).batch() as session:
+                session.set("step", "2")
+                session.set("token", token, lifespan=timedelta(minutes=5))
+                session.delete("draft")
+
+        """
+        if self._pending is not None:
+            yield self
+            return
+
+        self._pending = {}
+        try:
+            yield self
+        except BaseException:
+            self._pending = None
+            raise
+        pending, self._pending = self._pending, None
+        self._apply(pending)
+
+    @asynccontextmanager
+    async def abatch(self) -> AsyncIterator["SessionHandler"]:
+        """Async variant of `batch`, for use with the `a*` methods."""
+        if self._pending is not None:
+            yield self
+            return
+
+        self._pending = {}
+        try:
+            yield self
+        except BaseException:
+            self._pending = None
+            raise
+        pending, self._pending = self._pending, None
+        await self._aapply(pending)
+
+    def _get_cache(self) -> Dict[str, Tuple[str, str, Optional[float]]]:
+        """Returns the per-request memo of decrypted values, creating it on
+        first use."""
+        cache = getattr(self.request, self.cache_attribute, None)
+        if cache is None:
+            cache = {}
+            setattr(self.request, self.cache_attribute, cache)
+        return cache
+
+    def _decrypt(
+        self, key: str, encrypted_value: str, ttl: Optional[int] = None
+    ) -> str:
+        """Decrypts a stored value, reusing the result memoized for the same
+        ciphertext earlier in the request.
+
+        With a `ttl`, Fernet rejects the token if it has expired, and the
+        memoized value is only reused until that expiry.
+
+        """
+        cache = self._get_cache()
+        cached = cache.get(key)
+        if (
+            cached is not None
+            and cached[0] == encrypted_value
+            and (cached[2] is None or time.time() <= cached[2])
+        ):
+            return cached[1]
+        if ttl is None:
+            value = self.fernet.decrypt(encrypted_value)
+            expires_at = None
+        else:
+            value = self.fernet.decrypt(encrypted_value, ttl=ttl)
+            expires_at = FernetEncryptor.read_timestamp(encrypted_value) + ttl
+        cache[key] = (encrypted_value, value, expires_at)
+        return value
+
+    def _maybe_purge(self) -> None:
+        """Purges expired entries on the handler's first session access if the
+        session has not been swept within the configured interval."""
+        if self._purge_checked:
+            return
+        self._purge_checked = True
+        interval = getattr(settings, "SESSION_HANDLER_PURGE_INTERVAL", 300)
+        session = getattr(self.request, "session", None)
+        if not interval or session is None:
+            return
+
+        now = time.time()
+        if not self._purge_due(session.get(self.purge_marker_key, 0), now, interval):
+            return
+        if not self._has_entries(session):
+            return
+
+        with self.batch():
+            for key in self.expired_keys(session, now):
+                self.delete(key)
+            self._pending[self.purge_marker_key] = now
+
+    async def _amaybe_purge(self) -> None:
+        """Async variant of `_maybe_purge`."""
+        if self._purge_checked:
+            return
+        self._purge_checked = True
+        interval = getattr(settings, "SESSION_HANDLER_PURGE_INTERVAL", 300)
+        if not interval or getattr(self.request, "session", None) is None:
+            return
+
+        now = time.time()
+        marker = await self._asession("get", self.purge_marker_key, 0)
+        if not self._purge_due(marker, now, interval):
+            return
+        session_data = dict(await self._asession("items"))
+        if not self._has_entries(session_data):
+            return
+
+        async with self.abatch():
+            for key in self.expired_keys(session_data, now):
+                await self.adelete(key)
+            self._pending[self.purge_marker_key] = now
+
+    def _purge_due(self, marker: float, now: float, interval: float) -> bool:
+        """Returns whether the last sweep is older than the interval."""
+        return now - marker >= interval
+
+    def _has_entries(self, session_data: Mapping[str, Any]) -> bool:
+        """Returns whether the session holds SessionHandler entries, so a
+        marker, and the session save it causes, is never written into a
+        session the handler does not manage."""
+        return any(
+            self.decode_entry(value) is not None
+            for key, value in session_data.items()
+            if key != self.purge_marker_key
+        )
+
+    def _load(self, key: str) -> Optional[Any]:
+        """Returns the stored entry for a key, including staged changes."""
+        if self._pending is not None and key in self._pending:
+            staged = self._pending[key]
+            return None if staged is _DELETED else staged
+        self._maybe_purge()
+        return self.request.session.get(key)
+
+    def _store(self, key: str, session_info: Any) -> None:
+        """Writes an entry to the session, or stages it inside `batch()`."""
+        if self._pending is not None:
+            self._pending[key] = session_info
+        else:
+            self._maybe_purge()
+            self.request.session[key] = session_info
+
+    def _apply(self, pending: Dict[str, Any]) -> None:
+        """Applies staged changes to the session, skipping no-ops."""
+        session = self.request.session
+        updates = {
+            key: value
+            for key, value in pending.items()
+            if value is not _DELETED and session.get(key) != value
+        }
+        if updates:
+            session.update(updates)
+        for key, value in pending.items():
+            if value is _DELETED and key in session:
+                del session[key]
+
+    async def _aload(self, key: str) -> Optional[Any]:
+        """Async variant of `_load`."""
+        if self._pending is not None and key in self._pending:
+            staged = self._pending[key]
+            return None if staged is _DELETED else staged
+        await self._amaybe_purge()
+        return await self._asession("get", key)
+
+    async def _astore(self, key: str, session_info: Any) -> None:
+        """Async variant of `_store`."""
+        if self._pending is not None:
+            self._pending[key] = session_info
+        else:
+            await self._amaybe_purge()
+            await self._asession("update", {key: session_info})
+
+    async def _aapply(self, pending: Dict[str, Any]) -> None:
+        """Async variant of `_apply`."""
+        updates = {}
+        for key, value in pending.items():
+            if value is _DELETED:
+                continue
+            if await self._asession("get", key) != value:
+                updates[key] = value
+        if updates:
+            await self._asession("update", updates)
+        for key, value in pending.items():
+            if value is _DELETED:
+                await self._asession("pop", key, None)
+
+    async def _asession(self, name: str, *args) -> Any:
+        """Calls a session method through its native async variant (Django
+        5.0+), falling back to the sync method in a thread on older
+        versions."""
+        session = self.request.session
+        method = getattr(session, f"a{name}", None)
+        if method is not None:
+            return await method(*args)
+        return await sync_to_async(getattr(session, name))(*args)
+
+    async def _run_crypto(self, size: int, func: Callable[..., T], *args) -> T:
+        """Runs Fernet work inline, or in the shared bounded executor when the
+        payload is larger than `SESSION_HANDLER_ASYNC_OFFLOAD_SIZE`."""
+        threshold = getattr(settings, "SESSION_HANDLER_ASYNC_OFFLOAD_SIZE", 64 * 1024)
+        if size <= threshold:
+            return func(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(), functools.partial(func, *args)
+        )
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        """Returns the process-wide executor for large Fernet payloads,
+        creating it on first use."""
+        if cls._executor is None:
+            with cls._executor_lock:
+                if cls._executor is None:
+                    cls._executor = ThreadPoolExecutor(
+                        max_workers=getattr(
+                            settings, "SESSION_HANDLER_ASYNC_MAX_WORKERS", 4
+                        ),
+                        thread_name_prefix="session-handler",
+                    )
+        return cls._executor
+
+    @staticmethod
+    def _validate(key: str, lifespan: timedelta) -> None:
+        """Validates the key and lifespan passed to `set`."""
+        if not isinstance(key, str) or not key:
+            raise ValueError("Key must be a non-empty string")
+        if not isinstance(lifespan, timedelta) or lifespan.total_seconds() <= 0:
+            raise ValueError("Lifespan must be a positive timedelta object")
+
+    def _encode_value(self, value: Any, lifespan: timedelta, encrypt: bool) -> Any:
+        """Builds the entry stored for a value, encrypting it if asked."""
+        if encrypt:
+            return self.encode_ttl_entry(
+                self.fernet.encrypt(value.encode("utf-8")), lifespan
+            )
+        return self._encode_plain(value, lifespan)
+
+    @classmethod
+    def _encode_plain(cls, value: Any, lifespan: timedelta) -> Any:
+        """Builds the entry of an unencrypted value: an envelope for strings,
+        and a dict the session serializer round-trips for anything else."""
+        if not isinstance(value, str):
+            return {
+                "value": value,
+                "created_at": time.time(),
+                "lifespan": lifespan.total_seconds(),
+            }
+        return cls.encode_entry(value, time.time() + lifespan.total_seconds())
+
+    def _read(
+        self, key: str, session_info: Any, decrypt: bool
+    ) -> Tuple[Optional[str], bool]:
+        """Returns the value of a stored entry and whether the entry has
+        expired and should be deleted."""
+        envelope = self._split_envelope(session_info)
+        if envelope and envelope[0] == TTL_ENVELOPE_PREFIX and decrypt:
+            _, ttl, token = envelope
+            try:
+                return self._decrypt(key, token, ttl=ttl), False
+            except InvalidToken:
+                if self._is_entry_expired(session_info):
+                    return None, True
+                logger.error(
+                    f"Invalid token for session key {key}. Possible data tampering."
+                )
+            return None, False
+
+        entry = self.decode_entry(session_info)
+        if entry:
+            encrypted_value, expires_at = entry
+            if time.time() >= expires_at:
+                return None, True
+            if not decrypt:
+                return encrypted_value, False
+            try:
+                return self._decrypt(key, encrypted_value), False
+            except InvalidToken:
+                logger.error(
+                    f"Invalid token for session key {key}. Possible data tampering."
+                )
+        return None, False
+
+    def _decrypt_size(self, key: str, session_info: Any) -> int:
+        """Returns the size of the ciphertext `get` would decrypt, or 0 if the
+        value is already memoized for this request."""
+        entry = self.decode_entry(session_info)
+        if entry is None:
+            return 0
+        cached = self._get_cache().get(key)
+        if cached is not None and cached[0] == entry[0]:
+            return 0
+        return len(entry[0])
+
+    def _is_entry_expired(self, session_info: Any) -> bool:
+        """Returns whether a stored entry is missing or expired."""
+        entry = self.decode_entry(session_info)
+        if entry:
+            return time.time() >= entry[1]
+        return True
+
+    def _refreshed_entry(self, session_info: Any, lifespan: timedelta) -> Optional[Any]:
+        """Returns the entry for a refreshed entry, or None if the entry is
+        missing or expired."""
+        if self._is_entry_expired(session_info):
+            return None
+        envelope = self._split_envelope(session_info)
+        if envelope and envelope[0] == TTL_ENVELOPE_PREFIX:
+            token = envelope[2]
+            age = time.time() - FernetEncryptor.read_timestamp(token)
+            return self.encode_ttl_entry(token, timedelta(seconds=age) + lifespan)
+        return self._encode_plain(self.decode_entry(session_info)[0], lifespan)
 
-    def _is_valid_session_data(self, session_data: dict[str, Any]) -> bool:
-        """Validates the structure of the session data."""
-        return all(k in session_data for k in ["value", "created_at", "lifespan"])
+    @staticmethod
+    def _split_envelope(session_info: Any) -> Optional[Tuple[str, int, str]]:
+        """Splits an envelope into its prefix, number and value, or returns
+        None if the value is not an envelope."""
+        if not isinstance(session_info, str):
+            return None
+        prefix = session_info[:4]
+        if prefix not in (ENVELOPE_PREFIX, TTL_ENVELOPE_PREFIX):
+            return None
+        number, sep, value = session_info[4:].partition(":")
+        if not sep or not number.isdigit():
+            return None
+        return prefix, int(number), value
 
     def flush(self) -> None:
         """Clears the session data and regenerates a new session key."""
+        self._get_cache().clear()
         self.request.session.flush()
 
     def cycle_key(self) -> None:
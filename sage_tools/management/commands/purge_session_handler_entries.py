@@ -0,0 +1,167 @@
+from collections import Counter
+from importlib import import_module
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from sage_tools.handlers.session import SessionHandler
+
+
+class Command(BaseCommand):
+    """Removes expired SessionHandler entries from every stored session.
+
+    Sessions are read from the database in batches ordered by session key,
+    and only sessions that actually change are rewritten. A rewrite only
+    succeeds if the stored data is still the data that was read, so a
+    session saved by a live request in the meantime is skipped rather than
+    overwritten; it is swept again on the next run.
+    The command requires a database-backed session engine (`db` or
+    `cached_db`); for `cached_db` the cached copy of a rewritten session is
+    dropped so it is reloaded from the database.
+
+    With `--compact`, live entries still stored in the legacy dict format are
+    rewritten as envelopes, which migrates sessions written by older
+    versions of SessionHandler.
+
+    Example:
+        python manage.py purge_session_handler_entries --batch-size 500
+        python manage.py purge_session_handler_entries --compact
+
+    """
+
+    help = "Remove expired SessionHandler entries from stored sessions."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of sessions loaded per query.",
+        )
+        parser.add_argument(
+            "--compact",
+            action="store_true",
+            help="Rewrite legacy dict entries as compact envelopes.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would be removed without writing anything.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] <= 0:
+            raise CommandError("--batch-size must be a positive integer.")
+
+        session_store = self.get_session_store()
+        counts = Counter()
+        for session_key, session_data in self.iter_sessions(
+            session_store.get_model_class(), options["batch_size"]
+        ):
+            counts["scanned"] += 1
+            self.purge_session(
+                session_store,
+                session_key,
+                session_data,
+                counts,
+                compact=options["compact"],
+                dry_run=options["dry_run"],
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                self.summarize(counts, options["compact"], options["dry_run"])
+            )
+        )
+
+    def get_session_store(self):
+        """Returns the configured SessionStore class, which must be
+        database-backed."""
+        session_store = import_module(settings.SESSION_ENGINE).SessionStore
+        if not hasattr(session_store, "get_model_class"):
+            raise CommandError(
+                f"{settings.SESSION_ENGINE} does not store sessions in the "
+                "database and cannot be scanned."
+            )
+        return session_store
+
+    def iter_sessions(self, model, batch_size):
+        """Yields the key and raw data of every unexpired session, loading
+        `batch_size` sessions per query."""
+        last_key = ""
+        while True:
+            sessions = list(
+                model.objects.filter(
+                    session_key__gt=last_key, expire_date__gt=timezone.now()
+                )
+                .order_by("session_key")
+                .values_list("session_key", "session_data")[:batch_size]
+            )
+            if not sessions:
+                return
+            last_key = sessions[-1][0]
+            yield from sessions
+
+    def purge_session(
+        self, session_store, session_key, session_data, counts, compact, dry_run
+    ):
+        """Removes the expired entries of one session and, with `compact`,
+        rewrites its legacy entries, updating `counts`."""
+        store = session_store(session_key)
+        data = store.decode(session_data)
+        expired = SessionHandler.expired_keys(data)
+        legacy = self.legacy_keys(data, expired) if compact else []
+        if not expired and not legacy:
+            return
+
+        if not dry_run:
+            for key in expired:
+                del data[key]
+            for key in legacy:
+                data[key] = SessionHandler.encode_entry(
+                    *SessionHandler.decode_entry(data[key])
+                )
+            updated = (
+                session_store.get_model_class()
+                .objects.filter(session_key=session_key, session_data=session_data)
+                .update(session_data=store.encode(data))
+            )
+            if not updated:
+                counts["skipped"] += 1
+                return
+            if hasattr(store, "cache_key"):
+                caches[settings.SESSION_CACHE_ALIAS].delete(store.cache_key)
+
+        counts["removed"] += len(expired)
+        counts["converted"] += len(legacy)
+        counts["rewritten"] += 1
+
+    @staticmethod
+    def legacy_keys(data, expired):
+        """Returns the keys of live string entries stored in the legacy dict
+        format; other values keep that format, as envelopes hold text."""
+        return [
+            key
+            for key, value in data.items()
+            if isinstance(value, dict)
+            and key not in expired
+            and SessionHandler.decode_entry(value)
+            and isinstance(value["value"], str)
+        ]
+
+    @staticmethod
+    def summarize(counts, compact, dry_run):
+        """Returns the summary line printed when the command finishes."""
+        message = f"{counts['removed']} expired entries removed"
+        if compact:
+            message += f", {counts['converted']} legacy entries compacted"
+        message += f" in {counts['rewritten']} of {counts['scanned']} sessions"
+        if counts["skipped"]:
+            message += (
+                f"; {counts['skipped']} sessions changed during the run were skipped"
+            )
+        message += "."
+        if dry_run:
+            message = f"Dry run: {message}"
+        return message
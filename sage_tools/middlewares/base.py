@@ -0,0 +1,45 @@
+from typing import Optional
+
+from django.http import HttpRequest, HttpResponseBase
+from django.utils.deprecation import MiddlewareMixin
+
+
+class AsyncMiddlewareMixin(MiddlewareMixin):
+    """MiddlewareMixin whose async path calls the hooks on the event loop.
+
+    `MiddlewareMixin.__acall__` runs `process_request` and `process_response`
+    through `sync_to_async`, which costs two thread hops per request under
+    ASGI. Middlewares whose hooks do no blocking I/O inherit from this mixin
+    so that, when Django runs them in async mode, the hooks are called
+    directly. Hooks that do need I/O can be given an async counterpart by
+    overriding `aprocess_request`.
+
+    Setting `native_async` to False, on the class or on an instance in
+    `__init__`, restores the thread-hopping behaviour of `MiddlewareMixin`.
+    Middlewares whose hooks only block for some requests can override
+    `runs_natively` instead.
+
+    """
+
+    native_async = True
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        """Async version of `__call__` that runs the hooks without leaving the
+        event loop."""
+        if not self.runs_natively(request):
+            return await super().__acall__(request)
+        response = await self.aprocess_request(request)
+        response = response or await self.get_response(request)
+        return self.process_response(request, response)
+
+    def runs_natively(self, request: HttpRequest) -> bool:
+        """Returns whether the hooks may run on the event loop for
+        `request`."""
+        return self.native_async
+
+    async def aprocess_request(
+        self, request: HttpRequest
+    ) -> Optional[HttpResponseBase]:
+        """Async counterpart of `process_request`; calls it directly by
+        default."""
+        return self.process_request(request)
@@ -0,0 +1,276 @@
+"""Requests-per-second benchmark for the middlewares in
+`sage_tools.middlewares` under ASGI.
+
+Each middleware is put in front of an async view and driven with Django's
+`AsyncClient`, once with `native_async` disabled, which is how
+`MiddlewareMixin` runs sync hooks (through `sync_to_async`), and once with
+the hooks running on the event loop. The results are reported as JSON so
+they can be stored and compared between releases.
+
+Usage:
+    python -m sage_tools.middlewares.benchmark
+    python -m sage_tools.middlewares.benchmark --requests 5000 --concurrency 1 8
+    python -m sage_tools.middlewares.benchmark --middleware myapp.middleware.My
+
+When run as a script without `DJANGO_SETTINGS_MODULE`, a minimal settings
+module is configured for the run.
+
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from django.conf import settings
+from django.contrib.sessions.backends.signed_cookies import SessionStore
+from django.http import HttpResponse
+from django.test import AsyncClient, override_settings
+from django.urls import path
+from django.utils.decorators import async_only_middleware
+from django.utils.module_loading import import_string
+
+DEFAULT_MIDDLEWARES = {
+    "TimezoneMiddleware": "sage_tools.middlewares.time_zone.TimezoneMiddleware",
+    "CookieLocaleMiddleware": "sage_tools.middlewares.cookie.CookieLocaleMiddleware",
+    "SecureCsrfMiddleware": "sage_tools.middlewares.csrf.SecureCsrfMiddleware",
+}
+DEFAULT_CONCURRENCY = (1, 8)
+MODES = {"sync_to_async": False, "native": True}
+PAGE = b"<html><body><form method='post'></form></body></html>"
+
+
+@async_only_middleware
+def session_middleware(get_response):
+    """Attaches a signed-cookie session, which needs no I/O to load, so
+    the measurement is not dominated by the session store."""
+
+    async def middleware(request):
+        request.session = SessionStore()
+        return await get_response(request)
+
+    return middleware
+
+
+async def page(request):
+    """An async view returning a small HTML page."""
+    return HttpResponse(PAGE)
+
+
+urlpatterns = [path("", page)]
+
+
+@dataclass
+class BenchmarkResult:
+    """A data class representing a single benchmark measurement."""
+
+    middleware: str
+    mode: str
+    concurrency: int
+    requests: int
+    seconds: float
+    requests_per_second: float
+
+
+class MiddlewareBenchmark:
+    """Measures ASGI requests per second through a set of middlewares.
+
+    Each (middleware, mode, concurrency) combination sends `requests`
+    GET requests, split across `concurrency` tasks sharing one event loop.
+
+    Parameters
+    ----------
+    middlewares : dict
+        Maps a display name to the dotted path of a middleware class
+        inheriting from `AsyncMiddlewareMixin`.
+    requests : int
+        Number of requests sent for each measurement.
+    concurrency : sequence of int
+        Numbers of concurrent client tasks to run each measurement with.
+
+    Examples
+    --------
+    >>> benchmark = MiddlewareBenchmark(DEFAULT_MIDDLEWARES, requests=500)
+    >>> print(benchmark.to_json(benchmark.run()))
+
+    """
+
+    def __init__(
+        self,
+        middlewares: Dict[str, str],
+        requests: int = 2000,
+        concurrency: Sequence[int] = DEFAULT_CONCURRENCY,
+    ):
+        if not middlewares:
+            raise ValueError("At least one middleware is required")
+        if requests <= 0:
+            raise ValueError("The number of requests must be a positive integer")
+        if any(count <= 0 for count in concurrency):
+            raise ValueError("Concurrency levels must be positive integers")
+
+        self.middlewares = middlewares
+        self.requests = requests
+        self.concurrency = concurrency
+
+    def run(self) -> List[BenchmarkResult]:
+        """Runs every configured measurement and returns the results."""
+        results = []
+        for name, dotted_path in self.middlewares.items():
+            middleware_class = import_string(dotted_path)
+            for mode, native_async in MODES.items():
+                for count in self.concurrency:
+                    results.append(
+                        self._measure(
+                            name,
+                            middleware_class,
+                            dotted_path,
+                            mode,
+                            native_async,
+                            count,
+                        )
+                    )
+        return results
+
+    def _measure(
+        self,
+        name: str,
+        middleware_class: type,
+        dotted_path: str,
+        mode: str,
+        native_async: bool,
+        concurrency: int,
+    ) -> BenchmarkResult:
+        """Sends `requests` requests through `middleware_class` with
+        `native_async` forced to the given value."""
+        overridden = "native_async" in middleware_class.__dict__
+        previous = middleware_class.__dict__.get("native_async")
+        middleware_class.native_async = native_async
+        try:
+            with override_settings(
+                MIDDLEWARE=[f"{__name__}.session_middleware", dotted_path],
+                ROOT_URLCONF=__name__,
+            ):
+                elapsed = asyncio.run(self._drive(concurrency))
+        finally:
+            if overridden:
+                middleware_class.native_async = previous
+            else:
+                del middleware_class.native_async
+
+        return BenchmarkResult(
+            middleware=name,
+            mode=mode,
+            concurrency=concurrency,
+            requests=self.requests,
+            seconds=round(elapsed, 6),
+            requests_per_second=round(self.requests / elapsed, 2),
+        )
+
+    async def _drive(self, concurrency: int) -> float:
+        """Sends the requests from `concurrency` tasks and returns the
+        elapsed time."""
+        client = AsyncClient()
+        client.cookies[settings.LANGUAGE_COOKIE_NAME] = settings.LANGUAGE_CODE
+        # The first request builds the middleware chain
+        await client.get("/")
+
+        shares = [self.requests // concurrency] * concurrency
+        shares[0] += self.requests % concurrency
+
+        async def worker(count):
+            for _ in range(count):
+                await client.get("/")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(count) for count in shares))
+        return time.perf_counter() - started
+
+    @staticmethod
+    def to_json(results: Iterable[BenchmarkResult], indent: int = 2) -> str:
+        """Serializes benchmark results, together with the environment they
+        were measured in, to a JSON string."""
+        data = {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "results": [asdict(result) for result in results],
+        }
+        return json.dumps(data, indent=indent)
+
+
+def configure() -> None:
+    """Configures minimal settings when none are provided."""
+    if settings.configured or os.environ.get("DJANGO_SETTINGS_MODULE"):
+        return
+    from cryptography.fernet import Fernet
+
+    settings.configure(
+        SECRET_KEY="sage-tools-middleware-benchmark",
+        ALLOWED_HOSTS=["testserver"],
+        FERNET_SECRET_KEY=Fernet.generate_key(),
+        CSRF_INPUT_NAME="secure_token",
+        LANGUAGES=[("en", "English"), ("fa", "Persian")],
+        LANGUAGE_CODE="en",
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point for the benchmark harness."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark sage_tools middlewares under ASGI and print JSON "
+        "results."
+    )
+    parser.add_argument(
+        "--middleware",
+        action="append",
+        dest="middlewares",
+        metavar="DOTTED_PATH",
+        help="Middleware class to benchmark. May be repeated. "
+        "Defaults to the middlewares shipped with sage_tools.",
+    )
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=2000,
+        help="Requests sent for each measurement.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        nargs="+",
+        type=int,
+        default=list(DEFAULT_CONCURRENCY),
+        metavar="N",
+    )
+    parser.add_argument("--output", help="Write the JSON report to this file.")
+    args = parser.parse_args(argv)
+
+    configure()
+    import django
+
+    django.setup()
+
+    if args.middlewares:
+        middlewares = {path.rsplit(".", 1)[-1]: path for path in args.middlewares}
+    else:
+        middlewares = DEFAULT_MIDDLEWARES
+
+    benchmark = MiddlewareBenchmark(
+        middlewares, requests=args.requests, concurrency=args.concurrency
+    )
+    report = benchmark.to_json(benchmark.run())
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            output.write(report)
+    else:
+        sys.stdout.write(report + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,16 +12,19 @@ user and adjust the request or response accordingly.
 import logging
 
 from django.conf import settings
+from django.http.response import HttpResponseRedirectBase
 from django.middleware.locale import LocaleMiddleware as DjangoLocaleMiddleware
 from django.shortcuts import redirect
 from django.utils import translation
+from django.utils.cache import patch_vary_headers
 
+from sage_tools.middlewares.base import AsyncMiddlewareMixin
 from sage_tools.utils.locale import MultilingualService
 
 logger = logging.getLogger(__name__)
 
 
-class CookieLocaleMiddleware(DjangoLocaleMiddleware):
+class CookieLocaleMiddleware(AsyncMiddlewareMixin, DjangoLocaleMiddleware):
     """Extends Django's LocaleMiddleware to manage language settings more
     dynamically.
 
@@ -31,8 +34,33 @@ class CookieLocaleMiddleware(DjangoLocaleMiddleware):
     sites, redirecting users to the appropriate language version of the
     site based on their preferences and the available languages.
 
+    By default the language cookie is refreshed on any response whose active
+    language differs from the cookie. Two settings make localized responses
+    friendlier to shared caches:
+
+    - `LANGUAGE_COOKIE_REDIRECT_ONLY`: only redirect responses, such as the
+      language redirects issued by this middleware or Django's `set_language`
+      view, carry the `Set-Cookie` header.
+    - `LOCALE_CACHEABLE_RESPONSES`: implies the above and adds `Cookie` to the
+      `Vary` header, since the cookie selects the language of the response.
+
+    Both hooks only do in-memory work, so under ASGI they run directly on the
+    event loop instead of being wrapped in `sync_to_async`.
+
     """
 
+    exempt_path_prefixes = ("/set-language/", "/i18n/")
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        # Settings-derived values used on every request
+        self.language_codes = MultilingualService.get_language_codes()
+        self.default_language = settings.LANGUAGE_CODE
+        self.cacheable = getattr(settings, "LOCALE_CACHEABLE_RESPONSES", False)
+        self.cookie_on_redirect_only = self.cacheable or getattr(
+            settings, "LANGUAGE_COOKIE_REDIRECT_ONLY", False
+        )
+
     def process_request(self, request):
         """Examines and aligns the request with the user's preferred language
         based on the URL or cookies.
@@ -48,6 +76,12 @@ class CookieLocaleMiddleware(DjangoLocaleMiddleware):
             English is an available language. Conversely, if the URL is '/about/' with no
             language prefix and the cookie is set to 'es', the user will be redirected to '/es/about/'.
 
+        The URL language and the clean path are resolved once with
+        `MultilingualService.split_language_prefix`. When a valid cookie
+        decides the language, Django's own negotiation (URL patterns, cookie
+        and Accept-Language parsing) is skipped since it would only repeat
+        the decision.
+
         Parameters:
             request: HttpRequest object containing metadata about the request.
 
@@ -57,68 +91,58 @@ class CookieLocaleMiddleware(DjangoLocaleMiddleware):
         """
 
         # Exclude certain paths from language prefix redirection
-        if request.path_info.startswith(
-            "/set-language/"
-        ) or request.path_info.startswith("/i18n/"):
+        if request.path_info.startswith(self.exempt_path_prefixes):
             return super().process_request(request)
 
-        # Retrieve the language from the URL and the cookie
-        url_language = translation.get_language_from_path(request.path_info)
+        # Resolve the URL language and the clean path in one pass
+        url_language, clean_path = MultilingualService.split_language_prefix(
+            request.path_info
+        )
         cookie_language = request.COOKIES.get(settings.LANGUAGE_COOKIE_NAME)
 
-        # Ensure that the URL is clean of language prefixes for accurate redirection
-        clean_path = MultilingualService.remove_language_prefix(request.path_info)
-
         # Check if the cookie language is valid
-        if cookie_language in dict(settings.LANGUAGES):
+        if cookie_language in self.language_codes:
             # Activate the cookie language and set it in the request
-            translation.activate(cookie_language)
-            request.LANGUAGE_CODE = cookie_language
+            self._activate(request, cookie_language)
 
             # Redirect to the correct language URL, considering the default language case
-            if cookie_language != settings.LANGUAGE_CODE and (
-                not url_language or url_language != cookie_language
-            ):
-                new_path = MultilingualService.add_language_prefix(
-                    clean_path, cookie_language
-                )
-                return redirect(new_path)
-            elif (
-                cookie_language == settings.LANGUAGE_CODE
-                and url_language
-                and url_language != settings.LANGUAGE_CODE
-            ):
+            if cookie_language != self.default_language:
+                if url_language != cookie_language:
+                    return redirect(
+                        MultilingualService.add_language_prefix(
+                            clean_path, cookie_language
+                        )
+                    )
+            elif url_language and url_language != self.default_language:
                 # Redirect to the clean path if the default language is set in the cookie and
                 #  URL has a non-default prefix
                 return redirect(clean_path)
 
+            # The cookie decided the language; the parent would only repeat it
+            return None
+
         # If the URL language is valid, activate it
-        elif url_language in dict(settings.LANGUAGES):
-            translation.activate(url_language)
-            request.LANGUAGE_CODE = url_language
+        if url_language is not None:
+            self._activate(request, url_language)
             # Redirect if the URL language is different from the cookie language and is not
             #  the default language
-            if (
-                url_language != settings.LANGUAGE_CODE
-                and url_language != cookie_language
-            ):
-                new_path = MultilingualService.add_language_prefix(
-                    clean_path, url_language
+            if url_language != self.default_language:
+                return redirect(
+                    MultilingualService.add_language_prefix(clean_path, url_language)
                 )
-                return redirect(new_path)
 
         # Handle default language without prefix
-        elif not url_language or url_language == settings.LANGUAGE_CODE:
-            translation.activate(settings.LANGUAGE_CODE)
-            request.LANGUAGE_CODE = settings.LANGUAGE_CODE
-            # Redirect only if there was a language prefix and the cookie language is not
-            #  the default language
-            if url_language and cookie_language != settings.LANGUAGE_CODE:
-                return redirect(clean_path)
+        else:
+            self._activate(request, self.default_language)
 
         # Fallback to default language handling
         super().process_request(request)
 
+    def _activate(self, request, language):
+        """Activates the language for the current thread and the request."""
+        translation.activate(language)
+        request.LANGUAGE_CODE = language
+
     def process_response(self, request, response):
         """Modifies the response to set the correct language cookie based on
         the user's preferred language.
@@ -135,6 +159,10 @@ class CookieLocaleMiddleware(DjangoLocaleMiddleware):
             The next time the user makes a request, their preferred
             language will be French.
 
+        When `cookie_on_redirect_only` is set, the cookie is left untouched on
+        non-redirect responses so they stay cacheable, and in cacheable mode
+        `Vary: Cookie` is added to every response.
+
         Parameters:
             request: HttpRequest object containing metadata about the request.
             response: HttpResponse object that will be sent back to the user.
@@ -147,6 +175,16 @@ class CookieLocaleMiddleware(DjangoLocaleMiddleware):
         # First, call the parent class's process_response method
         response = super().process_response(request, response)
 
+        # The language cookie selects the content of the response
+        if self.cacheable:
+            patch_vary_headers(response, ("Cookie",))
+
+        # Keep non-redirect responses free of Set-Cookie headers
+        if self.cookie_on_redirect_only and not isinstance(
+            response, HttpResponseRedirectBase
+        ):
+            return response
+
         # Get the current language
         current_language = translation.get_language()
 
@@ -6,15 +6,66 @@ flexibility of CSRF protection in Django applications. The primary class
 provided is SecureCsrfMiddleware, which can be used as a drop-in
 replacement for Django's default CSRF middleware.
 
+Templates can render the custom field name directly with the
+`{% secure_csrf_token %}` tag from the `sage_csrf` library. Once every form
+uses it, set `CSRF_REWRITE_RESPONSE = False` to skip the response rewriting
+pass entirely.
+
 """
 
+from typing import AsyncIterator, Iterator, List
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
 from django.conf import settings
 from django.http import FileResponse
 from django.middleware.csrf import CsrfViewMiddleware as DjangoCsrfViewMiddleware
 from django.utils.safestring import mark_safe
 
+from sage_tools.middlewares.base import AsyncMiddlewareMixin
+
+DEFAULT_CSRF_FIELD = b'name="csrfmiddlewaretoken"'
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS", "TRACE")
+
+
+class _ChunkRewriter:
+    """Replaces a byte pattern in a stream of chunks, including occurrences
+    that straddle chunk boundaries.
+
+    Only the last `len(old) - 1` bytes of unmatched input are held back
+    between chunks, so memory use does not grow with the response size.
+
+    """
+
+    def __init__(self, old: bytes, new: bytes):
+        self.old = old
+        self.new = new
+        self.keep = len(old) - 1
+        self.buffer = b""
+
+    def feed(self, chunk: bytes) -> bytes:
+        """Consumes a chunk and returns the output that is safe to emit."""
+        buffer = self.buffer + chunk
+        parts: List[bytes] = []
+        start = 0
+        while True:
+            index = buffer.find(self.old, start)
+            if index == -1:
+                break
+            parts.append(buffer[start:index])
+            parts.append(self.new)
+            start = index + len(self.old)
+        emit_until = max(start, len(buffer) - self.keep)
+        parts.append(buffer[start:emit_until])
+        self.buffer = buffer[emit_until:]
+        return b"".join(parts)
+
+    def flush(self) -> bytes:
+        """Returns the held-back tail once the stream is exhausted."""
+        tail, self.buffer = self.buffer, b""
+        return tail
 
-class SecureCsrfMiddleware(DjangoCsrfViewMiddleware):
+
+class SecureCsrfMiddleware(AsyncMiddlewareMixin, DjangoCsrfViewMiddleware):
     """SecureCsrfMiddleware extends the default CsrfViewMiddleware from Django
     to allow for a custom CSRF token name.
 
@@ -25,10 +76,44 @@ class SecureCsrfMiddleware(DjangoCsrfViewMiddleware):
     organizational preferences without altering the fundamental CSRF
     protection mechanisms.
 
+    Under ASGI, `process_request`, `process_view` and `process_response` run
+    on the event loop without thread hops for safe methods. Other requests
+    keep running the hooks through `sync_to_async`, because checking their
+    token may parse the request body. So does every request when
+    `CSRF_USE_SESSIONS` is enabled, as reading the secret may query the
+    session store.
+
     """
 
     # Define 'secure_csrf_name' as a class attribute
     secure_csrf_name = settings.CSRF_INPUT_NAME
+    # Rewrite 'csrfmiddlewaretoken' in HTML responses; not needed when
+    # templates render the field with {% secure_csrf_token %}
+    rewrite_response = getattr(settings, "CSRF_REWRITE_RESPONSE", True)
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        # The CSRF secret is read from the session synchronously
+        if settings.CSRF_USE_SESSIONS:
+            self.native_async = False
+        if self.native_async and iscoroutinefunction(self):
+            # Django adapts a sync process_view with sync_to_async
+            self.process_view = self.aprocess_view
+
+    def runs_natively(self, request) -> bool:
+        """Returns whether the hooks may run on the event loop; only requests
+        with a safe method are checked without reading the body."""
+        return self.native_async and request.method in SAFE_METHODS
+
+    async def aprocess_view(self, request, callback, callback_args, callback_kwargs):
+        """Runs `process_view` on the event loop for safe async requests, and
+        in a thread otherwise."""
+        args = (self, request, callback, callback_args, callback_kwargs)
+        if self.runs_natively(request):
+            return type(self).process_view(*args)
+        return await sync_to_async(type(self).process_view, thread_sensitive=True)(
+            *args
+        )
 
     def process_request(self, request):
         """Processes incoming requests to replace the standard CSRF token name
@@ -38,18 +123,32 @@ class SecureCsrfMiddleware(DjangoCsrfViewMiddleware):
         the system recognizes the token under its new name during the request
         lifecycle.
 
+        The POST data is only inspected for POST requests that don't carry
+        the token in the CSRF header, and only copied when the custom field
+        is present, so other requests never pay for an early body parse.
+
         :param request: HttpRequest object representing the current
             request
         :return: The result of the parent class's process_request method
 
         """
-        request.POST = request.POST.copy()
-        if self.secure_csrf_name in request.POST:
-            request.POST["csrfmiddlewaretoken"] = request.POST.pop(
-                self.secure_csrf_name
-            )[0]
+        if self._has_custom_token(request):
+            post = request.POST.copy()
+            post["csrfmiddlewaretoken"] = post.pop(self.secure_csrf_name)[0]
+            request.POST = post
         return super().process_request(request)
 
+    def _has_custom_token(self, request) -> bool:
+        """Returns whether the request body carries the token under the custom
+        field name."""
+        # Django only parses form bodies into request.POST for POST requests.
+        if request.method != "POST":
+            return False
+        # A header token is checked without touching the body.
+        if request.META.get(settings.CSRF_HEADER_NAME):
+            return False
+        return self.secure_csrf_name in request.POST
+
     def process_response(self, request, response):
         """Processes outgoing responses to replace occurrences of the default
         CSRF token name in the HTML content with the custom CSRF token name. It
@@ -57,6 +156,11 @@ class SecureCsrfMiddleware(DjangoCsrfViewMiddleware):
         name, maintaining consistency with the request processing and providing
         a seamless experience.
 
+        Only `text/html` responses are rewritten. Regular responses are left
+        untouched unless they contain the default field name, so JSON, binary
+        and form-less pages are never copied. Streaming responses are
+        rewritten chunk by chunk as they are sent instead of being buffered.
+
         :param request: HttpRequest object representing the current
             request
         :param response: HttpResponse object representing the current
@@ -70,10 +174,66 @@ class SecureCsrfMiddleware(DjangoCsrfViewMiddleware):
             # If it's a FileResponse, return it unmodified
             return response
 
-        # If it's not a FileResponse, proceed with your original processing
-        if hasattr(response, "content"):
-            response.content = response.content.replace(
-                b'name="csrfmiddlewaretoken"',
-                mark_safe(f'name="{self.secure_csrf_name}"').encode(),
-            )
+        if self.rewrite_response and self._is_html(response):
+            if response.streaming:
+                self._rewrite_streaming_content(response)
+            else:
+                self._rewrite_content(response)
         return super().process_response(request, response)
+
+    def _get_replacement(self) -> bytes:
+        """Returns the field name attribute that replaces the default one."""
+        return mark_safe(f'name="{self.secure_csrf_name}"').encode()
+
+    def _is_html(self, response) -> bool:
+        """Returns whether the response declares an HTML content type."""
+        content_type = response.get("Content-Type", "")
+        return content_type.split(";", 1)[0].strip().lower() == "text/html"
+
+    def _rewrite_content(self, response) -> None:
+        """Rewrites a regular response body if it contains a CSRF input."""
+        content = response.content
+        if DEFAULT_CSRF_FIELD not in content:
+            return
+        response.content = content.replace(DEFAULT_CSRF_FIELD, self._get_replacement())
+        if response.has_header("Content-Length"):
+            response["Content-Length"] = str(len(response.content))
+
+    def _rewrite_streaming_content(self, response) -> None:
+        """Wraps a streaming response so each chunk is rewritten as it is
+        sent."""
+        rewriter = _ChunkRewriter(DEFAULT_CSRF_FIELD, self._get_replacement())
+        if getattr(response, "is_async", False):
+            response.streaming_content = self._arewrite_chunks(
+                response.streaming_content, rewriter
+            )
+        else:
+            response.streaming_content = self._rewrite_chunks(
+                response.streaming_content, rewriter
+            )
+        if response.has_header("Content-Length"):
+            del response["Content-Length"]
+
+    @staticmethod
+    def _rewrite_chunks(
+        chunks: Iterator[bytes], rewriter: _ChunkRewriter
+    ) -> Iterator[bytes]:
+        for chunk in chunks:
+            output = rewriter.feed(chunk)
+            if output:
+                yield output
+        tail = rewriter.flush()
+        if tail:
+            yield tail
+
+    @staticmethod
+    async def _arewrite_chunks(
+        chunks: AsyncIterator[bytes], rewriter: _ChunkRewriter
+    ) -> AsyncIterator[bytes]:
+        async for chunk in chunks:
+            output = rewriter.feed(chunk)
+            if output:
+                yield output
+        tail = rewriter.flush()
+        if tail:
+            yield tail
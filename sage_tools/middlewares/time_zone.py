@@ -1,42 +1,165 @@
+import json
 import logging
-from typing import Any
+import time
+from functools import lru_cache
+from hashlib import sha256
+from typing import Any, Optional
 
-from django.conf import settings
+from asgiref.sync import sync_to_async
 from django.http import HttpRequest
 from django.utils import timezone
-from django.utils.deprecation import MiddlewareMixin
 
 from sage_tools.handlers.session import SessionHandler
+from sage_tools.middlewares.base import AsyncMiddlewareMixin
 
 logger = logging.getLogger(__name__)
 
 try:
-    import pytz
+    import zoneinfo
 except ImportError:
-    raise ImportError("Install `pytz` package. Run `pip install pytz`.")  # noqa: B904
+    from backports import zoneinfo
 
 
-class TimezoneMiddleware(MiddlewareMixin):
+@lru_cache(maxsize=128)
+def get_zone(tzname: str) -> Optional[zoneinfo.ZoneInfo]:
+    """Returns the `ZoneInfo` for a timezone name, or None if it is unknown.
+
+    Unknown names are cached as well, so a bad value stored in a session
+    does not hit the timezone database on every request.
+
+    """
+    try:
+        return zoneinfo.ZoneInfo(tzname)
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+        return None
+
+
+class TimezoneMiddleware(AsyncMiddlewareMixin):
     """Middleware to handle setting the user's timezone based on their session
-    data."""
+    data.
+
+    The timezone name is not secret, so it is stored in the session as a
+    plain string (see `set_timezone`) and read without any decryption. Values
+    written through `SessionHandler` are still read; the entry itself is never
+    rewritten, and its decrypted name is remembered under
+    `decoded_session_key` until the entry changes or expires.
+
+    The timezone is activated with `django.utils.timezone.activate`, which
+    is local to the current thread or asyncio context; `settings.TIME_ZONE`
+    is never modified. Under ASGI the session is read with its async methods
+    (Django 5.0+), so no thread hop is needed on the hot path.
+
+    """
+
+    session_key = "user_timezone"
+    decoded_session_key = "_sage_tools_user_timezone"
 
     def process_request(self, request: HttpRequest) -> None:
         """Process the request to set the timezone from the session."""
-        session_handler = SessionHandler(request)
-        tzname = session_handler.get("user_timezone")
+        self._activate(self.get_timezone_name(request))
+
+    async def aprocess_request(self, request: HttpRequest) -> None:
+        """Async version of `process_request`."""
+        self._activate(await self.aget_timezone_name(request))
+
+    def _activate(self, tzname: Optional[str]) -> None:
+        """Activates the named timezone, or the default one if the name is
+        missing or unknown."""
         if tzname:
-            try:
-                timezone.activate(pytz.timezone(tzname))
-                # Set Django's timezone to the user's timezone
-                settings.TIME_ZONE = tzname
-            except pytz.UnknownTimeZoneError:
-                logger.error(f"Unknown timezone: {tzname}")
-                timezone.deactivate()
-        else:
-            timezone.deactivate()
+            zone = get_zone(tzname)
+            if zone is not None:
+                timezone.activate(zone)
+                return
+            logger.error(f"Unknown timezone: {tzname}")
+        timezone.deactivate()
 
     def process_response(self, request: HttpRequest, response) -> Any:
         """Ensure the timezone is deactivated after the response is
         processed."""
         timezone.deactivate()
         return response
+
+    @classmethod
+    def get_timezone_name(cls, request: HttpRequest) -> Optional[str]:
+        """Returns the timezone name stored in the request's session."""
+        session = getattr(request, "session", None)
+        if session is None:
+            return None
+        stored = session.get(cls.session_key)
+        if stored is None:
+            return None
+        entry = SessionHandler.decode_entry(stored)
+        if entry is None:
+            return stored if isinstance(stored, str) else None
+        if time.time() >= entry[1]:
+            return None
+
+        # Entry written through SessionHandler. The application owns that key,
+        # so it is left untouched; the decrypted name is kept under a separate
+        # key, tied to the stored entry, so later requests skip the decryption.
+        digest = cls._entry_digest(stored)
+        decoded = session.get(cls.decoded_session_key)
+        if decoded and decoded[0] == digest:
+            return decoded[1]
+        tzname = SessionHandler(request).get(cls.session_key)
+        if tzname:
+            session[cls.decoded_session_key] = [digest, tzname]
+        return tzname
+
+    @classmethod
+    async def aget_timezone_name(cls, request: HttpRequest) -> Optional[str]:
+        """Async version of `get_timezone_name`."""
+        session = getattr(request, "session", None)
+        if session is None:
+            return None
+        stored = await _aget(session, cls.session_key)
+        if stored is None:
+            return None
+        entry = SessionHandler.decode_entry(stored)
+        if entry is None:
+            return stored if isinstance(stored, str) else None
+        if time.time() >= entry[1]:
+            return None
+
+        digest = cls._entry_digest(stored)
+        decoded = await _aget(session, cls.decoded_session_key)
+        if decoded and decoded[0] == digest:
+            return decoded[1]
+        tzname = await SessionHandler(request).aget(cls.session_key)
+        if tzname:
+            if hasattr(session, "aset"):
+                await session.aset(cls.decoded_session_key, [digest, tzname])
+            else:
+                await sync_to_async(session.__setitem__)(
+                    cls.decoded_session_key, [digest, tzname]
+                )
+        return tzname
+
+    @staticmethod
+    def _entry_digest(stored: Any) -> str:
+        """Returns a digest identifying a stored SessionHandler entry."""
+        return sha256(json.dumps(stored, sort_keys=True).encode()).hexdigest()
+
+    @classmethod
+    def set_timezone(cls, request: HttpRequest, tzname: str) -> None:
+        """Stores the user's timezone name in the session."""
+        if get_zone(tzname) is None:
+            raise ValueError(f"Unknown timezone: {tzname}")
+        request.session[cls.session_key] = tzname
+
+    @classmethod
+    async def aset_timezone(cls, request: HttpRequest, tzname: str) -> None:
+        """Async version of `set_timezone`."""
+        if get_zone(tzname) is None:
+            raise ValueError(f"Unknown timezone: {tzname}")
+        if hasattr(request.session, "aset"):
+            await request.session.aset(cls.session_key, tzname)
+        else:
+            await sync_to_async(request.session.__setitem__)(cls.session_key, tzname)
+
+
+async def _aget(session: Any, key: str) -> Any:
+    """Reads `key` from the session, natively when the backend supports it."""
+    if hasattr(session, "aget"):
+        return await session.aget(key)
+    return await sync_to_async(session.get)(key)
@@ -11,9 +11,16 @@ from .access import (
     SuperuserRequiredMixin,
     UserPassesTestMixin,
 )
-from .cache import CacheControlMixin, NeverCacheMixin
+from .cache import (
+    CacheControlMixin,
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    NeverCacheMixin,
+)
 from .http import HeaderMixin
 from .locale import SetLanguageMixinView
+from .policy import AccessPolicyMixin
+from .throttle import ThrottleMixin
 
 __all__ = [
     "HeaderMixin",
@@ -29,6 +36,10 @@ __all__ = [
     "StaffuserRequiredMixin",
     "SSLRequiredMixin",
     "RecentLoginRequiredMixin",
+    "AccessPolicyMixin",
+    "ThrottleMixin",
     "CacheControlMixin",
+    "CachedResponseMixin",
+    "ConditionalGetMixin",
     "NeverCacheMixin",
 ]
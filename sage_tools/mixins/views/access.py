@@ -1,12 +1,13 @@
 """This module is derived from the django-braces package."""
 
-import datetime
 import inspect
+import time
 import urllib.parse
 
 from django.conf import settings
-from django.contrib.auth import REDIRECT_FIELD_NAME
-from django.contrib.auth.views import logout_then_login, redirect_to_login
+from django.contrib.auth import REDIRECT_FIELD_NAME, logout
+from django.contrib.auth.views import redirect_to_login
+from django.core import checks
 from django.core.exceptions import ImproperlyConfigured, PermissionDenied
 from django.http import (
     Http404,
@@ -16,8 +17,15 @@ from django.http import (
     StreamingHttpResponse,
 )
 from django.shortcuts import resolve_url
+from django.urls import get_resolver
 from django.utils.encoding import force_str
 from django.utils.timezone import now
+from django.views import View
+
+from sage_tools.services.group import GroupMembershipService
+from sage_tools.services.permission import PermissionService
+
+LOGIN_TIME_SESSION_KEY = "_sage_tools_login_time"
 
 
 class AccessMixin:
@@ -32,20 +40,22 @@ class AccessMixin:
     redirect_field_name = REDIRECT_FIELD_NAME  # Set by django.contrib.auth
     redirect_unauthenticated_users = False
 
-    def __init__(self, *args, **kwargs):
-        self._class_name = self.__class__.__name__
-        super().__init__(*args, **kwargs)
+    _class_name = "AccessMixin"
+
+    def __init_subclass__(cls, **kwargs):
+        """Validate and normalize the class configuration once, when the
+        class is created, so the request path only does the authorization."""
+        super().__init_subclass__(**kwargs)
+        cls._class_name = cls.__name__
 
     def get_login_url(self):
-        """Override this method to customize the login_url."""
-        login_url = self.login_url or settings.LOGIN_URL
-        if not login_url:
-            raise ImproperlyConfigured(
-                f"Define {self._class_name}.login_url or settings.LOGIN_URL or "
-                f"override {self._class_name}.get_login_url()."
-            )
+        """Override this method to customize the login_url.
+
+        A missing login URL is reported once, by the `sage_tools.E001`
+        system check, rather than on every request.
 
-        return force_str(login_url)
+        """
+        return force_str(self.login_url or settings.LOGIN_URL)
 
     def get_redirect_field_name(self):
         """Override this method to customize the redirect_field_name."""
@@ -92,6 +102,45 @@ class AccessMixin:
         )
 
 
+def check_login_urls(app_configs=None, **kwargs):
+    """System check reporting access-controlled views that have no login URL
+    to redirect to."""
+    if settings.LOGIN_URL:
+        return []
+    try:
+        # Import the views, which are only loaded with the URLconf.
+        get_resolver().url_patterns
+    except Exception:
+        pass  # Reported by Django's own URL checks.
+
+    errors = []
+    pending, seen = [AccessMixin], set()
+    while pending:
+        for subclass in pending.pop().__subclasses__():
+            if subclass in seen:
+                continue
+            seen.add(subclass)
+            pending.append(subclass)
+            if (
+                issubclass(subclass, View)
+                and not subclass.login_url
+                and subclass.get_login_url is AccessMixin.get_login_url
+            ):
+                errors.append(
+                    checks.Error(
+                        f"{subclass.__qualname__} has no login URL.",
+                        hint=(
+                            f"Define {subclass.__qualname__}.login_url or "
+                            "settings.LOGIN_URL or override "
+                            f"{subclass.__qualname__}.get_login_url()."
+                        ),
+                        obj=subclass,
+                        id="sage_tools.E001",
+                    )
+                )
+    return errors
+
+
 class LoginRequiredMixin(AccessMixin):
     """Requires the user to be authenticated.
 
@@ -145,7 +194,50 @@ class AnonymousRequiredMixin(AccessMixin):
         return resolve_url(self.authenticated_redirect_url)
 
 
-class PermissionRequiredMixin(AccessMixin):
+class PermissionObjectMixin:
+    """Fetches the object an object-level permission is checked against.
+
+    The object is fetched once, optionally with `permission_select_related`
+    applied, and then returned by `get_object` for the rest of the request,
+    so views such as `DetailView` do not query it again.
+
+    """
+
+    permission_select_related = None
+    _permission_object = None
+
+    def get_permission_object(self):
+        """Fetch the object the permission is checked against.
+
+        The object is kept on the view as `self.object`, and `get_object`
+        returns it for the rest of the request instead of querying again.
+
+        """
+        if getattr(self, "object", None) is not None:
+            return self.object
+        if self.permission_select_related:
+            obj = self.get_object(
+                self.get_queryset().select_related(*self.permission_select_related)
+            )
+        else:
+            obj = self.get_object()
+        self._permission_object = self.object = obj
+        return obj
+
+    def get_object(self, queryset=None):
+        """Return the object fetched for the permission check, if any."""
+        if queryset is None and self._permission_object is not None:
+            return self._permission_object
+        return super().get_object(queryset)
+
+    def _has_object_getter(self):
+        """Whether the view defines a `get_object` besides this mixin's."""
+        return type(self).get_object is not PermissionObjectMixin.get_object or (
+            hasattr(super(), "get_object")
+        )
+
+
+class PermissionRequiredMixin(PermissionObjectMixin, AccessMixin):
     """The request users must have certain permission(s)
 
     ## Attributes
@@ -154,6 +246,10 @@ class PermissionRequiredMixin(AccessMixin):
     `login_url` - the login url of site
     `redirect_field_name` - defaults to "next"
     `raise_exception` - defaults to False - raise 403 if set to True
+    `object_level_permissions` - check the permission against the view's
+        object; the object is fetched once and reused by `get_object`
+    `permission_select_related` - related fields to `select_related` when
+        fetching the object for the permission check
 
     ## Example Usage
 
@@ -191,24 +287,15 @@ class PermissionRequiredMixin(AccessMixin):
 
     def check_permissions(self, request):
         """Returns whether or not the user has permissions."""
-        perms = self.get_permission_required(request)
-        print(perms)
-        has_permission = False
+        perm = self.get_permission_required(request)
+        service = PermissionService(request)
 
         if self.object_level_permissions:
-            if hasattr(self, "object") and self.object is not None:
-                has_permission = request.user.has_perm(
-                    self.get_permission_required(request), self.object
-                )
-            elif hasattr(self, "get_object") and callable(self.get_object):
-                has_permission = request.user.has_perm(
-                    self.get_permission_required(request), self.get_object()
-                )
-        else:
-            has_permission = request.user.has_perm(
-                self.get_permission_required(request)
-            )
-        return has_permission
+            has_object = getattr(self, "object", None) is not None
+            if not has_object and not self._has_object_getter():
+                return False
+            return service.has_perm(perm, self.get_permission_object())
+        return service.has_perm(perm)
 
     def dispatch(self, request, *args, **kwargs):
         """Check to see if the user in the request has the required
@@ -261,45 +348,69 @@ class MultiplePermissionsRequiredMixin(PermissionRequiredMixin):
     """
 
     permissions = None  # Default required perms to none
+    # (permissions, all, any) for the `permissions` validated on the class
+    _normalized_permissions = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        permissions = cls.__dict__.get("permissions")
+        if permissions is not None:
+            cls._normalized_permissions = (
+                permissions,
+                *cls._normalize_permissions(permissions),
+            )
 
     def get_permission_required(self, request=None):
         """Get which permission is required."""
-        self._check_permissions_attr()
         return self.permissions
 
     def check_permissions(self, request):
         """Get the permissions, both all and any."""
         permissions = self.get_permission_required(request)
-        perms_all = permissions.get("all")
-        perms_any = permissions.get("any")
+        normalized = self._normalized_permissions
+        if normalized is not None and normalized[0] is permissions:
+            perms_all, perms_any = normalized[1:]
+        else:
+            # Permissions built at runtime are validated on every request
+            perms_all, perms_any = self._normalize_permissions(permissions)
 
-        self._check_permissions_keys_set(perms_all, perms_any)
-        self._check_perms_keys("all", perms_all)
-        self._check_perms_keys("any", perms_any)
+        service = PermissionService(request)
+        # Resolve both lists with one batch call when a backend supports it
+        service.prefetch(perms_all + perms_any)
 
         # Check that user has all permissions in the list/tuple
-        if perms_all:
-            # Why not `return request.user.has_perms(perms_all)`?
-            # There may be optional permissions below.
-            if not request.user.has_perms(perms_all):
-                return False
+        if perms_all and not service.has_all(perms_all):
+            return False
 
         # If perms_any, check that user has at least one in the list/tuple
-        if perms_any:
-            any_perms = [request.user.has_perm(perm) for perm in perms_any]
-            if not any_perms or not any(any_perms):
-                return False
+        if perms_any and not service.has_any(perms_any):
+            return False
         return True
 
-    def _check_permissions_attr(self):
+    @classmethod
+    def _normalize_permissions(cls, permissions):
+        """Validate a `permissions` dict and return its `all` and `any`
+        permissions as tuples."""
+        cls._check_permissions_attr(permissions)
+        perms_all = permissions.get("all")
+        perms_any = permissions.get("any")
+
+        cls._check_permissions_keys_set(perms_all, perms_any)
+        cls._check_perms_keys("all", perms_all)
+        cls._check_perms_keys("any", perms_any)
+        return tuple(perms_all or ()), tuple(perms_any or ())
+
+    @classmethod
+    def _check_permissions_attr(cls, permissions):
         """Check permissions attribute is set and that it is a dict."""
-        if self.permissions is None or not isinstance(self.permissions, dict):
+        if permissions is None or not isinstance(permissions, dict):
             raise ImproperlyConfigured(
-                f"{self._class_name} requires the `permissions` attribute"
+                f"{cls._class_name} requires the `permissions` attribute "
                 "to be set as a dict."
             )
 
-    def _check_permissions_keys_set(self, perms_all=None, perms_any=None):
+    @classmethod
+    def _check_permissions_keys_set(cls, perms_all=None, perms_any=None):
         """Check to make sure the keys `any` or `all` are not both blank.
 
         If both are blank either an empty dict came in or the wrong keys
@@ -308,38 +419,55 @@ class MultiplePermissionsRequiredMixin(PermissionRequiredMixin):
         """
         if perms_all is None and perms_any is None:
             raise ImproperlyConfigured(
-                f"{self._class_name} requires the `permissions` attribute to "
+                f"{cls._class_name} requires the `permissions` attribute to "
                 f"be set to a dict and the `any` or `all` key to be set."
             )
 
-    def _check_perms_keys(self, key=None, perms=None):
+    @classmethod
+    def _check_perms_keys(cls, key=None, perms=None):
         """If the permissions list/tuple passed in is set, check to make sure
         that it is of the type list or tuple."""
         if perms and not isinstance(perms, (list, tuple)):
             raise ImproperlyConfigured(
-                f"{self._class_name} requires the permissions dict {key} value "
+                f"{cls._class_name} requires the permissions dict {key} value "
                 "to be a list or tuple."
             )
 
 
 class GroupRequiredMixin(AccessMixin):
+    """The request user must belong to at least one of the required groups.
+
+    Group names are resolved through `GroupMembershipService`, which
+    memoizes them per request and, when `GROUP_MEMBERSHIP_CACHE_TIMEOUT` is
+    set, in a shared cache invalidated on membership changes.
+
+    """
+
     group_required = None
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        group_required = cls.__dict__.get("group_required")
+        if group_required is not None:
+            cls.group_required = cls._normalize_groups(group_required)
+
     def get_group_required(self):
         """Get which group's membership is required."""
-        if any(
-            [
-                self.group_required is None,
-                not isinstance(self.group_required, (list, tuple, str)),
-            ]
-        ):
-            raise ImproperlyConfigured(
-                f"{self._class_name} requires the `group_required` attribute "
-                "to be set and be a string, list, or tuple."
-            )
-        if not isinstance(self.group_required, (list, tuple)):
-            self.group_required = (self.group_required,)
-        return self.group_required
+        return self._normalize_groups(self.group_required)
+
+    @classmethod
+    def _normalize_groups(cls, group_required):
+        """Validate `group_required` and return it as a tuple."""
+        if isinstance(group_required, tuple):
+            return group_required
+        if isinstance(group_required, str):
+            return (group_required,)
+        if isinstance(group_required, list):
+            return tuple(group_required)
+        raise ImproperlyConfigured(
+            f"{cls._class_name} requires the `group_required` attribute "
+            "to be set and be a string, list, or tuple."
+        )
 
     def check_membership(self, groups):
         """Check for user's membership in required groups.
@@ -350,8 +478,7 @@ class GroupRequiredMixin(AccessMixin):
         if self.request.user.is_superuser:
             return True
 
-        user_groups = self.request.user.groups.values_list("name", flat=True)
-        return set(groups).intersection(set(user_groups))
+        return GroupMembershipService(self.request).in_any(groups)
 
     def dispatch(self, request, *args, **kwargs):
         """Call the appropriate handler if the user is a group member."""
@@ -447,16 +574,46 @@ class SSLRequiredMixin:
 
 
 class RecentLoginRequiredMixin(LoginRequiredMixin):
-    """Require the user to have logged in within a number of seconds."""
+    """Require the user to have logged in within a number of seconds.
+
+    The check runs before the view is dispatched, so stale logins never pay
+    for rendering a response that is thrown away. Users with a stale login
+    are logged out and redirected to the login page.
+
+    Set `use_session_login_time` to read the login time that
+    `record_login_time` stores in the session on `user_logged_in`, instead
+    of `user.last_login`, which may be stale on a cached user object and is
+    not updated at all when the `update_last_login` receiver is disconnected.
+
+    """
 
     max_last_login_delta = 1800  # Defaults to 30 minutes
+    use_session_login_time = False
 
     def dispatch(self, request, *args, **kwargs):
         """Call the appropriate method if the user's login is recent."""
-        resp = super().dispatch(request, *args, **kwargs)
+        if request.user.is_authenticated and not self.has_recent_login(request):
+            logout(request)
+            return self.no_permissions_fail(request)
+        return super().dispatch(request, *args, **kwargs)
 
-        if resp.status_code == 200:
-            delta = datetime.timedelta(seconds=self.max_last_login_delta)
-            if now() > (request.user.last_login + delta):
-                return logout_then_login(request, self.get_login_url())
-        return resp
+    def has_recent_login(self, request):
+        """Whether the user logged in within `max_last_login_delta` seconds."""
+        login_age = self.get_login_age(request)
+        return login_age is not None and login_age <= self.max_last_login_delta
+
+    def get_login_age(self, request):
+        """Return the number of seconds since the user logged in, or None if
+        the login time is unknown."""
+        if self.use_session_login_time:
+            login_time = request.session.get(LOGIN_TIME_SESSION_KEY)
+            return None if login_time is None else time.time() - login_time
+        if request.user.last_login is None:
+            return None
+        return (now() - request.user.last_login).total_seconds()
+
+
+def record_login_time(sender, request, user, **kwargs):
+    """Store the login time in the session for `RecentLoginRequiredMixin`."""
+    if request is not None and hasattr(request, "session"):
+        request.session[LOGIN_TIME_SESSION_KEY] = time.time()
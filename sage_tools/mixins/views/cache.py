@@ -1,4 +1,10 @@
+from django.db.models import Max
+from django.utils.translation import get_language
 from django.views.decorators.cache import cache_control, never_cache
+from django.views.decorators.http import condition
+
+from sage_tools.services.group import GroupMembershipService
+from sage_tools.services.response_cache import ResponseCache
 
 
 class CacheControlMixin:
@@ -90,3 +96,169 @@ class NeverCacheMixin:
         """Wrap the view with the `never_cache` decorator."""
         view_func = super().as_view(*args, **kwargs)
         return never_cache(view_func)
+
+
+class CachedResponseMixin:
+    """Mixin that caches the rendered responses of a view on the server.
+
+    Unlike `CacheControlMixin`, which only tells browsers and proxies how to
+    cache, this mixin stores complete responses in a Django cache backend and
+    serves later requests from it without dispatching the view. Responses are
+    keyed by `get_cache_key_parts()` (the request method, the absolute URL
+    including the query string and the active language by default) and by
+    the request headers named in the response's `Vary` header.
+
+    Only GET and HEAD requests from anonymous users are cached, unless
+    `response_cache_authenticated` is set, in which case every user gets
+    their own entries, keyed by user ID, group names and staff and superuser
+    flags. Responses that set cookies, are marked private or no-store, embed
+    a CSRF token, or were built while the view read or wrote the session or
+    messages are never stored, since they may hold per-client data.
+
+    Access mixins must come before this mixin, so permissions are checked
+    before a cached response is served.
+
+    Attributes:
+    - response_cache_timeout: Seconds to keep responses for. Defaults to the
+      `CACHE_MIDDLEWARE_SECONDS` setting.
+    - response_cache_alias: The cache backend to use.
+    - response_cache_authenticated: Also cache responses for authenticated
+      users, keyed by their groups.
+
+    Example Usage:
+    class ArticleListView(CachedResponseMixin, ListView):
+        model = Article
+        response_cache_timeout = 300
+
+    """
+
+    response_cache_timeout = None
+    response_cache_alias = "default"
+    response_cache_authenticated = False
+
+    _response_cache = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._response_cache = ResponseCache(
+            key_prefix=f"sage_tools:response:{cls.__module__}.{cls.__qualname__}",
+            timeout=cls.response_cache_timeout,
+            cache_alias=cls.response_cache_alias,
+        )
+
+    def dispatch(self, request, *args, **kwargs):
+        """Serve the response from the cache when possible."""
+        if not self.can_cache_response(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        key_parts = self.get_cache_key_parts(request)
+        response = self._response_cache.get(request, key_parts)
+        if response is not None:
+            return response
+
+        # Resolving request.user reads the session; only count what the
+        # view itself does with it, and restore the flag for SessionMiddleware
+        session = getattr(request, "session", None)
+        accessed = session is not None and session.accessed
+        if accessed:
+            session.accessed = False
+        try:
+            response = super().dispatch(request, *args, **kwargs)
+        except BaseException:
+            self._restore_session_access(request, accessed)
+            raise
+        self._response_cache.set(request, key_parts, response)
+        if callable(getattr(response, "render", None)) and not response.is_rendered:
+            response.add_post_render_callback(
+                lambda rendered: self._restore_session_access(request, accessed)
+            )
+        else:
+            self._restore_session_access(request, accessed)
+        return response
+
+    def can_cache_response(self, request):
+        """Return whether the request may be served from the cache."""
+        if request.method not in ("GET", "HEAD"):
+            return False
+        user = getattr(request, "user", None)
+        return (
+            self.response_cache_authenticated
+            or user is None
+            or not user.is_authenticated
+        )
+
+    def get_cache_key_parts(self, request):
+        """Return the values the rendered output depends on.
+
+        Override this to add anything else the output depends on, such as
+        the current site or a feature flag.
+
+        """
+        parts = [request.method, request.build_absolute_uri(), get_language() or ""]
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            groups = GroupMembershipService(request).get_group_names()
+            parts.append(f"user={user.pk}")
+            parts.append(",".join(sorted(groups)))
+            parts.append(f"staff={user.is_staff},superuser={user.is_superuser}")
+        return parts
+
+    @staticmethod
+    def _restore_session_access(request, accessed):
+        """Mark the session accessed again if it was before the view ran."""
+        if accessed:
+            request.session.accessed = True
+
+
+class ConditionalGetMixin:
+    """Mixin that answers conditional GET and HEAD requests with Django's
+    `condition` decorator.
+
+    The view declares cheap `get_etag` and/or `get_last_modified` methods.
+    When the client's `If-None-Match` or `If-Modified-Since` header still
+    matches, a 304 Not Modified response is returned before the handler runs,
+    so no template is rendered and no heavy query is made. Otherwise the
+    response gets `ETag` and `Last-Modified` headers for the next request.
+
+    Unlike `CacheControlMixin`, the decorator is applied in `dispatch` rather
+    than `as_view`, so both methods can use `self.kwargs` and
+    `self.get_queryset()`, and access mixins placed before this mixin are
+    checked before any 304 is returned. Combine it with `CacheControlMixin`
+    (e.g. `cachecontrol_no_cache = True`) to make browsers revalidate.
+
+    Attributes:
+    - last_modified_field: Name of a datetime field, such as
+      `TimeStampMixin.modified_at`. When set, the default `get_last_modified`
+      returns the latest value of that field in `get_queryset()`, using a
+      single aggregate query.
+
+    Example Usage:
+    class ArticleListView(ConditionalGetMixin, ListView):
+        model = Article
+        last_modified_field = "modified_at"
+
+    """
+
+    last_modified_field = None
+
+    def dispatch(self, request, *args, **kwargs):
+        """Return 304 Not Modified if the client's copy is current."""
+        if request.method not in ("GET", "HEAD"):
+            return super().dispatch(request, *args, **kwargs)
+        handler = condition(
+            etag_func=self.get_etag,
+            last_modified_func=self.get_last_modified,
+        )(super().dispatch)
+        return handler(request, *args, **kwargs)
+
+    def get_etag(self, request, *args, **kwargs):
+        """Return the ETag of the current resource, or None."""
+        return None
+
+    def get_last_modified(self, request, *args, **kwargs):
+        """Return when the resource last changed, or None."""
+        if self.last_modified_field is None:
+            return None
+        return self.get_queryset().aggregate(
+            last_modified=Max(self.last_modified_field)
+        )["last_modified"]
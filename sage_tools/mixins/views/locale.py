@@ -66,7 +66,7 @@ class SetLanguageMixinView(View):
         language = request.POST.get("language", settings.LANGUAGE_CODE)
         next_page = request.POST.get("next", "/")
 
-        if language and language in dict(settings.LANGUAGES):
+        if language and language in MultilingualService.get_language_codes():
             translation.activate(language)
             next_page = MultilingualService.get_language_prefix(next_page, language)
             response = HttpResponseRedirect(next_page)
@@ -0,0 +1,282 @@
+"""Declarative access policies for class-based views.
+
+A policy is built from rules combined with `&` (all), `|` (any) and `~`
+(not), and is compiled into a single check when the view class is created:
+
+    class ArticleEditView(AccessPolicyMixin, UpdateView):
+        access_policy = Login() & (Perm("blog.change_article") | Group("editors"))
+
+Rules are evaluated left to right and evaluation stops as soon as the
+outcome is known, so cheap rules should come first.
+
+"""
+
+from typing import Callable, Iterable, Tuple, Union
+
+from django.core.exceptions import ImproperlyConfigured
+
+from sage_tools.mixins.views.access import AccessMixin, PermissionObjectMixin
+from sage_tools.services.group import GroupMembershipService
+from sage_tools.services.permission import PermissionService
+
+Check = Callable[[object, object], bool]
+
+
+class Rule:
+    """Base class of access policy rules.
+
+    Subclasses implement `check(view, request)` and may override `validate`
+    to reject invalid configuration when the view class is created.
+
+    """
+
+    def __and__(self, other: "Rule") -> "All":
+        return All(self, other)
+
+    def __or__(self, other: "Rule") -> "Any":
+        return Any(self, other)
+
+    def __invert__(self) -> "Not":
+        return Not(self)
+
+    def validate(self, view_class: type) -> None:
+        """Raises `ImproperlyConfigured` if the rule cannot be used on
+        `view_class`."""
+
+    def compile(self) -> Check:
+        """Returns the function evaluating the rule."""
+        return self.check
+
+    def check(self, view, request) -> bool:
+        """Returns whether the request passes the rule."""
+        raise NotImplementedError(
+            f"{type(self).__name__} must implement check() or compile()."
+        )
+
+
+class All(Rule):
+    """Passes when every rule passes."""
+
+    def __init__(self, *rules: Rule):
+        self.rules = _flatten(type(self), rules)
+
+    def validate(self, view_class: type) -> None:
+        for rule in self.rules:
+            rule.validate(view_class)
+
+    def compile(self) -> Check:
+        checks = tuple(rule.compile() for rule in self.rules)
+
+        def check(view, request):
+            for rule_check in checks:
+                if not rule_check(view, request):
+                    return False
+            return True
+
+        return check
+
+
+class Any(All):
+    """Passes when at least one rule passes."""
+
+    def compile(self) -> Check:
+        checks = tuple(rule.compile() for rule in self.rules)
+
+        def check(view, request):
+            for rule_check in checks:
+                if rule_check(view, request):
+                    return True
+            return False
+
+        return check
+
+
+class Not(Rule):
+    """Passes when the wrapped rule fails."""
+
+    def __init__(self, rule: Rule):
+        self.rule = _check_rule(rule)
+
+    def validate(self, view_class: type) -> None:
+        self.rule.validate(view_class)
+
+    def compile(self) -> Check:
+        rule_check = self.rule.compile()
+        return lambda view, request: not rule_check(view, request)
+
+
+class Login(Rule):
+    """Passes for authenticated users."""
+
+    def check(self, view, request) -> bool:
+        return request.user.is_authenticated
+
+
+class Staff(Rule):
+    """Passes for staff users."""
+
+    def check(self, view, request) -> bool:
+        return request.user.is_staff
+
+
+class Superuser(Rule):
+    """Passes for superusers."""
+
+    def check(self, view, request) -> bool:
+        return request.user.is_superuser
+
+
+class Perm(Rule):
+    """Passes when the user has every given permission.
+
+    With `obj=True` the permissions are checked against the view's object,
+    fetched once through `PermissionObjectMixin.get_permission_object`.
+
+    """
+
+    def __init__(self, *perms: str, obj: bool = False):
+        self.perms = perms
+        self.obj = obj
+
+    def validate(self, view_class: type) -> None:
+        if not self.perms or not all(
+            isinstance(perm, str) and perm for perm in self.perms
+        ):
+            raise ImproperlyConfigured(
+                f"{view_class.__name__}: Perm() requires one or more permission "
+                "names."
+            )
+        if self.obj and not any(
+            "get_object" in klass.__dict__
+            for klass in view_class.__mro__
+            if klass is not PermissionObjectMixin
+        ):
+            raise ImproperlyConfigured(
+                f"{view_class.__name__}: Perm(obj=True) requires a view with "
+                "get_object()."
+            )
+
+    def check(self, view, request) -> bool:
+        service = PermissionService(request)
+        if self.obj:
+            return service.has_all(self.perms, view.get_permission_object())
+        return service.has_all(self.perms)
+
+
+class Group(Rule):
+    """Passes for members of at least one of the given groups; superusers
+    are members of every group."""
+
+    def __init__(self, *names: str):
+        self.names = frozenset(names)
+
+    def validate(self, view_class: type) -> None:
+        if not self.names or not all(
+            isinstance(name, str) and name for name in self.names
+        ):
+            raise ImproperlyConfigured(
+                f"{view_class.__name__}: Group() requires one or more group names."
+            )
+
+    def check(self, view, request) -> bool:
+        user = request.user
+        if not user.is_authenticated:
+            return False
+        return user.is_superuser or GroupMembershipService(request).in_any(self.names)
+
+
+class Test(Rule):
+    """Passes when `test(user)` returns a truthy value. `test` is a callable
+    or the name of a view method."""
+
+    def __init__(self, test: Union[str, Callable[[object], bool]]):
+        self.test = test
+
+    def validate(self, view_class: type) -> None:
+        if isinstance(self.test, str):
+            if not callable(getattr(view_class, self.test, None)):
+                raise ImproperlyConfigured(
+                    f"{view_class.__name__}: Test({self.test!r}) does not name "
+                    "a method of the view."
+                )
+        elif not callable(self.test):
+            raise ImproperlyConfigured(
+                f"{view_class.__name__}: Test() requires a callable or a method "
+                "name."
+            )
+
+    def compile(self) -> Check:
+        if isinstance(self.test, str):
+            name = self.test
+            return lambda view, request: getattr(view, name)(request.user)
+        test = self.test
+        return lambda view, request: test(request.user)
+
+
+def _check_rule(rule: Rule) -> Rule:
+    """Rejects policy operands that are not rules."""
+    if not isinstance(rule, Rule):
+        raise ImproperlyConfigured(
+            f"Access policies are built from Rule instances, got {rule!r}."
+        )
+    return rule
+
+
+def _flatten(kind: type, rules: Iterable[Rule]) -> Tuple[Rule, ...]:
+    """Checks the operands of a combinator and merges nested combinators of
+    the same kind, so `a & (b & c)` is evaluated as one flat list."""
+    flat = []
+    for rule in map(_check_rule, rules):
+        if type(rule) is kind:
+            flat.extend(rule.rules)
+        else:
+            flat.append(rule)
+    return tuple(flat)
+
+
+class AccessPolicyMixin(PermissionObjectMixin, AccessMixin):
+    """Checks a declarative access policy in a single dispatch layer.
+
+    `access_policy` is validated and compiled once, when the view class is
+    created; views without a policy fail when `as_view()` is called, that is
+    when the URLconf is imported. Requests that fail the policy go through
+    `handle_no_permission`, so `raise_exception`, `login_url` and the other
+    `AccessMixin` attributes work as with the single-purpose mixins.
+
+    ## Example Usage
+
+        class ArticleEditView(AccessPolicyMixin, UpdateView):
+            model = Article
+            access_policy = Login() & (
+                Perm("blog.change_article", obj=True) | Group("editors")
+            )
+
+    """
+
+    access_policy = None
+    _access_check = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        policy = cls.__dict__.get("access_policy")
+        if policy is None:
+            return
+        if not isinstance(policy, Rule):
+            raise ImproperlyConfigured(
+                f"{cls.__name__}.access_policy must be built from Rule instances."
+            )
+        policy.validate(cls)
+        cls._access_check = staticmethod(policy.compile())
+
+    @classmethod
+    def as_view(cls, *args, **kwargs):
+        """Refuse to build a view without an access policy."""
+        if cls._access_check is None:
+            raise ImproperlyConfigured(f"{cls.__name__} requires an access_policy.")
+        return super().as_view(*args, **kwargs)
+
+    def dispatch(self, request, *args, **kwargs):
+        """Call the appropriate handler if the request passes the policy."""
+        if not self._access_check(self, request):
+            return self.handle_no_permission(request)
+        return super().dispatch(request, *args, **kwargs)
@@ -0,0 +1,133 @@
+import time
+from typing import Dict, FrozenSet, Hashable, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpRequest
+
+
+class GroupMembershipService:
+    """A service class resolving the group names of a request's user.
+
+    The names are memoized on the request object, so several group checks
+    during one request cost a single query. When
+    `GROUP_MEMBERSHIP_CACHE_TIMEOUT` is set (in seconds), the names are also
+    kept in the `GROUP_MEMBERSHIP_CACHE_ALIAS` cache ("default" by default),
+    keyed by user ID and a group version number. The version is bumped
+    whenever group memberships or groups change (see `connect_signals`),
+    which invalidates every cached entry at once, so group checks cost no
+    queries in steady state. A missing version is seeded from the clock
+    rather than a constant, so an evicted version never rolls back to a
+    value whose entries may still be cached.
+
+    """
+
+    cache_attribute = "_group_membership_cache"
+    key_prefix = "sage_tools:groups"
+    version_key = "sage_tools:groups:version"
+
+    def __init__(self, request: HttpRequest) -> None:
+        self.request = request
+        self.user = request.user
+
+    def get_group_names(self) -> FrozenSet[str]:
+        """Returns the names of the groups the user belongs to."""
+        memo = self._get_memo()
+        if self.user.pk not in memo:
+            memo[self.user.pk] = self._load()
+        return memo[self.user.pk]
+
+    def in_any(self, groups) -> bool:
+        """Returns whether the user belongs to at least one of `groups`."""
+        return not self.get_group_names().isdisjoint(groups)
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Invalidates the shared cache by bumping the group version."""
+        cache = cls._get_cache()
+        if cache is None:
+            return
+        try:
+            cache.incr(cls.version_key)
+        except ValueError:
+            cls._seed_version(cache)
+
+    @classmethod
+    def connect_signals(cls) -> None:
+        """Invalidates the shared cache when memberships or groups change.
+
+        Called from `SageToolsConfig.ready()`.
+
+        """
+        from django.contrib.auth import get_user_model
+        from django.contrib.auth.models import Group
+        from django.db.models.signals import m2m_changed, post_delete, post_save
+
+        groups = getattr(get_user_model(), "groups", None)
+        if groups is not None:
+            m2m_changed.connect(
+                invalidate_group_membership,
+                sender=groups.through,
+                dispatch_uid="sage_tools_group_membership_m2m",
+            )
+        post_save.connect(
+            invalidate_group_membership,
+            sender=Group,
+            dispatch_uid="sage_tools_group_membership_saved",
+        )
+        post_delete.connect(
+            invalidate_group_membership,
+            sender=Group,
+            dispatch_uid="sage_tools_group_membership_deleted",
+        )
+
+    def _load(self) -> FrozenSet[str]:
+        """Reads the group names from the shared cache or the database."""
+        cache = self._get_cache()
+        if cache is None or self.user.pk is None:
+            return self._query()
+
+        version = cache.get(self.version_key)
+        if version is None:
+            version = self._seed_version(cache)
+        key = f"{self.key_prefix}:{self.user.pk}:{version}"
+        names = cache.get(key)
+        if names is None:
+            names = self._query()
+            cache.set(key, names, settings.GROUP_MEMBERSHIP_CACHE_TIMEOUT)
+        return frozenset(names)
+
+    def _query(self) -> FrozenSet[str]:
+        """Queries the group names of the user."""
+        return frozenset(self.user.groups.values_list("name", flat=True))
+
+    def _get_memo(self) -> Dict[Optional[Hashable], FrozenSet[str]]:
+        """Returns the per-request memo of group names, creating it on first
+        use."""
+        memo = getattr(self.request, self.cache_attribute, None)
+        if memo is None:
+            memo = {}
+            setattr(self.request, self.cache_attribute, memo)
+        return memo
+
+    @classmethod
+    def _seed_version(cls, cache) -> int:
+        """Stores a fresh group version if none is stored, and returns the
+        current one."""
+        version = time.time_ns()
+        if not cache.add(cls.version_key, version, None):
+            version = cache.get(cls.version_key, version)
+        return version
+
+    @staticmethod
+    def _get_cache():
+        """Returns the shared cache, or None if it is disabled."""
+        if not getattr(settings, "GROUP_MEMBERSHIP_CACHE_TIMEOUT", None):
+            return None
+        return caches[getattr(settings, "GROUP_MEMBERSHIP_CACHE_ALIAS", "default")]
+
+
+def invalidate_group_membership(sender, action=None, **kwargs):
+    """Signal receiver bumping the group version on membership changes."""
+    if action is None or action.startswith("post_"):
+        GroupMembershipService.invalidate()
@@ -0,0 +1,138 @@
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+from django.contrib import auth
+from django.core.exceptions import PermissionDenied
+from django.http import HttpRequest
+
+
+class PermissionService:
+    """A service class answering permission checks for the user of a request.
+
+    Results are memoized on the request object per (user, permission,
+    object), so a permission checked by several mixins, templates or
+    helpers during one request is resolved by the authentication backends
+    only once. `has_all` and `has_any` stop at the first permission that
+    decides the outcome.
+
+    Backends may implement a batch hook,
+    `has_perms_map(user_obj, perms, obj=None)`, returning a dict that maps
+    each permission to whether it is granted. Before several permissions
+    are checked together, `prefetch` resolves the uncached ones with a single
+    call per backend that implements the hook, so one query can serve every
+    check of a view; other backends are asked one permission at a time, as
+    `User.has_perm` would. When no backend implements the hook, or the user
+    model overrides `has_perm`, permissions are resolved lazily through
+    `user.has_perm`.
+
+    """
+
+    cache_attribute = "_permission_service_cache"
+    batch_hook = "has_perms_map"
+
+    def __init__(self, request: HttpRequest) -> None:
+        self.request = request
+        self.user = request.user
+
+    def has_perm(self, perm: str, obj: Any = None) -> bool:
+        """Returns whether the user has `perm`, optionally on `obj`."""
+        cache = self._get_cache()
+        key = self._cache_key(perm, obj)
+        if key not in cache:
+            cache[key] = bool(self.user.has_perm(perm, obj))
+        return cache[key]
+
+    def has_all(self, perms: Iterable[str], obj: Any = None) -> bool:
+        """Returns whether the user has every permission in `perms`."""
+        perms = tuple(perms)
+        self.prefetch(perms, obj)
+        return all(self.has_perm(perm, obj) for perm in perms)
+
+    def has_any(self, perms: Iterable[str], obj: Any = None) -> bool:
+        """Returns whether the user has at least one permission in `perms`."""
+        perms = tuple(perms)
+        self.prefetch(perms, obj)
+        return any(self.has_perm(perm, obj) for perm in perms)
+
+    def prefetch(self, perms: Iterable[str], obj: Any = None) -> None:
+        """Resolves the uncached permissions in `perms` together, if a backend
+        implements the batch hook."""
+        cache = self._get_cache()
+        missing = [
+            perm
+            for perm in dict.fromkeys(perms)
+            if self._cache_key(perm, obj) not in cache
+        ]
+        if len(missing) < 2:
+            return
+        if not self._has_default_has_perm():
+            return
+        backends = auth.get_backends()
+        if not any(hasattr(backend, self.batch_hook) for backend in backends):
+            return
+
+        if self.user.is_active and getattr(self.user, "is_superuser", False):
+            granted = dict.fromkeys(missing, True)
+        else:
+            granted = self._resolve(backends, missing, obj)
+        for perm, value in granted.items():
+            cache[self._cache_key(perm, obj)] = value
+
+    def _has_default_has_perm(self) -> bool:
+        """Returns whether the user's `has_perm` is Django's, which only asks
+        the backends and may therefore be bypassed."""
+        from django.contrib.auth.models import PermissionsMixin
+
+        return getattr(type(self.user), "has_perm", None) is PermissionsMixin.has_perm
+
+    def _resolve(
+        self, backends: Iterable[Any], perms: Iterable[str], obj: Any
+    ) -> Dict[str, bool]:
+        """Asks each backend in turn for the permissions no earlier backend
+        granted; a `PermissionDenied` from a backend denies what it was asked."""
+        granted = dict.fromkeys(perms, False)
+        denied = set()
+        for backend in backends:
+            pending = [
+                perm for perm in granted if not granted[perm] and perm not in denied
+            ]
+            if not pending:
+                break
+            if hasattr(backend, self.batch_hook):
+                try:
+                    result = getattr(backend, self.batch_hook)(self.user, pending, obj)
+                except PermissionDenied:
+                    denied.update(pending)
+                    continue
+                for perm in pending:
+                    granted[perm] = bool(result.get(perm))
+            elif hasattr(backend, "has_perm"):
+                for perm in pending:
+                    try:
+                        granted[perm] = bool(backend.has_perm(self.user, perm, obj))
+                    except PermissionDenied:
+                        denied.add(perm)
+        return granted
+
+    def _get_cache(self) -> Dict[Tuple[Hashable, str, Hashable], bool]:
+        """Returns the per-request memo of permission results, creating it on
+        first use."""
+        cache = getattr(self.request, self.cache_attribute, None)
+        if cache is None:
+            cache = {}
+            setattr(self.request, self.cache_attribute, cache)
+        return cache
+
+    def _cache_key(self, perm: str, obj: Any) -> Tuple[Hashable, str, Hashable]:
+        """Builds the memo key for a permission check."""
+        return (self._object_key(self.user), perm, self._object_key(obj))
+
+    @staticmethod
+    def _object_key(obj: Any) -> Optional[Hashable]:
+        """Identifies a model instance by its class and primary key, and any
+        other object by its identity."""
+        if obj is None:
+            return None
+        pk = getattr(obj, "pk", None)
+        if pk is None:
+            return (type(obj), id(obj))
+        return (type(obj), pk)
@@ -0,0 +1,154 @@
+from hashlib import sha256
+from typing import Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import cc_delim_re, get_max_age
+
+UNCACHEABLE_DIRECTIVES = frozenset({"private", "no-cache", "no-store"})
+
+
+class ResponseCache:
+    """A server-side cache of rendered responses.
+
+    Entries are keyed by the parts given by the caller (typically the URL,
+    the active language and anything else the output depends on) plus the
+    request headers named in the response's `Vary` header. As with Django's
+    cache middleware, the `Vary` header names are learnt from the first
+    response stored for a set of parts and kept under a separate key, so
+    lookups never need to render the view.
+
+    Parameters
+    ----------
+    key_prefix : str
+        Prefix of the cache keys, usually naming the cached view.
+    timeout : int, optional
+        Seconds to keep responses for; defaults to the
+        `CACHE_MIDDLEWARE_SECONDS` setting. A shorter `max-age` set by the
+        view takes precedence.
+    cache_alias : str
+        The cache to store responses in.
+
+    Examples
+    --------
+    >>> response_cache = ResponseCache("articles", timeout=300)
+    >>> response = response_cache.get(request, [request.get_full_path()])
+
+    """
+
+    def __init__(
+        self,
+        key_prefix: str,
+        timeout: Optional[int] = None,
+        cache_alias: str = "default",
+    ) -> None:
+        self.key_prefix = key_prefix
+        self.timeout = timeout
+        self.cache_alias = cache_alias
+
+    def get(
+        self, request: HttpRequest, key_parts: Iterable[str]
+    ) -> Optional[HttpResponse]:
+        """Returns the cached response for `key_parts`, or None."""
+        cache = caches[self.cache_alias]
+        parts_key = self._hash(key_parts)
+        headers = cache.get(f"{self.key_prefix}:headers:{parts_key}")
+        if headers is None:
+            return None
+        return cache.get(self._response_key(request, parts_key, headers))
+
+    def set(
+        self, request: HttpRequest, key_parts: Iterable[str], response: HttpResponse
+    ) -> None:
+        """Stores `response` once it is rendered, if it can be shared."""
+        key_parts = list(key_parts)
+        if callable(getattr(response, "render", None)) and not response.is_rendered:
+            response.add_post_render_callback(
+                lambda rendered: self._store(request, key_parts, rendered)
+            )
+        else:
+            self._store(request, key_parts, response)
+
+    def get_timeout(self, response: HttpResponse) -> int:
+        """Returns how long `response` may be cached for."""
+        timeout = self.timeout
+        if timeout is None:
+            timeout = getattr(settings, "CACHE_MIDDLEWARE_SECONDS", 600)
+        max_age = get_max_age(response)
+        if max_age is not None:
+            timeout = min(timeout, max_age)
+        return timeout
+
+    @staticmethod
+    def is_cacheable(request: HttpRequest, response: HttpResponse) -> bool:
+        """Returns whether `response` can be served to other clients.
+
+        Only complete 200 responses are stored. Responses setting cookies,
+        marked private or uncacheable, varying on every header, or embedding
+        a CSRF token are never shared. Neither are responses built while the
+        session or the message storage was read or written, because the
+        headers and cookies middleware adds for them (such as
+        `Vary: Cookie`) are not visible to a view-level cache.
+
+        """
+        if response.status_code != 200 or response.streaming or response.cookies:
+            return False
+        if request.META.get("CSRF_COOKIE_NEEDS_UPDATE"):
+            return False
+        session = getattr(request, "session", None)
+        if session is not None and (session.accessed or session.modified):
+            return False
+        messages = getattr(request, "_messages", None)
+        if messages is not None and (messages.used or messages.added_new):
+            return False
+        if "*" in _vary_headers(response):
+            return False
+        directives = {
+            directive.split("=", 1)[0].strip().lower()
+            for directive in cc_delim_re.split(response.get("Cache-Control", ""))
+        }
+        return directives.isdisjoint(UNCACHEABLE_DIRECTIVES)
+
+    def _store(
+        self, request: HttpRequest, key_parts: List[str], response: HttpResponse
+    ) -> None:
+        """Writes the response and its `Vary` header names to the cache."""
+        if not self.is_cacheable(request, response):
+            return
+        timeout = self.get_timeout(response)
+        if timeout <= 0:
+            return
+        cache = caches[self.cache_alias]
+        parts_key = self._hash(key_parts)
+        headers = sorted(
+            "HTTP_" + header.upper().replace("-", "_")
+            for header in _vary_headers(response)
+        )
+        cache.set(f"{self.key_prefix}:headers:{parts_key}", headers, timeout)
+        cache.set(self._response_key(request, parts_key, headers), response, timeout)
+
+    def _response_key(
+        self, request: HttpRequest, parts_key: str, headers: List[str]
+    ) -> str:
+        """Returns the key of the response for the request's header values."""
+        values = self._hash(request.META.get(header, "") for header in headers)
+        return f"{self.key_prefix}:response:{parts_key}:{values}"
+
+    @staticmethod
+    def _hash(values: Iterable[str]) -> str:
+        """Hashes `values` into a fixed-length key segment."""
+        ctx = sha256()
+        for value in values:
+            ctx.update(str(value).encode())
+            ctx.update(b"\0")
+        return ctx.hexdigest()
+
+
+def _vary_headers(response: HttpResponse) -> List[str]:
+    """Returns the header names listed in the response's `Vary` header."""
+    return [
+        header.strip()
+        for header in cc_delim_re.split(response.get("Vary", ""))
+        if header.strip()
+    ]
@@ -0,0 +1,94 @@
+import math
+import re
+import time
+from typing import Optional, Tuple, Union
+
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+RATE_PATTERN = re.compile(r"^(\d+)/(\d*)([smhd])$")
+
+
+class RateLimiter:
+    """A sliding-window rate limiter backed by a Django cache.
+
+    Hits are counted in fixed windows of `period` seconds with the cache's
+    atomic `incr`. The rate at a given moment is estimated as the count of
+    the current window plus the count of the previous window weighted by how
+    much of it still overlaps the sliding window, which smooths the bursts a
+    plain fixed window allows at window boundaries. Only two cache keys per
+    identity exist at any time, and they expire on their own.
+
+    Parameters
+    ----------
+    rate : str or tuple
+        Allowed hits per period, either as `(count, seconds)` or as a string
+        such as "100/m", "10/s", "1000/h" or "20/15m".
+    key_prefix : str
+        Prefix of the cache keys, usually naming the throttled view.
+    cache_alias : str
+        The cache to store counters in.
+
+    Examples
+    --------
+    >>> limiter = RateLimiter("100/m", key_prefix="search")
+    >>> retry_after = limiter.hit("user:42")
+
+    """
+
+    def __init__(
+        self,
+        rate: Union[str, Tuple[int, int]],
+        key_prefix: str = "sage_tools:throttle",
+        cache_alias: str = "default",
+    ) -> None:
+        self.limit, self.period = self.parse_rate(rate)
+        self.key_prefix = key_prefix
+        self.cache_alias = cache_alias
+
+    @staticmethod
+    def parse_rate(rate: Union[str, Tuple[int, int]]) -> Tuple[int, int]:
+        """Returns the `(count, seconds)` pair of a rate."""
+        if isinstance(rate, str):
+            match = RATE_PATTERN.match(rate.replace(" ", ""))
+            if match is None:
+                raise ImproperlyConfigured(
+                    f"Invalid throttle rate {rate!r}; use e.g. '100/m' or '20/15m'."
+                )
+            count, multiplier, unit = match.groups()
+            rate = (int(count), int(multiplier or 1) * PERIODS[unit])
+        if (
+            not isinstance(rate, tuple)
+            or len(rate) != 2
+            or not all(isinstance(value, int) and value > 0 for value in rate)
+        ):
+            raise ImproperlyConfigured(
+                f"Invalid throttle rate {rate!r}; use a (count, seconds) pair of "
+                "positive integers."
+            )
+        return rate
+
+    def hit(self, ident: str, now: Optional[float] = None) -> Optional[int]:
+        """Records a hit for `ident` and returns None if it is allowed, or the
+        number of seconds to wait before retrying if it is throttled."""
+        now = time.time() if now is None else now
+        cache = caches[self.cache_alias]
+        window, offset = divmod(now, self.period)
+        current_key = f"{self.key_prefix}:{ident}:{int(window)}"
+        previous_key = f"{self.key_prefix}:{ident}:{int(window) - 1}"
+
+        # Counters outlive their window so the next one can weigh them
+        cache.add(current_key, 0, self.period * 2)
+        try:
+            current = cache.incr(current_key)
+        except ValueError:
+            # The counter expired or was evicted between add() and incr()
+            cache.set(current_key, 1, self.period * 2)
+            current = 1
+        previous = cache.get(previous_key, 0)
+
+        overlap = 1 - offset / self.period
+        if previous * overlap + current <= self.limit:
+            return None
+        return max(1, math.ceil(self.period - offset))
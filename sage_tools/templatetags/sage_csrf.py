@@ -0,0 +1,37 @@
+"""Template tags for rendering the CSRF input under a custom field name.
+
+`{% secure_csrf_token %}` is a drop-in replacement for `{% csrf_token %}`
+that names the hidden input after `settings.CSRF_INPUT_NAME`. Templates that
+use it need no post-processing, so `SecureCsrfMiddleware` can run with
+`CSRF_REWRITE_RESPONSE = False` and only translate the field name on
+incoming requests.
+
+Usage:
+    {% load sage_csrf %}
+    <form method="post">{% secure_csrf_token %} ...</form>
+
+"""
+
+from django import template
+from django.conf import settings
+from django.utils.html import format_html
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def secure_csrf_token(context):
+    """Renders a hidden CSRF input named after `settings.CSRF_INPUT_NAME`.
+
+    Mirrors Django's `{% csrf_token %}`: nothing is rendered when the context
+    has no token, e.g. for templates rendered without a request.
+
+    """
+    csrf_token = context.get("csrf_token")
+    if not csrf_token or csrf_token == "NOTPROVIDED":
+        return ""
+    return format_html(
+        '<input type="hidden" name="{}" value="{}">',
+        settings.CSRF_INPUT_NAME,
+        csrf_token,
+    )
@@ -1,5 +1,26 @@
+import django
 import pytest
+from django.conf import settings
+
+if not settings.configured:
+    settings.configure(
+        DJANGO_ADMIN_URL_PREFIX="admin",
+        SECRET_KEY="sage-tools-tests",
+        INSTALLED_APPS=[
+            "django.contrib.contenttypes",
+            "django.contrib.auth",
+            "django.contrib.sessions",
+            "sage_tools",
+        ],
+        DATABASES={
+            "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+        },
+    )
+    django.setup()
+
+from django.contrib.sessions.backends.cache import SessionStore
 from django.http import HttpRequest
+from django.test import override_settings
 from unittest.mock import Mock
 from cryptography.fernet import Fernet
 
@@ -8,6 +29,22 @@ from sage_tools.encryptors import FernetEncryptor, DummyEncryptor
 from sage_tools.services.slug import SlugService
 
 
+@pytest.fixture(scope="session")
+def migrated_db():
+    from django.core.management import call_command
+
+    call_command("migrate", verbosity=0)
+
+
+@pytest.fixture
+def database(migrated_db):
+    from django.db import transaction
+
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
 @pytest.fixture
 def mock_request():
     return HttpRequest()
@@ -33,6 +70,14 @@ def dummy_encryptor():
     return DummyEncryptor()
 
 
+@pytest.fixture
+def session_request(secret_key):
+    request = HttpRequest()
+    request.session = SessionStore()
+    with override_settings(FERNET_SECRET_KEY=secret_key):
+        yield request
+
+
 @pytest.fixture
 def generator():
     return BaseDataGenerator(locale="en")
@@ -0,0 +1,106 @@
+import json
+
+import pytest
+
+from sage_tools.encryptors import DummyEncryptor, FernetEncryptor
+from sage_tools.encryptors.benchmark import EncryptorBenchmark, main
+
+
+class TestEncryptorBenchmark:
+    """Test suite for the `EncryptorBenchmark` harness."""
+
+    def test_run_covers_every_combination(self, dummy_encryptor, fernet_encryptor):
+        """Test that a result is produced per encryptor, operation, size and
+        thread count.
+
+        Parameters
+        ----------
+        dummy_encryptor : DummyEncryptor
+            The DummyEncryptor instance used for testing.
+        fernet_encryptor : FernetEncryptor
+            The FernetEncryptor instance used for testing.
+
+        """
+        benchmark = EncryptorBenchmark(
+            {"dummy": dummy_encryptor, "fernet": fernet_encryptor},
+            sizes=[16, 1024],
+            threads=[1, 2],
+            duration=0.01,
+        )
+        results = benchmark.run()
+        assert len(results) == 2 * 2 * 2 * 2
+        for result in results:
+            assert result.operations > 0
+            assert result.bytes_per_second == pytest.approx(
+                result.ops_per_second * result.payload_size, rel=1e-3
+            )
+
+    def test_to_json_is_parseable(self, dummy_encryptor):
+        """Test that the JSON report contains the measured results.
+
+        Parameters
+        ----------
+        dummy_encryptor : DummyEncryptor
+            The DummyEncryptor instance used for testing.
+
+        """
+        benchmark = EncryptorBenchmark(
+            {"dummy": dummy_encryptor}, sizes=[16], threads=[1], duration=0.01
+        )
+        report = json.loads(benchmark.to_json(benchmark.run()))
+        assert report["results"][0]["encryptor"] == "dummy"
+        assert {"python", "platform"} <= report.keys()
+
+    def test_invalid_configuration_raises(self, dummy_encryptor):
+        """Test that empty encryptors or non-positive sizes are rejected.
+
+        Parameters
+        ----------
+        dummy_encryptor : DummyEncryptor
+            The DummyEncryptor instance used for testing.
+
+        """
+        with pytest.raises(ValueError):
+            EncryptorBenchmark({})
+        with pytest.raises(ValueError):
+            EncryptorBenchmark({"dummy": dummy_encryptor}, sizes=[0])
+
+    def test_build_encryptor_from_dotted_path(self):
+        """Test that encryptor classes are built with or without a key."""
+        assert isinstance(
+            EncryptorBenchmark.build_encryptor("sage_tools.encryptors.DummyEncryptor"),
+            DummyEncryptor,
+        )
+        assert isinstance(
+            EncryptorBenchmark.build_encryptor("sage_tools.encryptors.FernetEncryptor"),
+            FernetEncryptor,
+        )
+        with pytest.raises(TypeError):
+            EncryptorBenchmark.build_encryptor("json.dumps")
+
+    def test_main_writes_report(self, tmp_path):
+        """Test that the command-line entry point writes a JSON report.
+
+        Parameters
+        ----------
+        tmp_path : pathlib.Path
+            Temporary directory provided by pytest.
+
+        """
+        output = tmp_path / "report.json"
+        main(
+            [
+                "--encryptor",
+                "sage_tools.encryptors.DummyEncryptor",
+                "--sizes",
+                "16",
+                "--threads",
+                "1",
+                "--duration",
+                "0.01",
+                "--output",
+                str(output),
+            ]
+        )
+        report = json.loads(output.read_text())
+        assert report["results"][0]["encryptor"] == "DummyEncryptor"
@@ -1,5 +1,5 @@
 import pytest
-from cryptography.fernet import InvalidToken
+from cryptography.fernet import Fernet, InvalidToken
 
 
 class TestEncryptors:
@@ -86,3 +86,38 @@ class TestEncryptors:
         """
         with pytest.raises(TypeError):
             fernet_encryptor.encrypt(12345)  # Pass an invalid data type
+
+    def test_fernet_encryptor_decrypt_with_ttl(self, fernet_encryptor, secret_key):
+        """Test that `FernetEncryptor` rejects tokens older than the TTL.
+
+        Parameters
+        ----------
+        fernet_encryptor : FernetEncryptor
+            The FernetEncryptor instance used for testing.
+        secret_key : bytes
+            The key the encryptor was built with.
+
+        """
+        fresh = fernet_encryptor.encrypt("Hello, World!")
+        assert fernet_encryptor.decrypt(fresh, ttl=60) == "Hello, World!"
+
+        old = Fernet(secret_key).encrypt_at_time(b"Hello, World!", 1000)
+        with pytest.raises(InvalidToken):
+            fernet_encryptor.decrypt(old, ttl=60)
+
+    def test_fernet_encryptor_read_timestamp(self, fernet_encryptor, secret_key):
+        """Test that the token timestamp is read without decrypting.
+
+        Parameters
+        ----------
+        fernet_encryptor : FernetEncryptor
+            The FernetEncryptor instance used for testing.
+        secret_key : bytes
+            The key the encryptor was built with.
+
+        """
+        token = Fernet(secret_key).encrypt_at_time(b"Hello, World!", 1000)
+        assert fernet_encryptor.read_timestamp(token) == 1000
+        assert fernet_encryptor.read_timestamp(token.decode("utf-8")) == 1000
+        with pytest.raises(InvalidToken):
+            fernet_encryptor.read_timestamp("not a token")
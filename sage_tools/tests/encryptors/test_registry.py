@@ -0,0 +1,90 @@
+import threading
+
+from cryptography.fernet import Fernet
+from django.test import override_settings
+
+from sage_tools.encryptors import DummyEncryptor, EncryptorRegistry, FernetEncryptor
+
+
+class TestEncryptorRegistry:
+    """Test suite for the `EncryptorRegistry` class."""
+
+    def setup_method(self):
+        EncryptorRegistry.reset()
+
+    def test_get_returns_shared_instance(self, secret_key):
+        """Test that the same key always yields the same encryptor instance.
+
+        Parameters
+        ----------
+        secret_key : bytes
+            The Fernet key used for testing.
+
+        """
+        first = EncryptorRegistry.get(secret_key)
+        second = EncryptorRegistry.get(secret_key.decode("utf-8"))
+        assert isinstance(first, FernetEncryptor)
+        assert first is second
+
+    def test_get_separates_keys_and_classes(self, secret_key):
+        """Test that different keys or classes get their own instances.
+
+        Parameters
+        ----------
+        secret_key : bytes
+            The Fernet key used for testing.
+
+        """
+        other_key = Fernet.generate_key()
+        assert EncryptorRegistry.get(secret_key) is not EncryptorRegistry.get(other_key)
+        dummy = EncryptorRegistry.get(
+            secret_key, encryptor_class=lambda key: DummyEncryptor()
+        )
+        assert isinstance(dummy, DummyEncryptor)
+
+    def test_reset_drops_cached_instances(self, secret_key):
+        """Test that `reset` forces a new instance to be built.
+
+        Parameters
+        ----------
+        secret_key : bytes
+            The Fernet key used for testing.
+
+        """
+        first = EncryptorRegistry.get(secret_key)
+        EncryptorRegistry.reset()
+        assert EncryptorRegistry.get(secret_key) is not first
+
+    def test_changing_secret_key_setting_resets_registry(self, secret_key):
+        """Test that overriding `FERNET_SECRET_KEY` clears the registry.
+
+        Parameters
+        ----------
+        secret_key : bytes
+            The Fernet key used for testing.
+
+        """
+        first = EncryptorRegistry.get(secret_key)
+        with override_settings(FERNET_SECRET_KEY=secret_key):
+            assert EncryptorRegistry.get(secret_key) is not first
+
+    def test_get_is_thread_safe(self, secret_key):
+        """Test that concurrent lookups all receive the same instance.
+
+        Parameters
+        ----------
+        secret_key : bytes
+            The Fernet key used for testing.
+
+        """
+        results = []
+
+        def lookup():
+            results.append(EncryptorRegistry.get(secret_key))
+
+        threads = [threading.Thread(target=lookup) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len({id(encryptor) for encryptor in results}) == 1
@@ -0,0 +1,482 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from cryptography.fernet import Fernet
+from django.test import override_settings
+
+from sage_tools.handlers.session import SessionHandler
+
+
+def expired_entry(secret_key, value="1"):
+    """Builds an encrypted entry whose token was created an hour ago."""
+    token = Fernet(secret_key).encrypt_at_time(
+        value.encode("utf-8"), int(time.time()) - 3600
+    )
+    return SessionHandler.encode_ttl_entry(token.decode("utf-8"), timedelta(minutes=10))
+
+
+class TestSessionHandler:
+    """Test suite for the `SessionHandler` class."""
+
+    def test_set_and_get_roundtrip(self, session_request):
+        """Test that a value is encrypted in the session and decrypted on
+        read.
+
+        Parameters
+        ----------
+        session_request : HttpRequest
+            A request with an in-memory session.
+
+        """
+        handler = SessionHandler(session_request)
+        handler.set("color", "blue")
+        assert session_request.session["color"].startswith("sh2:600:")
+        assert "blue" not in session_request.session["color"]
+        assert handler.get("color") == "blue"
+        assert handler.exists("color")
+
+    @override_settings(SESSION_HANDLER_PURGE_INTERVAL=0)
+    def test_expired_value_is_removed(self, session_request, secret_key):
+        """Test that reading an expired value deletes it.
+
+        Parameters
+        ----------
+        session_request : HttpRequest
+            A request with an in-memory session.
+        secret_key : bytes
+            The Fernet key used by the handler.
+
+        """
+        session_request.session["color"] = expired_entry(secret_key)
+        handler = SessionHandler(session_request)
+        assert handler.is_expired("color")
+        with patch.object(
+            handler.fernet.fernet, "decrypt", wraps=handler.fernet.fernet.decrypt
+        ) as decrypt:
+            assert handler.get("color") is None
+        assert decrypt.call_args.kwargs["ttl"] == 600
+        assert "color" not in session_request.session
+
+    def test_tampered_value_is_rejected(self, session_request):
+        """Test that a token with a broken signature is not returned.
+
+        Parameters
+        ----------
+        session_request : HttpRequest
+            A request with an in-memory session.
+
+        """
+        handler = SessionHandler(session_request)
+        handler.set("color", "blue")
+        session_request.session["color"] = (
+            session_request.session["color"][:-4] + "AAAA"
+        )
+        assert handler.get("color") is None
+        assert "color" in session_request.session
+
+
+class TestSessionHandlerBatch:
+    """Test suite for `SessionHandler.batch`."""
+
+    def test_batch_applies_changes_on_exit(self, session_request):
+        """Test that staged operations reach the session only on exit.
+
+        Parameters
+        ----------
+        session_request : HttpRequest
+            A request with an in-memory session.
+
+        """
+        handler = SessionHandler(session_request)
+        handler.set("stale", "1")
+        session_request.session.modified = False
+
+        with handler.batch() as batch:
+            batch.set("step", "2")
+            batch.set("token", "abc", lifespan=timedelta(minutes=5))
+            batch.delete("stale")
+            assert batch.get("step") == "2"
+            assert batch.get("stale") is None
+            assert "step" not in session_request.session
+            assert session_request.session.modified is False
+
+        assert session_request.session.modified is True
+        assert handler.get("token") == "abc"
+        assert "stale" not in session_request.session
+
+    def test_batch_without_changes_keeps_session_clean(self, session_request):
+        """Test that no-op operations don't mark the session modified.
+
+        Parameters
+        ----------
+        session_request : HttpRequest
+            A request with an in-memory session.
+
+        """
+        handler = SessionHandler(session_request)
+        handler.set("color", "blue")
+        session_request.session.modified = False
+
+        with handler.batch() as batch:
+            batch.delete("missing")
+            assert batch.refresh("missing") is False
+            batch.set("temp", "x")
+            batch.delete("temp")
+
+        assert session_request.session.modified is False
+        assert "temp" not in session_request.session
+
+    def test_batch_discards_changes_on_error(self, session_request):
+        """Test that an exception inside the block drops staged operations.
+
+        Parameters
+        ----------
+        session_request : HttpRequest
+            A request with an in-memory session.
+
+        """
+        handler = SessionHandler(session_request)
+        with pytest.raises(RuntimeError):
+            with handler.batch() as batch:
+                batch.set("color", "blue")
+                raise RuntimeError
+        assert "color" not in session_request.session
+        assert handler.get("color") is None
+
+    def test_refresh_in_batch_does_not_touch_stored_entry(self, session_request):
+        """Test that a staged refresh leaves the stored entry untouched until
+        the block exits.
+
+        Parameters
+        ----------
+        session_request : HttpRequest
+            A request with an in-memory session.
+
+        """
+        handler = SessionHandler(session_request)
+        handler.set("color", "blue", lifespan=timedelta(minutes=1))
+        with handler.batch() as batch:
+            assert batch.refresh("color", lifespan=timedelta(hours=1)) is True
+            assert session_request.session["color"].startswith("sh2:60:")
+        assert session_request.session["color"].startswith("sh2:360")
+        assert handler.get("color") == "blue"
+
+
+class TestSessionHandlerMemoization:
+    """Test suite for the per-request decrypted value cache."""
+
+    def test_value_is_decrypted_once_per_request(self, session_request):
+        """Test that repeated reads, even from new handlers, decrypt once.
+
+        Parameters
+        ----------
+        session_request : HttpRequest
+            A request with an in-memory session.
+
+        """
+        SessionHandler(session_request).set("user_timezone", "Asia/Tehran")
+        handler = SessionHandler(session_request)
+        with patch.object(
+            handler.fernet, "decrypt", wraps=handler.fernet.decrypt
+        ) as decrypt:
+            for _ in range(3):
+                assert (
+                    SessionHandler(session_request).get("user_timezone")
+                    == "Asia/Tehran"
+                )
+        assert decrypt.call_count == 1
+
+    def test_cache_is_invalidated_on_set_delete_and_flush(self, session_request):
+        """Test that writes never return a stale memoized value.
+
+        Parameters
+        ----------
+        session_request : HttpRequest
+            A request with an in-memory session.
+
+        """
+        handler = SessionHandler(session_request)
+        handler.set("color", "blue")
+        assert handler.get("color") == "blue"
+
+        handler.set("color", "red")
+        assert handler.get("color") == "red"
+
+        handler.delete("color")
+        assert handler.get("color") is None
+
+        handler.set("color", "green")
+        assert handler.get("color") == "green"
+        handler.flush()
+        assert getattr(session_request, SessionHandler.cache_attribute) == {}
+
+
+class TestSessionHandlerPurge:
+    """Test suite for purging expired SessionHandler entries."""
+
+    def test_expired_keys_ignores_foreign_values(self):
+        """Test that only expired SessionHandler entries are reported."""
+        data = {
+            "expired": {"value": "x", "created_at": 0, "lifespan": 10},
+            "fresh": {"value": "x", "created_at": 95, "lifespan": 10},
+            "_auth_user_id": "1",
+            "cart": {"items": []},
+        }
+        assert SessionHandler.expired_keys(data, now=100) == ["expired"]
+
+    def test_purge_expired_removes_entries(self, session_request, secret_key):
+        """Test that `purge_expired` removes every expired entry.
+
+        Parameters
+        ----------
+        session_request : HttpRequest
+            A request with an in-memory session.
+        secret_key : bytes
+            The Fernet key used by the handler.
+
+        """
+        handler = SessionHandler(session_request)
+        handler.set("new", "2")
+        handler.set("plain", "3", encrypt=False)
+        session_request.session["old"] = expired_entry(secret_key)
+        session_request.session["legacy"] = {
+            "value": "x",
+            "created_at": 0,
+            "lifespan": 10,
+        }
+        assert handler.purge_expired() == 2
+        assert "legacy" not in session_request.session
+        assert handler.get("plain", decrypt=False) == "3"
+        assert "old" not in session_request.session
+        assert handler.get("new") == "2"
+
+    @override_settings(SESSION_HANDLER_PURGE_INTERVAL=60)
+    def test_handler_sweeps_at_most_once_per_interval(
+        self, session_request, secret_key
+    ):
+        """Test that handlers sweep the session on first access, only once per
+        interval.
+
+        Parameters
+        ----------
+        session_request : HttpRequest
+            A request with an in-memory session.
+        secret_key : bytes
+            The Fernet key used by the handler.
+
+        """
+        session_request.session["old"] = expired_entry(secret_key)
+
+        handler = SessionHandler(session_request)
+        assert "old" in session_request.session
+        assert handler.exists("other") is False
+        assert "old" not in session_request.session
+        marker = session_request.session[SessionHandler.purge_marker_key]
+
+        session_request.session["old"] = expired_entry(secret_key)
+        SessionHandler(session_request).exists("other")
+        assert "old" in session_request.session
+        assert session_request.session[SessionHandler.purge_marker_key] == marker
+
+    @override_settings(SESSION_HANDLER_PURGE_INTERVAL=60)
+    def test_empty_session_is_not_marked(self, session_request):
+        """Test that sweeping never writes into an empty session.
+
+        Parameters
+        ----------
+        session_request : HttpRequest
+            A request with an in-memory session.
+
+        """
+        SessionHandler(session_request).exists("color")
+        assert session_request.session.modified is False
+        assert SessionHandler.purge_marker_key not in session_request.session
+
+    @override_settings(SESSION_HANDLER_PURGE_INTERVAL=60)
+    def test_foreign_session_data_is_not_marked(self, session_request):
+        """Test that reads do not dirty a session without handler entries.
+
+        Parameters
+        ----------
+        session_request : HttpRequest
+            A request with an in-memory session.
+
+        """
+        session_request.session["_auth_user_id"] = "1"
+        session_request.session.modified = False
+
+        assert SessionHandler(session_request).get("color") is None
+        assert session_request.session.modified is False
+        assert SessionHandler.purge_marker_key not in session_request.session
+
+
+class TestSessionHandlerEnvelopes:
+    """Test suite for the session entry envelopes."""
+
+    def test_encode_decode_roundtrip(self):
+        """Test that a plain envelope decodes to its value and expiry."""
+        envelope = SessionHandler.encode_entry("value:with:colons", 100.2)
+        assert envelope == "sh1:101:value:with:colons"
+        assert SessionHandler.decode_entry(envelope) == ("value:with:colons", 101.0)
+
+    def test_ttl_envelope_expiry_comes_from_token(self, fernet_encryptor):
+        """Test that the expiry of an encrypted entry is read from the token.
+
+        Parameters
+        ----------
+        fernet_encryptor : FernetEncryptor
+            The FernetEncryptor instance used for testing.
+
+        """
+        token = fernet_encryptor.encrypt("blue")
+        envelope = SessionHandler.encode_ttl_entry(token, timedelta(seconds=30))
+        value, expires_at = SessionHandler.decode_entry(envelope)
+        assert value == token
+        assert expires_at == fernet_encryptor.read_timestamp(token) + 30
+        assert SessionHandler.decode_entry("sh2:30:garbage") == ("garbage", 0.0)
+
+    def test_decode_ignores_foreign_values(self):
+        """Test that values not written by SessionHandler are ignored."""
+        assert SessionHandler.decode_entry("plain string") is None
+        assert SessionHandler.decode_entry("sh1:soon:value") is None
+        assert SessionHandler.decode_entry({"value": "x"}) is None
+        assert SessionHandler.decode_entry(42) is None
+
+    def test_plain_values_use_absolute_expiry(self, session_request):
+        """Test that unencrypted values are stored in a plain envelope.
+
+        Parameters
+        ----------
+        session_request : HttpRequest
+            A request with an in-memory session.
+
+        """
+        handler = SessionHandler(session_request)
+        handler.set("color", "blue", encrypt=False)
+        assert session_request.session["color"].endswith(":blue")
+        assert session_request.session["color"].startswith("sh1:")
+        assert handler.get("color", decrypt=False) == "blue"
+        assert not handler.is_expired("color")
+
+    def test_plain_objects_keep_their_type(self, session_request):
+        """Test that unencrypted non-string values are not turned into text.
+
+        Parameters
+        ----------
+        session_request : HttpRequest
+            A request with an in-memory session.
+
+        """
+        handler = SessionHandler(session_request)
+        handler.set("cart", {"a": 1}, encrypt=False)
+        assert handler.get("cart", decrypt=False) == {"a": 1}
+        assert handler.refresh("cart") is True
+        assert handler.get("cart", decrypt=False) == {"a": 1}
+        with pytest.raises(TypeError):
+            SessionHandler.encode_entry({"a": 1}, time.time() + 60)
+
+    def test_legacy_entries_migrate_on_refresh(self, session_request, secret_key):
+        """Test that legacy dict entries are read and rewritten as envelopes.
+
+        Parameters
+        ----------
+        session_request : HttpRequest
+            A request with an in-memory session.
+        secret_key : bytes
+            The Fernet key used by the handler.
+
+        """
+        session_request.session["color"] = {
+            "value": Fernet(secret_key).encrypt(b"blue").decode("utf-8"),
+            "created_at": time.time(),
+            "lifespan": 600.0,
+        }
+        handler = SessionHandler(session_request)
+        assert handler.get("color") == "blue"
+        assert handler.refresh("color") is True
+        assert session_request.session["color"].startswith("sh1:")
+        assert handler.get("color") == "blue"
+
+
+class TestSessionHandlerAsync:
+    """Test suite for the async `SessionHandler` methods."""
+
+    def test_async_roundtrip(self, session_request):
+        """Test that the async methods mirror their sync counterparts.
+
+        Parameters
+        ----------
+        session_request : HttpRequest
+            A request with an in-memory session.
+
+        """
+        handler = SessionHandler(session_request)
+
+        async def scenario():
+            await handler.aset("color", "blue", lifespan=timedelta(minutes=1))
+            assert await handler.aget("color") == "blue"
+            assert await handler.aexists("color") is True
+            assert await handler.arefresh("color", lifespan=timedelta(hours=1))
+            assert session_request.session["color"].startswith("sh2:360")
+            assert await handler.adelete("color") is not None
+            assert await handler.aexists("color") is False
+            assert await handler.aget("color") is None
+
+        asyncio.run(scenario())
+        assert handler.get("color") is None
+
+    def test_abatch_applies_changes_on_exit(self, session_request):
+        """Test that `abatch` stages async operations until the block exits.
+
+        Parameters
+        ----------
+        session_request : HttpRequest
+            A request with an in-memory session.
+
+        """
+        handler = SessionHandler(session_request)
+
+        async def scenario():
+            async with handler.abatch() as batch:
+                await batch.aset("step", "2")
+                assert await batch.aget("step") == "2"
+                assert "step" not in session_request.session
+
+        asyncio.run(scenario())
+        assert handler.get("step") == "2"
+
+    @override_settings(SESSION_HANDLER_ASYNC_OFFLOAD_SIZE=100)
+    def test_large_payloads_use_the_executor(self, session_request):
+        """Test that only payloads above the threshold leave the event loop.
+
+        Parameters
+        ----------
+        session_request : HttpRequest
+            A request with an in-memory session.
+
+        """
+        handler = SessionHandler(session_request)
+        executor = ThreadPoolExecutor(max_workers=1)
+
+        async def scenario():
+            await handler.aset("small", "x" * 10)
+            assert await handler.aget("small") == "x" * 10
+            assert get_executor.call_count == 0
+
+            await handler.aset("large", "x" * 1000)
+            assert await handler.aget("large") == "x" * 1000
+            assert get_executor.call_count == 2
+
+            # A memoized value is returned without another executor hop.
+            assert await handler.aget("large") == "x" * 1000
+            assert get_executor.call_count == 2
+
+        with patch.object(
+            SessionHandler, "_get_executor", return_value=executor
+        ) as get_executor:
+            asyncio.run(scenario())
+        executor.shutdown()
@@ -0,0 +1,127 @@
+import time
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+
+from sage_tools.handlers.session import SessionHandler
+
+
+def live_entry(value="live"):
+    return SessionHandler.encode_entry(value, time.time() + 600)
+
+
+def expired_entry(value="old"):
+    return SessionHandler.encode_entry(value, time.time() - 10)
+
+
+def legacy_entry(value="legacy"):
+    return {"value": value, "created_at": time.time(), "lifespan": 600}
+
+
+def create_session(**data):
+    store = SessionStore()
+    store.update(data)
+    store.save()
+    return store.session_key
+
+
+def load_session(session_key):
+    return SessionStore(session_key=session_key).load()
+
+
+def purge(*args):
+    out = StringIO()
+    call_command("purge_session_handler_entries", *args, stdout=out)
+    return out.getvalue()
+
+
+@pytest.mark.usefixtures("database")
+class TestPurgeSessionHandlerEntries:
+    """Test suite for the `purge_session_handler_entries` command."""
+
+    def test_expired_entries_are_removed(self):
+        """Test that only expired handler entries are removed, across batches."""
+        first = create_session(old=expired_entry(), new=live_entry(), other=1)
+        second = create_session(old=expired_entry())
+        untouched = create_session(new=live_entry())
+
+        output = purge("--batch-size", "1")
+
+        assert load_session(first) == {"new": live_entry(), "other": 1}
+        assert load_session(second) == {}
+        assert load_session(untouched) == {"new": live_entry()}
+        assert "2 expired entries removed in 2 of 3 sessions." in output
+
+    def test_dry_run_writes_nothing(self):
+        """Test that a dry run reports the purge without performing it."""
+        data = {"old": expired_entry(), "legacy": legacy_entry()}
+        session_key = create_session(**data)
+
+        output = purge("--dry-run", "--compact")
+
+        assert load_session(session_key) == data
+        assert output.startswith(
+            "Dry run: 1 expired entries removed, 1 legacy entries compacted "
+            "in 1 of 1 sessions."
+        )
+
+    def test_compact_rewrites_legacy_entries(self):
+        """Test that `--compact` turns legacy dict entries into envelopes."""
+        session_key = create_session(legacy=legacy_entry())
+
+        purge("--compact")
+
+        stored = load_session(session_key)["legacy"]
+        assert stored.startswith("sh1:")
+        assert SessionHandler.decode_entry(stored)[0] == "legacy"
+
+    def test_compact_keeps_non_string_entries(self):
+        """Test that legacy entries holding other types are left as dicts."""
+        entry = legacy_entry({"a": 1})
+        session_key = create_session(cart=entry)
+
+        purge("--compact")
+
+        assert load_session(session_key) == {"cart": entry}
+
+    def test_sessions_saved_during_the_run_are_skipped(self):
+        """Test that a session saved concurrently is not overwritten."""
+        session_key = create_session(old=expired_entry())
+        expired_keys = SessionHandler.expired_keys
+
+        def save_concurrently(data, now=None):
+            store = SessionStore(session_key=session_key)
+            store["cart"] = "3 items"
+            store.save()
+            return expired_keys(data, now)
+
+        with patch.object(SessionHandler, "expired_keys", save_concurrently):
+            output = purge()
+
+        assert load_session(session_key)["cart"] == "3 items"
+        assert "in 0 of 1 sessions; 1 sessions changed" in output
+
+    @pytest.mark.parametrize(
+        "args, settings",
+        [
+            (["--batch-size", "0"], {}),
+            ([], {"SESSION_ENGINE": "django.contrib.sessions.backends.cache"}),
+        ],
+    )
+    def test_invalid_usage_raises(self, args, settings):
+        """Test that bad options and non-database session engines are rejected.
+
+        Parameters
+        ----------
+        args : list
+            The command line arguments.
+        settings : dict
+            Settings overridden for the run.
+
+        """
+        with override_settings(**settings), pytest.raises(CommandError):
+            purge(*args)
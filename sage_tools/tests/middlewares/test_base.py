@@ -0,0 +1,126 @@
+import asyncio
+import threading
+from unittest.mock import patch
+
+import pytest
+from asgiref.sync import iscoroutinefunction
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from sage_tools.middlewares.base import AsyncMiddlewareMixin
+
+
+class RecordingMiddleware(AsyncMiddlewareMixin):
+    """Records the hooks it runs."""
+
+    def process_request(self, request):
+        request.calls = ["request"]
+
+    def process_response(self, request, response):
+        request.calls.append("response")
+        return response
+
+
+async def async_view(request):
+    return HttpResponse()
+
+
+class TestAsyncMiddlewareMixin:
+    """Test suite for `AsyncMiddlewareMixin`."""
+
+    def test_hooks_run_without_sync_to_async(self):
+        """Test that async requests call the hooks on the event loop."""
+        middleware = RecordingMiddleware(async_view)
+        assert iscoroutinefunction(middleware)
+        request = RequestFactory().get("/")
+        with patch("django.utils.deprecation.sync_to_async") as sync_to_async:
+            response = asyncio.run(middleware(request))
+        sync_to_async.assert_not_called()
+        assert response.status_code == 200
+        assert request.calls == ["request", "response"]
+
+    def test_native_async_can_be_disabled(self):
+        """Test that disabling `native_async` falls back to MiddlewareMixin."""
+        middleware = RecordingMiddleware(async_view)
+        middleware.native_async = False
+        request = RequestFactory().get("/")
+        asyncio.run(middleware(request))
+        assert request.calls == ["request", "response"]
+
+    def test_sync_requests_are_unchanged(self):
+        """Test that the sync path still runs both hooks."""
+        middleware = RecordingMiddleware(lambda request: HttpResponse())
+        request = RequestFactory().get("/")
+        middleware(request)
+        assert request.calls == ["request", "response"]
+
+
+class TestSecureCsrfMiddlewareAsync:
+    """Test suite for the async mode of `SecureCsrfMiddleware`."""
+
+    @pytest.fixture
+    def middleware_class(self):
+        with override_settings(CSRF_INPUT_NAME="secure_token"):
+            from sage_tools.middlewares.csrf import SecureCsrfMiddleware
+
+            yield SecureCsrfMiddleware
+
+    def test_process_view_is_async_in_async_mode(self, middleware_class):
+        """Test that Django gets a coroutine `process_view` under ASGI.
+
+        Parameters
+        ----------
+        middleware_class : type
+            The `SecureCsrfMiddleware` class.
+
+        """
+        middleware = middleware_class(async_view)
+        assert iscoroutinefunction(middleware.process_view)
+        request = RequestFactory().get("/")
+        assert asyncio.run(middleware.process_view(request, async_view, (), {})) is None
+
+    def test_session_secrets_keep_thread_hops(self, middleware_class):
+        """Test that CSRF_USE_SESSIONS disables the native async path.
+
+        Parameters
+        ----------
+        middleware_class : type
+            The `SecureCsrfMiddleware` class.
+
+        """
+        with override_settings(CSRF_USE_SESSIONS=True):
+            middleware = middleware_class(async_view)
+        assert not middleware.native_async
+        assert not iscoroutinefunction(middleware.process_view)
+
+    def test_unsafe_methods_run_in_a_thread(self, middleware_class):
+        """Test that POST hooks, which may parse the body, leave the loop.
+
+        Parameters
+        ----------
+        middleware_class : type
+            The `SecureCsrfMiddleware` class.
+
+        """
+
+        class ThreadRecordingMiddleware(middleware_class):
+            def process_request(self, request):
+                request.threads = [threading.get_ident()]
+                return super().process_request(request)
+
+            def process_view(self, request, *args):
+                request.threads.append(threading.get_ident())
+                return super().process_view(request, *args)
+
+        middleware = ThreadRecordingMiddleware(async_view)
+        loop_thread = threading.get_ident()
+
+        request = RequestFactory().get("/")
+        asyncio.run(middleware(request))
+        asyncio.run(middleware.process_view(request, async_view, (), {}))
+        assert request.threads == [loop_thread, loop_thread]
+
+        request = RequestFactory().post("/", {"secure_token": "token"})
+        asyncio.run(middleware(request))
+        asyncio.run(middleware.process_view(request, async_view, (), {}))
+        assert loop_thread not in request.threads
@@ -0,0 +1,45 @@
+import json
+
+import pytest
+from cryptography.fernet import Fernet
+from django.test import override_settings
+
+from sage_tools.middlewares.benchmark import (
+    DEFAULT_MIDDLEWARES,
+    MiddlewareBenchmark,
+)
+
+
+class TestMiddlewareBenchmark:
+    """Test suite for the `MiddlewareBenchmark` harness."""
+
+    def test_run_covers_every_combination(self):
+        """Test that a result is produced per middleware, mode and
+        concurrency level."""
+        benchmark = MiddlewareBenchmark(
+            DEFAULT_MIDDLEWARES, requests=4, concurrency=[1, 2]
+        )
+        with override_settings(
+            ALLOWED_HOSTS=["testserver"],
+            CSRF_INPUT_NAME="secure_token",
+            FERNET_SECRET_KEY=Fernet.generate_key(),
+            LANGUAGES=[("en", "English")],
+            LANGUAGE_CODE="en",
+            USE_I18N=False,
+        ):
+            results = benchmark.run()
+        assert len(results) == 3 * 2 * 2
+        assert {result.mode for result in results} == {"sync_to_async", "native"}
+        assert all(result.requests_per_second > 0 for result in results)
+
+        report = json.loads(benchmark.to_json(results))
+        assert report["results"][0]["middleware"] == "TimezoneMiddleware"
+
+    def test_invalid_configuration_raises(self):
+        """Test that empty middlewares or bad counts are rejected."""
+        with pytest.raises(ValueError):
+            MiddlewareBenchmark({})
+        with pytest.raises(ValueError):
+            MiddlewareBenchmark(DEFAULT_MIDDLEWARES, requests=0)
+        with pytest.raises(ValueError):
+            MiddlewareBenchmark(DEFAULT_MIDDLEWARES, concurrency=[0])
@@ -0,0 +1,209 @@
+from unittest.mock import patch
+
+import pytest
+from django.http import HttpResponse
+from django.middleware.locale import LocaleMiddleware as DjangoLocaleMiddleware
+from django.test import RequestFactory, override_settings
+from django.utils import translation
+
+from sage_tools.middlewares.cookie import CookieLocaleMiddleware
+from sage_tools.utils.locale import MultilingualService
+
+LANGUAGES = [("en", "English"), ("fa", "Persian"), ("de", "German")]
+
+urlpatterns = []
+
+
+@pytest.fixture
+def locale_middleware():
+    with override_settings(
+        USE_I18N=False,
+        LANGUAGES=LANGUAGES,
+        LANGUAGE_CODE="en",
+        LANGUAGE_COOKIE_NAME="django_language",
+        ROOT_URLCONF=__name__,
+    ):
+        MultilingualService.clear_cache()
+        yield CookieLocaleMiddleware(lambda request: HttpResponse())
+    MultilingualService.clear_cache()
+    translation.deactivate()
+
+
+def make_request(path, cookie=None):
+    """Builds a GET request with an optional language cookie.
+
+    Parameters
+    ----------
+    path : str
+        The requested path.
+    cookie : str, optional
+        The value of the language cookie.
+
+    """
+    request = RequestFactory().get(path)
+    if cookie is not None:
+        request.COOKIES["django_language"] = cookie
+    return request
+
+
+def active_language(language):
+    """Reports `language` as active; translations are disabled in tests.
+
+    Parameters
+    ----------
+    language : str
+        The language code returned by `translation.get_language`.
+
+    """
+    return patch.object(translation, "get_language", return_value=language)
+
+
+class TestCookieLocaleMiddlewareRequest:
+    """Test suite for `CookieLocaleMiddleware.process_request`."""
+
+    @pytest.mark.parametrize(
+        "path, cookie, location",
+        [
+            ("/about/", "fa", "/fa/about/"),
+            ("/de/about/", "fa", "/fa/about/"),
+            ("/fa/about/", "en", "/about/"),
+            ("/de/about/", None, "/de/about/"),
+        ],
+    )
+    def test_redirects(self, locale_middleware, path, cookie, location):
+        """Test that mismatched URL and cookie languages redirect.
+
+        Parameters
+        ----------
+        locale_middleware : CookieLocaleMiddleware
+            The middleware under test.
+        path : str
+            The requested path.
+        cookie : str or None
+            The value of the language cookie.
+        location : str
+            The expected redirect target.
+
+        """
+        response = locale_middleware.process_request(make_request(path, cookie))
+        assert response.status_code == 302
+        assert response["Location"] == location
+
+    def test_valid_cookie_skips_parent_negotiation(self, locale_middleware):
+        """Test that a valid cookie decides the language on its own.
+
+        Parameters
+        ----------
+        locale_middleware : CookieLocaleMiddleware
+            The middleware under test.
+
+        """
+        request = make_request("/fa/about/", "fa")
+        with patch.object(DjangoLocaleMiddleware, "process_request") as parent:
+            assert locale_middleware.process_request(request) is None
+        parent.assert_not_called()
+        assert request.LANGUAGE_CODE == "fa"
+
+    def test_without_cookie_falls_back_to_parent(self, locale_middleware):
+        """Test that Django's negotiation still runs without a cookie.
+
+        Parameters
+        ----------
+        locale_middleware : CookieLocaleMiddleware
+            The middleware under test.
+
+        """
+        request = make_request("/about/")
+        with patch.object(DjangoLocaleMiddleware, "process_request") as parent:
+            assert locale_middleware.process_request(request) is None
+        parent.assert_called_once_with(request)
+
+    def test_exempt_paths_are_not_redirected(self, locale_middleware):
+        """Test that the language switch view is never redirected.
+
+        Parameters
+        ----------
+        locale_middleware : CookieLocaleMiddleware
+            The middleware under test.
+
+        """
+        request = make_request("/i18n/setlang/", "fa")
+        assert locale_middleware.process_request(request) is None
+
+
+class TestCookieLocaleMiddlewareResponse:
+    """Test suite for `CookieLocaleMiddleware.process_response`."""
+
+    def test_cookie_is_set_on_language_mismatch(self, locale_middleware):
+        """Test that the default mode refreshes the cookie on any response.
+
+        Parameters
+        ----------
+        locale_middleware : CookieLocaleMiddleware
+            The middleware under test.
+
+        """
+        with active_language("fa"):
+            response = locale_middleware.process_response(
+                make_request("/fa/about/"), HttpResponse()
+            )
+        assert response.cookies["django_language"].value == "fa"
+
+    def test_matching_cookie_is_not_rewritten(self, locale_middleware):
+        """Test that no Set-Cookie is sent when the cookie already matches.
+
+        Parameters
+        ----------
+        locale_middleware : CookieLocaleMiddleware
+            The middleware under test.
+
+        """
+        with active_language("fa"):
+            response = locale_middleware.process_response(
+                make_request("/fa/about/", "fa"), HttpResponse()
+            )
+        assert "django_language" not in response.cookies
+
+    def test_redirect_only_mode(self, locale_middleware):
+        """Test that only redirects carry the cookie in redirect-only mode.
+
+        Parameters
+        ----------
+        locale_middleware : CookieLocaleMiddleware
+            The middleware under test.
+
+        """
+        with override_settings(LANGUAGE_COOKIE_REDIRECT_ONLY=True):
+            middleware = CookieLocaleMiddleware(lambda request: HttpResponse())
+
+        request = make_request("/de/about/")
+        response = middleware.process_request(request)
+        with active_language("de"):
+            response = middleware.process_response(request, response)
+        assert response.cookies["django_language"].value == "de"
+
+        with active_language("fa"):
+            response = middleware.process_response(
+                make_request("/fa/about/"), HttpResponse()
+            )
+        assert "django_language" not in response.cookies
+        assert not response.has_header("Vary") or "Cookie" not in response["Vary"]
+
+    def test_cacheable_mode_varies_on_cookie(self, locale_middleware):
+        """Test that cacheable responses vary on Cookie without setting one.
+
+        Parameters
+        ----------
+        locale_middleware : CookieLocaleMiddleware
+            The middleware under test.
+
+        """
+        with override_settings(LOCALE_CACHEABLE_RESPONSES=True):
+            middleware = CookieLocaleMiddleware(lambda request: HttpResponse())
+
+        with active_language("fa"):
+            response = middleware.process_response(
+                make_request("/fa/about/"), HttpResponse()
+            )
+        assert "django_language" not in response.cookies
+        assert "Cookie" in response["Vary"]
@@ -0,0 +1,185 @@
+import asyncio
+
+import pytest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.test import RequestFactory, override_settings
+
+FORM = b'<form><input type="hidden" name="csrfmiddlewaretoken" value="x"></form>'
+
+
+@pytest.fixture
+def csrf_middleware():
+    with override_settings(CSRF_INPUT_NAME="secure_token"):
+        from sage_tools.middlewares.csrf import SecureCsrfMiddleware
+
+        yield SecureCsrfMiddleware(lambda request: HttpResponse())
+
+
+@pytest.fixture
+def rf_request():
+    return RequestFactory().get("/")
+
+
+class TestSecureCsrfMiddlewareResponse:
+    """Test suite for `SecureCsrfMiddleware.process_response`."""
+
+    def test_html_response_is_rewritten(self, csrf_middleware, rf_request):
+        """Test that CSRF inputs in HTML responses get the custom name.
+
+        Parameters
+        ----------
+        csrf_middleware : SecureCsrfMiddleware
+            The middleware under test.
+        rf_request : HttpRequest
+            A GET request built with `RequestFactory`.
+
+        """
+        response = HttpResponse(FORM)
+        response["Content-Length"] = len(FORM)
+        response = csrf_middleware.process_response(rf_request, response)
+        assert b'name="secure_token"' in response.content
+        assert b"csrfmiddlewaretoken" not in response.content
+        assert response["Content-Length"] == str(len(response.content))
+
+    def test_non_html_response_is_not_touched(self, csrf_middleware, rf_request):
+        """Test that JSON responses keep their original body object.
+
+        Parameters
+        ----------
+        csrf_middleware : SecureCsrfMiddleware
+            The middleware under test.
+        rf_request : HttpRequest
+            A GET request built with `RequestFactory`.
+
+        """
+        response = JsonResponse({"field": 'name="csrfmiddlewaretoken"'})
+        container = response._container
+        response = csrf_middleware.process_response(rf_request, response)
+        assert response._container is container
+
+    def test_html_without_form_is_not_copied(self, csrf_middleware, rf_request):
+        """Test that HTML bodies without a CSRF input are left as they are.
+
+        Parameters
+        ----------
+        csrf_middleware : SecureCsrfMiddleware
+            The middleware under test.
+        rf_request : HttpRequest
+            A GET request built with `RequestFactory`.
+
+        """
+        response = HttpResponse(b"<p>no forms here</p>")
+        container = response._container
+        response = csrf_middleware.process_response(rf_request, response)
+        assert response._container is container
+
+    def test_streaming_response_is_rewritten_per_chunk(
+        self, csrf_middleware, rf_request
+    ):
+        """Test that matches split across chunks are still rewritten.
+
+        Parameters
+        ----------
+        csrf_middleware : SecureCsrfMiddleware
+            The middleware under test.
+        rf_request : HttpRequest
+            A GET request built with `RequestFactory`.
+
+        """
+        chunks = [FORM[i : i + 7] for i in range(0, len(FORM), 7)]
+        response = StreamingHttpResponse(iter(chunks))
+        response = csrf_middleware.process_response(rf_request, response)
+        assert b"".join(response.streaming_content) == FORM.replace(
+            b"csrfmiddlewaretoken", b"secure_token"
+        )
+
+    def test_async_streaming_response_is_rewritten(self, csrf_middleware, rf_request):
+        """Test that async streaming responses are rewritten lazily too.
+
+        Parameters
+        ----------
+        csrf_middleware : SecureCsrfMiddleware
+            The middleware under test.
+        rf_request : HttpRequest
+            A GET request built with `RequestFactory`.
+
+        """
+
+        async def chunks():
+            yield FORM[:30]
+            yield FORM[30:]
+
+        response = StreamingHttpResponse(chunks())
+        response = csrf_middleware.process_response(rf_request, response)
+
+        async def consume():
+            return b"".join([chunk async for chunk in response.streaming_content])
+
+        assert b'name="secure_token"' in asyncio.run(consume())
+
+    def test_rewrite_can_be_disabled(self, csrf_middleware, rf_request):
+        """Test that `rewrite_response = False` leaves HTML untouched.
+
+        Parameters
+        ----------
+        csrf_middleware : SecureCsrfMiddleware
+            The middleware under test.
+        rf_request : HttpRequest
+            A GET request built with `RequestFactory`.
+
+        """
+        csrf_middleware.rewrite_response = False
+        response = csrf_middleware.process_response(rf_request, HttpResponse(FORM))
+        assert response.content == FORM
+
+
+class TestSecureCsrfMiddlewareRequest:
+    """Test suite for `SecureCsrfMiddleware.process_request`."""
+
+    def test_custom_field_is_renamed(self, csrf_middleware):
+        """Test that the custom field is exposed as `csrfmiddlewaretoken`.
+
+        Parameters
+        ----------
+        csrf_middleware : SecureCsrfMiddleware
+            The middleware under test.
+
+        """
+        request = RequestFactory().post("/", {"secure_token": "abc", "q": "1"})
+        csrf_middleware.process_request(request)
+        assert request.POST["csrfmiddlewaretoken"] == "abc"
+        assert "secure_token" not in request.POST
+        assert request.POST["q"] == "1"
+
+    def test_post_without_custom_field_is_not_copied(self, csrf_middleware):
+        """Test that POST data without the custom field is left as is.
+
+        Parameters
+        ----------
+        csrf_middleware : SecureCsrfMiddleware
+            The middleware under test.
+
+        """
+        request = RequestFactory().post("/", {"q": "1"})
+        post = request.POST
+        csrf_middleware.process_request(request)
+        assert request.POST is post
+
+    def test_body_is_not_parsed_when_not_needed(self, csrf_middleware):
+        """Test that safe methods and header tokens skip POST parsing.
+
+        Parameters
+        ----------
+        csrf_middleware : SecureCsrfMiddleware
+            The middleware under test.
+
+        """
+        get_request = RequestFactory().get("/")
+        csrf_middleware.process_request(get_request)
+        assert not hasattr(get_request, "_post")
+
+        header_request = RequestFactory().post(
+            "/", {"secure_token": "abc"}, HTTP_X_CSRFTOKEN="abc"
+        )
+        csrf_middleware.process_request(header_request)
+        assert not hasattr(header_request, "_post")
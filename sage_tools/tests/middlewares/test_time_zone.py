@@ -0,0 +1,179 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils import timezone
+
+from sage_tools.encryptors import FernetEncryptor
+from sage_tools.handlers.session import SessionHandler
+from sage_tools.middlewares.time_zone import TimezoneMiddleware, get_zone
+
+
+@pytest.fixture
+def timezone_middleware():
+    yield TimezoneMiddleware(lambda request: HttpResponse())
+    timezone.deactivate()
+
+
+class TestTimezoneMiddleware:
+    """Test suite for `TimezoneMiddleware`."""
+
+    def test_plain_name_is_activated_without_decryption(
+        self, timezone_middleware, session_request
+    ):
+        """Test that a plain timezone name needs no Fernet work.
+
+        Parameters
+        ----------
+        timezone_middleware : TimezoneMiddleware
+            The middleware under test.
+        session_request : HttpRequest
+            A request with an in-memory session.
+
+        """
+        TimezoneMiddleware.set_timezone(session_request, "Asia/Tehran")
+        time_zone = settings.TIME_ZONE
+        with patch.object(FernetEncryptor, "decrypt") as decrypt:
+            timezone_middleware.process_request(session_request)
+        decrypt.assert_not_called()
+        assert timezone.get_current_timezone_name() == "Asia/Tehran"
+        assert settings.TIME_ZONE == time_zone
+
+    def test_legacy_entry_is_decrypted_once(self, timezone_middleware, session_request):
+        """Test that an encrypted entry is not decrypted on every request.
+
+        Parameters
+        ----------
+        timezone_middleware : TimezoneMiddleware
+            The middleware under test.
+        session_request : HttpRequest
+            A request with an in-memory session.
+
+        """
+        SessionHandler(session_request).set("user_timezone", "Europe/Berlin")
+        timezone_middleware.process_request(session_request)
+        assert timezone.get_current_timezone_name() == "Europe/Berlin"
+
+        timezone.deactivate()
+        vars(session_request).pop(SessionHandler.cache_attribute, None)
+        with patch.object(FernetEncryptor, "decrypt") as decrypt:
+            timezone_middleware.process_request(session_request)
+        decrypt.assert_not_called()
+        assert timezone.get_current_timezone_name() == "Europe/Berlin"
+
+    def test_legacy_entry_is_left_to_the_application(
+        self, timezone_middleware, session_request
+    ):
+        """Test that `SessionHandler` readers still see the entry afterwards.
+
+        Parameters
+        ----------
+        timezone_middleware : TimezoneMiddleware
+            The middleware under test.
+        session_request : HttpRequest
+            A request with an in-memory session.
+
+        """
+        SessionHandler(session_request).set("user_timezone", "Europe/Berlin")
+        stored = session_request.session["user_timezone"]
+        timezone_middleware.process_request(session_request)
+        assert session_request.session["user_timezone"] == stored
+        vars(session_request).pop(SessionHandler.cache_attribute, None)
+        assert SessionHandler(session_request).get("user_timezone") == "Europe/Berlin"
+
+        SessionHandler(session_request).set("user_timezone", "Asia/Tehran")
+        vars(session_request).pop(SessionHandler.cache_attribute, None)
+        timezone_middleware.process_request(session_request)
+        assert timezone.get_current_timezone_name() == "Asia/Tehran"
+
+    def test_unknown_or_missing_timezone_deactivates(
+        self, timezone_middleware, session_request
+    ):
+        """Test that the default timezone is used for bad or missing values.
+
+        Parameters
+        ----------
+        timezone_middleware : TimezoneMiddleware
+            The middleware under test.
+        session_request : HttpRequest
+            A request with an in-memory session.
+
+        """
+        timezone.activate(get_zone("Asia/Tehran"))
+        session_request.session["user_timezone"] = "Mars/Olympus"
+        timezone_middleware.process_request(session_request)
+        assert timezone.get_current_timezone() == timezone.get_default_timezone()
+
+        del session_request.session["user_timezone"]
+        timezone.activate(get_zone("Asia/Tehran"))
+        timezone_middleware.process_request(session_request)
+        assert timezone.get_current_timezone() == timezone.get_default_timezone()
+
+    def test_unknown_legacy_entry_is_reported(
+        self, timezone_middleware, session_request, caplog
+    ):
+        """Test that an encrypted unknown zone is logged and kept.
+
+        Parameters
+        ----------
+        timezone_middleware : TimezoneMiddleware
+            The middleware under test.
+        session_request : HttpRequest
+            A request with an in-memory session.
+        caplog : LogCaptureFixture
+            Captures the logged error.
+
+        """
+        SessionHandler(session_request).set("user_timezone", "Mars/Olympus")
+        timezone.activate(get_zone("Asia/Tehran"))
+        timezone_middleware.process_request(session_request)
+        assert timezone.get_current_timezone() == timezone.get_default_timezone()
+        assert "Unknown timezone: Mars/Olympus" in caplog.text
+        assert SessionHandler(session_request).get("user_timezone") == "Mars/Olympus"
+
+        asyncio.run(timezone_middleware.aprocess_request(session_request))
+        assert SessionHandler(session_request).get("user_timezone") == "Mars/Olympus"
+
+    def test_zones_are_cached(self):
+        """Test that zone lookups, including misses, are memoized."""
+        assert get_zone("Asia/Tehran") is get_zone("Asia/Tehran")
+        assert get_zone("Mars/Olympus") is None
+        with pytest.raises(ValueError):
+            TimezoneMiddleware.set_timezone(None, "Mars/Olympus")
+
+    def test_response_deactivates_timezone(self, timezone_middleware, session_request):
+        """Test that the timezone does not leak past the response.
+
+        Parameters
+        ----------
+        timezone_middleware : TimezoneMiddleware
+            The middleware under test.
+        session_request : HttpRequest
+            A request with an in-memory session.
+
+        """
+        timezone.activate(get_zone("Asia/Tehran"))
+        timezone_middleware.process_response(session_request, HttpResponse())
+        assert timezone.get_current_timezone() == timezone.get_default_timezone()
+
+    def test_async_request_reads_session_natively(self, session_request):
+        """Test that the async path activates the stored timezone.
+
+        Parameters
+        ----------
+        session_request : HttpRequest
+            A request with an in-memory session.
+
+        """
+
+        async def view(request):
+            return HttpResponse(timezone.get_current_timezone_name())
+
+        middleware = TimezoneMiddleware(view)
+        SessionHandler(session_request).set("user_timezone", "Europe/Berlin")
+        response = asyncio.run(middleware(session_request))
+        assert response.content == b"Europe/Berlin"
+        vars(session_request).pop(SessionHandler.cache_attribute, None)
+        assert SessionHandler(session_request).get("user_timezone") == "Europe/Berlin"
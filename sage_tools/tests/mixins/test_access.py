@@ -0,0 +1,346 @@
+import time
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import Group, Permission, User
+from django.contrib.auth.signals import user_logged_in
+from django.contrib.sessions.backends.cache import SessionStore
+from django.core.exceptions import ImproperlyConfigured, PermissionDenied
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+from django.views.generic import DetailView, View
+
+from sage_tools.mixins.views import (
+    GroupRequiredMixin,
+    MultiplePermissionsRequiredMixin,
+    PermissionRequiredMixin,
+    RecentLoginRequiredMixin,
+)
+from sage_tools.mixins.views.access import LOGIN_TIME_SESSION_KEY, check_login_urls
+
+urlpatterns = []
+
+
+class ObjectPermissionBackend:
+    """Grants object-level permissions on objects named "allowed"."""
+
+    def authenticate(self, request, **credentials):
+        return None
+
+    def has_perm(self, user_obj, perm, obj=None):
+        return obj is not None and getattr(obj, "name", None) == "allowed"
+
+
+class GlobalPermissionBackend:
+    """Grants `auth.view_group` and `auth.add_group` on no object."""
+
+    def authenticate(self, request, **credentials):
+        return None
+
+    def has_perm(self, user_obj, perm, obj=None):
+        return obj is None and perm in ("auth.view_group", "auth.add_group")
+
+
+class PermissionsView(MultiplePermissionsRequiredMixin, View):
+    permissions = {"all": ["auth.view_group"]}
+    raise_exception = True
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponse("ok")
+
+
+class GroupView(GroupRequiredMixin, View):
+    group_required = "editors"
+    raise_exception = True
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponse("ok")
+
+
+class GroupDetailView(PermissionRequiredMixin, DetailView):
+    model = Group
+    permission_required = "auth.view_group"
+    object_level_permissions = True
+    raise_exception = True
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponse(self.get_object().name)
+
+
+class PermissionDetailView(PermissionRequiredMixin, DetailView):
+    model = Permission
+    permission_required = "auth.view_permission"
+    object_level_permissions = True
+    permission_select_related = ("content_type",)
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponse(self.get_object().content_type.app_label)
+
+
+class RecentLoginView(RecentLoginRequiredMixin, View):
+    max_last_login_delta = 60
+    calls = []
+
+    def get(self, request, *args, **kwargs):
+        self.calls.append(request.user)
+        return HttpResponse("fresh")
+
+
+class SessionRecentLoginView(RecentLoginView):
+    use_session_login_time = True
+
+
+@pytest.fixture
+def login_request():
+    """Builds a GET request with a session, from a user who last logged in
+    `age` seconds ago."""
+    RecentLoginView.calls.clear()
+
+    def make(age=None):
+        request = RequestFactory().get("/orders/")
+        request.session = SessionStore()
+        last_login = None if age is None else now() - timedelta(seconds=age)
+        request.user = User(pk=1, username="buyer", last_login=last_login)
+        return request
+
+    with override_settings(ROOT_URLCONF=__name__):
+        yield make
+
+
+@pytest.fixture
+def user_request():
+    request = RequestFactory().get("/")
+    request.user = User(pk=1, username="reader")
+    with override_settings(
+        AUTHENTICATION_BACKENDS=[
+            f"{__name__}.ObjectPermissionBackend",
+            f"{__name__}.GlobalPermissionBackend",
+        ]
+    ):
+        yield request
+
+
+@pytest.mark.usefixtures("database")
+class TestPermissionObjectMixin:
+    """Test suite for `PermissionObjectMixin` through `PermissionRequiredMixin`."""
+
+    def test_object_is_fetched_once(self, user_request):
+        """Test that the checked object is reused by `get_object`.
+
+        Parameters
+        ----------
+        user_request : HttpRequest
+            A GET request from an authenticated user.
+
+        """
+        group = Group.objects.create(name="allowed")
+        with CaptureQueriesContext(connection) as queries:
+            response = GroupDetailView.as_view()(user_request, pk=group.pk)
+        assert response.content == b"allowed"
+        assert len(queries) == 1
+
+    def test_permission_select_related_is_applied(self, user_request):
+        """Test that related fields are joined into the permission query.
+
+        Parameters
+        ----------
+        user_request : HttpRequest
+            A GET request from an authenticated user.
+
+        """
+        permission = Permission.objects.get(codename="view_group")
+        permission.name = "allowed"
+        permission.save()
+        with CaptureQueriesContext(connection) as queries:
+            response = PermissionDetailView.as_view()(user_request, pk=permission.pk)
+        assert response.content == b"auth"
+        assert len(queries) == 1
+        assert "django_content_type" in queries[0]["sql"]
+
+    def test_object_without_permission_is_denied(self, user_request):
+        """Test that the object-level check can deny access.
+
+        Parameters
+        ----------
+        user_request : HttpRequest
+            A GET request from an authenticated user.
+
+        """
+        group = Group.objects.create(name="private")
+        with pytest.raises(PermissionDenied):
+            GroupDetailView.as_view()(user_request, pk=group.pk)
+
+
+class TestRecentLoginRequiredMixin:
+    """Test suite for `RecentLoginRequiredMixin`."""
+
+    def test_recent_login_is_allowed(self, login_request):
+        """Test that a login within the allowed age reaches the view.
+
+        Parameters
+        ----------
+        login_request : callable
+            Builds a request from a user who logged in `age` seconds ago.
+
+        """
+        response = RecentLoginView.as_view()(login_request(age=10))
+        assert response.content == b"fresh"
+
+    @pytest.mark.parametrize("age", [3600, None])
+    def test_stale_login_is_logged_out_before_the_view(self, login_request, age):
+        """Test that stale or unknown logins never reach the view.
+
+        Parameters
+        ----------
+        login_request : callable
+            Builds a request from a user who logged in `age` seconds ago.
+        age : int or None
+            Seconds since the last login; None for a user who never logged in.
+
+        """
+        request = login_request(age=age)
+        request.session["cart"] = "3 items"
+
+        response = RecentLoginView.as_view()(request)
+
+        assert response.status_code == 302
+        assert response.url == "/accounts/login/?next=/orders/"
+        assert RecentLoginView.calls == []
+        assert not request.user.is_authenticated
+        assert "cart" not in request.session
+
+    def test_session_login_time(self, login_request):
+        """Test that the session login time replaces `last_login` when enabled.
+
+        Parameters
+        ----------
+        login_request : callable
+            Builds a request from a user who logged in `age` seconds ago.
+
+        """
+        request = login_request(age=3600)
+        request.session[LOGIN_TIME_SESSION_KEY] = time.time() - 10
+        assert SessionRecentLoginView.as_view()(request).status_code == 200
+
+        request = login_request(age=10)
+        assert SessionRecentLoginView.as_view()(request).status_code == 302
+        assert len(RecentLoginView.calls) == 1
+
+    @pytest.mark.usefixtures("database")
+    def test_login_time_is_recorded_on_login(self, login_request):
+        """Test that `user_logged_in` stores the login time in the session.
+
+        Parameters
+        ----------
+        login_request : callable
+            Builds a request from a user who logged in `age` seconds ago.
+
+        """
+        user = User.objects.create_user("buyer")
+        request = login_request()
+        before = time.time()
+        user_logged_in.send(sender=User, request=request, user=user)
+        assert request.session[LOGIN_TIME_SESSION_KEY] >= before
+
+
+class TestAccessMixinConfiguration:
+    """Test suite for the class-creation checks of the access mixins."""
+
+    @pytest.mark.parametrize(
+        "permissions",
+        [["auth.view_group"], {}, {"every": ["auth.view_group"]}, {"all": "perm"}],
+    )
+    def test_invalid_permissions_fail_at_class_creation(self, permissions):
+        """Test that a bad `permissions` attribute fails when the view is defined.
+
+        Parameters
+        ----------
+        permissions : object
+            The invalid `permissions` value.
+
+        """
+        with pytest.raises(ImproperlyConfigured, match="BadView"):
+            type(
+                "BadView",
+                (MultiplePermissionsRequiredMixin, View),
+                {"permissions": permissions},
+            )
+
+    @pytest.mark.parametrize("group_required", [42, {"editors"}])
+    def test_invalid_groups_fail_at_class_creation(self, group_required):
+        """Test that a bad `group_required` attribute fails when the view is
+        defined.
+
+        Parameters
+        ----------
+        group_required : object
+            The invalid `group_required` value.
+
+        """
+        with pytest.raises(ImproperlyConfigured, match="BadView"):
+            type(
+                "BadView",
+                (GroupRequiredMixin, View),
+                {"group_required": group_required},
+            )
+
+    def test_groups_are_normalized_once(self):
+        """Test that a single group name is stored as a tuple."""
+        assert GroupView.group_required == ("editors",)
+
+    def test_runtime_permissions_are_checked_per_request(self, user_request):
+        """Test that `as_view(permissions=...)` is validated and enforced.
+
+        Parameters
+        ----------
+        user_request : HttpRequest
+            A GET request from an authenticated user.
+
+        """
+        view = PermissionsView.as_view(permissions={"any": ["auth.add_group"]})
+        assert view(user_request).status_code == 200
+
+        view = PermissionsView.as_view(permissions={"all": ["auth.delete_group"]})
+        with pytest.raises(PermissionDenied):
+            view(user_request)
+
+        view = PermissionsView.as_view(permissions={"all": "auth.add_group"})
+        with pytest.raises(ImproperlyConfigured):
+            view(user_request)
+
+    def test_runtime_groups_are_validated_per_request(self, user_request):
+        """Test that `as_view(group_required=...)` is validated per request.
+
+        Parameters
+        ----------
+        user_request : HttpRequest
+            A GET request from an authenticated user.
+
+        """
+        with pytest.raises(ImproperlyConfigured):
+            GroupView.as_view(group_required=42)(user_request)
+
+    def test_missing_login_url_is_reported_by_system_check(self):
+        """Test that views without a login URL are reported once, at startup."""
+        missing = type("MissingLoginView", (PermissionRequiredMixin, View), {})
+        custom = type(
+            "CustomLoginView",
+            (PermissionRequiredMixin, View),
+            {"get_login_url": lambda self: "/signin/"},
+        )
+        configured = type(
+            "ConfiguredLoginView",
+            (PermissionRequiredMixin, View),
+            {"login_url": "/in/"},
+        )
+        assert not [error for error in check_login_urls() if error.obj is missing]
+
+        with override_settings(LOGIN_URL=None):
+            reported = {error.obj: error.id for error in check_login_urls()}
+        assert reported[missing] == "sage_tools.E001"
+        assert custom not in reported
+        assert configured not in reported
+        assert PermissionRequiredMixin not in reported
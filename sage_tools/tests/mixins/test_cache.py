@@ -0,0 +1,325 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser, User
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.template.response import SimpleTemplateResponse
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
+from django.views.generic import ListView, View
+
+from sage_tools.mixins.views import CachedResponseMixin, ConditionalGetMixin
+
+
+class ContextTemplate:
+    """A backend template rendering the `text` context variable."""
+
+    def render(self, context=None, request=None):
+        return context["text"]
+
+
+class CountingView(CachedResponseMixin, View):
+    """Counts how often the view itself runs."""
+
+    calls = 0
+
+    def get(self, request, *args, **kwargs):
+        type(self).calls += 1
+        return SimpleTemplateResponse(ContextTemplate(), {"text": self.get_text()})
+
+    def post(self, request, *args, **kwargs):
+        type(self).calls += 1
+        return HttpResponse("posted")
+
+    def get_text(self):
+        return "page"
+
+
+class SessionGreetingView(CountingView):
+    def get_text(self):
+        return f"hello {self.request.session.get('name')}"
+
+
+class UserGreetingView(CountingView):
+    response_cache_authenticated = True
+
+    def get_text(self):
+        return f"hello {self.request.user.username}"
+
+
+class HeadView(CountingView):
+    def head(self, request, *args, **kwargs):
+        type(self).calls += 1
+        return HttpResponse("head")
+
+
+class ArticleView(ConditionalGetMixin, View):
+    """A resource whose ETag and modification time are fixed."""
+
+    calls = 0
+    etag_calls = 0
+    modified = datetime(2024, 5, 1, 12, tzinfo=timezone.utc)
+
+    def get(self, request, *args, **kwargs):
+        type(self).calls += 1
+        return HttpResponse("article")
+
+    def post(self, request, *args, **kwargs):
+        type(self).calls += 1
+        return HttpResponse("saved")
+
+    def get_etag(self, request, *args, **kwargs):
+        type(self).etag_calls += 1
+        return f"article-{kwargs['pk']}"
+
+    def get_last_modified(self, request, *args, **kwargs):
+        return self.modified
+
+
+class UserListView(ConditionalGetMixin, ListView):
+    model = User
+    last_modified_field = "date_joined"
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponse("users")
+
+
+def serve(view_class, request):
+    """Runs `view_class` like the request handler does: inside the session
+    and authentication middleware, rendering template responses before the
+    middleware sees them.
+
+    Parameters
+    ----------
+    view_class : type
+        The view to run.
+    request : HttpRequest
+        The incoming request.
+
+    """
+    view = view_class.as_view()
+
+    def handler(request):
+        response = view(request)
+        if hasattr(response, "render"):
+            response.render()
+        return response
+
+    return SessionMiddleware(AuthenticationMiddleware(handler))(request)
+
+
+@pytest.fixture(autouse=True)
+def response_cache():
+    CountingView.calls = SessionGreetingView.calls = UserGreetingView.calls = 0
+    HeadView.calls = 0
+    ArticleView.calls = ArticleView.etag_calls = 0
+    cache.clear()
+    with override_settings(
+        ALLOWED_HOSTS=["testserver"],
+        SESSION_ENGINE="django.contrib.sessions.backends.cache",
+    ):
+        yield
+    cache.clear()
+
+
+@pytest.fixture
+def rf():
+    return RequestFactory()
+
+
+class TestCachedResponseMixin:
+    """Test suite for `CachedResponseMixin`."""
+
+    def test_anonymous_pages_are_served_from_the_cache(self, rf):
+        """Test that the view runs once while the session still adds Vary.
+
+        Parameters
+        ----------
+        rf : RequestFactory
+            A factory for building requests.
+
+        """
+        first = serve(CountingView, rf.get("/articles/"))
+        second = serve(CountingView, rf.get("/articles/"))
+        assert first.content == second.content == b"page"
+        assert CountingView.calls == 1
+        assert first["Vary"] == second["Vary"] == "Cookie"
+
+        serve(CountingView, rf.get("/articles/?page=2"))
+        assert CountingView.calls == 2
+
+    def test_head_and_get_are_cached_separately(self, rf):
+        """Test that a custom `head()` response is not served to GET clients.
+
+        Parameters
+        ----------
+        rf : RequestFactory
+            A factory for building requests.
+
+        """
+        assert serve(HeadView, rf.head("/articles/")).content == b"head"
+        assert serve(HeadView, rf.get("/articles/")).content == b"page"
+        assert serve(HeadView, rf.head("/articles/")).content == b"head"
+        assert HeadView.calls == 2
+
+    def test_session_dependent_pages_are_not_shared(self, rf):
+        """Test that a page built from one client's session is not served to
+        another client.
+
+        Parameters
+        ----------
+        rf : RequestFactory
+            A factory for building requests.
+
+        """
+        session = SessionMiddleware(lambda request: None).SessionStore()
+        session["name"] = "alice"
+        session.save()
+        alice = rf.get("/", HTTP_COOKIE=f"sessionid={session.session_key}")
+
+        assert serve(SessionGreetingView, alice).content == b"hello alice"
+        assert serve(SessionGreetingView, rf.get("/")).content == b"hello None"
+        assert SessionGreetingView.calls == 2
+
+    @pytest.mark.usefixtures("database")
+    def test_authenticated_pages_are_cached_per_user(self, rf):
+        """Test that users in the same groups do not share entries.
+
+        Parameters
+        ----------
+        rf : RequestFactory
+            A factory for building requests.
+
+        """
+        view = UserGreetingView.as_view()
+        for username in ("alice", "bob", "alice"):
+            request = rf.get("/")
+            request.user = User.objects.get_or_create(username=username)[0]
+            response = view(request)
+            response.render()
+            assert response.content == f"hello {username}".encode()
+        assert UserGreetingView.calls == 2
+
+    @pytest.mark.usefixtures("database")
+    def test_only_anonymous_safe_requests_are_cached(self, rf):
+        """Test that unsafe methods and authenticated users bypass the cache.
+
+        Parameters
+        ----------
+        rf : RequestFactory
+            A factory for building requests.
+
+        """
+        view = CountingView.as_view()
+        user = User.objects.create_user("alice")
+        for method, request_user in [
+            ("post", AnonymousUser()),
+            ("post", AnonymousUser()),
+            ("get", user),
+            ("get", user),
+        ]:
+            request = getattr(rf, method)("/")
+            request.user = request_user
+            response = view(request)
+            if hasattr(response, "render"):
+                response.render()
+        assert CountingView.calls == 4
+
+
+class TestConditionalGetMixin:
+    """Test suite for `ConditionalGetMixin`."""
+
+    def test_full_response_carries_validators(self, rf):
+        """Test that a normal GET gets ETag and Last-Modified headers.
+
+        Parameters
+        ----------
+        rf : RequestFactory
+            A factory for building requests.
+
+        """
+        response = ArticleView.as_view()(rf.get("/"), pk=1)
+        assert response.status_code == 200
+        assert response["ETag"] == '"article-1"'
+        assert response["Last-Modified"] == "Wed, 01 May 2024 12:00:00 GMT"
+
+    @pytest.mark.parametrize(
+        "headers",
+        [
+            {"HTTP_IF_NONE_MATCH": '"article-1"'},
+            {"HTTP_IF_MODIFIED_SINCE": "Wed, 01 May 2024 12:00:00 GMT"},
+        ],
+    )
+    def test_current_copy_gets_304_without_running_the_handler(self, rf, headers):
+        """Test that matching validators short-circuit the view.
+
+        Parameters
+        ----------
+        rf : RequestFactory
+            A factory for building requests.
+        headers : dict
+            The conditional request headers.
+
+        """
+        response = ArticleView.as_view()(rf.get("/", **headers), pk=1)
+        assert response.status_code == 304
+        assert ArticleView.calls == 0
+
+    def test_stale_copy_gets_full_response(self, rf):
+        """Test that a changed ETag renders the page again.
+
+        Parameters
+        ----------
+        rf : RequestFactory
+            A factory for building requests.
+
+        """
+        request = rf.get("/", HTTP_IF_NONE_MATCH='"article-1"')
+        assert ArticleView.as_view()(request, pk=2).status_code == 200
+        assert ArticleView.calls == 1
+
+    def test_unsafe_methods_skip_the_check(self, rf):
+        """Test that POST runs the handler without computing validators.
+
+        Parameters
+        ----------
+        rf : RequestFactory
+            A factory for building requests.
+
+        """
+        request = rf.post("/", HTTP_IF_MATCH='"other"')
+        response = ArticleView.as_view()(request, pk=1)
+        assert response.content == b"saved"
+        assert ArticleView.etag_calls == 0
+        assert not response.has_header("ETag")
+
+    @pytest.mark.usefixtures("database")
+    def test_last_modified_field_uses_one_aggregate(self, rf):
+        """Test that `last_modified_field` is the latest value in the queryset.
+
+        Parameters
+        ----------
+        rf : RequestFactory
+            A factory for building requests.
+
+        """
+        joined = datetime(2024, 5, 1, 12, tzinfo=timezone.utc)
+        User.objects.create(username="alice", date_joined=joined)
+        User.objects.create(username="bob", date_joined=joined - timedelta(days=1))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = UserListView.as_view()(rf.get("/"))
+        assert response["Last-Modified"] == http_date(joined.timestamp())
+        assert len(queries) == 1
+        assert "MAX" in queries[0]["sql"].upper()
+
+        request = rf.get("/", HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        assert UserListView.as_view()(request).status_code == 304
+
+        User.objects.create(username="carol", date_joined=joined + timedelta(hours=1))
+        assert UserListView.as_view()(request).status_code == 200
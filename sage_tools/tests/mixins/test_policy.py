@@ -0,0 +1,243 @@
+import pytest
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.exceptions import ImproperlyConfigured, PermissionDenied
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.views.generic import DetailView, View
+
+from sage_tools.mixins.views import AccessPolicyMixin
+from sage_tools.mixins.views import policy
+from sage_tools.mixins.views.policy import Login, Perm, Staff
+
+urlpatterns = []
+
+
+class PermBackend:
+    """Grants `blog.change_article` and nothing else."""
+
+    def authenticate(self, request, **credentials):
+        return None
+
+    def has_perm(self, user_obj, perm, obj=None):
+        return perm == "blog.change_article"
+
+
+class Recorder:
+    """Builds rules that record their evaluation order."""
+
+    def __init__(self):
+        self.calls = []
+
+    def rule(self, name, result):
+        def test(user):
+            self.calls.append(name)
+            return result
+
+        return policy.Test(test)
+
+
+def make_view(access_policy, **attrs):
+    """Builds a view class guarded by `access_policy`.
+
+    Parameters
+    ----------
+    access_policy : Rule
+        The policy of the view.
+    **attrs
+        Further class attributes.
+
+    """
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponse("ok")
+
+    return type(
+        "PolicyView",
+        (AccessPolicyMixin, View),
+        {"access_policy": access_policy, "get": get, **attrs},
+    )
+
+
+@pytest.fixture
+def policy_request():
+    """Builds a GET request from the given user."""
+
+    def make(user=None):
+        request = RequestFactory().get("/articles/")
+        request.user = user or User(pk=1, username="author")
+        return request
+
+    with override_settings(
+        ROOT_URLCONF=__name__,
+        AUTHENTICATION_BACKENDS=[f"{__name__}.PermBackend"],
+    ):
+        yield make
+
+
+class TestAccessPolicyMixin:
+    """Test suite for `AccessPolicyMixin` and the policy rules."""
+
+    @pytest.mark.parametrize(
+        "results, expected, evaluated",
+        [
+            ((True, False, True), False, ["a", "b"]),
+            ((True, True, True), True, ["a", "b", "c"]),
+        ],
+    )
+    def test_all_short_circuits(self, policy_request, results, expected, evaluated):
+        """Test that `&` evaluates left to right and stops at a failure.
+
+        Parameters
+        ----------
+        policy_request : callable
+            Builds a request from a user.
+        results : tuple of bool
+            The results of the three rules.
+        expected : bool
+            Whether access is granted.
+        evaluated : list of str
+            The rules expected to run, in order.
+
+        """
+        recorder = Recorder()
+        a, b, c = (recorder.rule(n, r) for n, r in zip("abc", results))
+        view = make_view(a & (b & c), raise_exception=True)
+
+        if expected:
+            assert view.as_view()(policy_request()).status_code == 200
+        else:
+            with pytest.raises(PermissionDenied):
+                view.as_view()(policy_request())
+        assert recorder.calls == evaluated
+
+    def test_any_short_circuits(self, policy_request):
+        """Test that `|` stops at the first passing rule.
+
+        Parameters
+        ----------
+        policy_request : callable
+            Builds a request from a user.
+
+        """
+        recorder = Recorder()
+        view = make_view(
+            recorder.rule("a", False)
+            | recorder.rule("b", True)
+            | recorder.rule("c", True)
+        )
+        assert view.as_view()(policy_request()).status_code == 200
+        assert recorder.calls == ["a", "b"]
+
+    def test_not_inverts_a_rule(self, policy_request):
+        """Test that `~` grants access when the wrapped rule fails.
+
+        Parameters
+        ----------
+        policy_request : callable
+            Builds a request from a user.
+
+        """
+        view = make_view(~Staff(), raise_exception=True)
+        assert view.as_view()(policy_request()).status_code == 200
+
+        staff = User(pk=2, username="editor", is_staff=True)
+        with pytest.raises(PermissionDenied):
+            view.as_view()(policy_request(staff))
+
+    def test_permissions_and_method_tests(self, policy_request):
+        """Test `Perm` and `Test` naming a view method.
+
+        Parameters
+        ----------
+        policy_request : callable
+            Builds a request from a user.
+
+        """
+        view = make_view(
+            Login() & Perm("blog.change_article") & policy.Test("is_author"),
+            is_author=lambda self, user: user.username == "author",
+            raise_exception=True,
+        )
+        assert view.as_view()(policy_request()).status_code == 200
+
+        other = User(pk=2, username="reader")
+        with pytest.raises(PermissionDenied):
+            view.as_view()(policy_request(other))
+
+        view = make_view(Perm("blog.delete_article"), raise_exception=True)
+        with pytest.raises(PermissionDenied):
+            view.as_view()(policy_request())
+
+    def test_denial_goes_through_handle_no_permission(self, policy_request):
+        """Test that failures redirect to login unless `raise_exception` is set.
+
+        Parameters
+        ----------
+        policy_request : callable
+            Builds a request from a user.
+
+        """
+        view = make_view(Login())
+        response = view.as_view()(policy_request(AnonymousUser()))
+        assert response.status_code == 302
+        assert response.url == "/accounts/login/?next=/articles/"
+
+        denied = HttpResponse("denied", status=403)
+        view = make_view(Login(), raise_exception=staticmethod(lambda request: denied))
+        assert view.as_view()(policy_request(AnonymousUser())) is denied
+
+    @pytest.mark.parametrize(
+        "build",
+        [
+            lambda: Login() & "staff",
+            lambda: Login() | None,
+            lambda: policy.Not(True),
+            lambda: make_view("staff"),
+            lambda: make_view(Perm()),
+            lambda: make_view(Perm("blog.change_article", obj=True)),
+            lambda: make_view(policy.Group()),
+            lambda: make_view(policy.Test("missing_method")),
+            lambda: make_view(policy.Test(42)),
+            lambda: make_view(None).as_view(),
+        ],
+        ids=[
+            "and-operand",
+            "or-operand",
+            "not-operand",
+            "policy-type",
+            "perm-empty",
+            "perm-obj-without-get-object",
+            "group-empty",
+            "test-unknown-method",
+            "test-not-callable",
+            "missing-policy",
+        ],
+    )
+    def test_misconfiguration_raises(self, build):
+        """Test that invalid policies fail when the view class is built.
+
+        Parameters
+        ----------
+        build : callable
+            Builds the misconfigured rule or view.
+
+        """
+        with pytest.raises(ImproperlyConfigured):
+            build()
+
+    def test_object_permissions_accept_views_with_get_object(self):
+        """Test that `Perm(obj=True)` is allowed on views that fetch objects."""
+        type(
+            "ArticleView",
+            (AccessPolicyMixin, DetailView),
+            {"access_policy": Perm("blog.change_article", obj=True)},
+        )
+
+    def test_rules_without_check_explain_themselves(self):
+        """Test that a rule missing `check` raises a helpful error."""
+
+        class Incomplete(policy.Rule):
+            pass
+
+        with pytest.raises(NotImplementedError, match="Incomplete must implement"):
+            Incomplete().check(None, None)
@@ -0,0 +1,127 @@
+import pytest
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured, PermissionDenied
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.views.generic import View
+
+from sage_tools.mixins.views import ThrottleMixin
+
+
+def make_view(**attrs):
+    """Builds a view allowing two requests per minute.
+
+    Parameters
+    ----------
+    **attrs
+        Further class attributes.
+
+    """
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponse("ok")
+
+    return type(
+        "ThrottledView",
+        (ThrottleMixin, View),
+        {"throttle_rate": "2/m", "get": get, **attrs},
+    ).as_view()
+
+
+def make_request(user=None, ip="10.0.0.1"):
+    """Builds a GET request from `user` at `ip`.
+
+    Parameters
+    ----------
+    user : User, optional
+        The requesting user; anonymous by default.
+    ip : str
+        The client address.
+
+    """
+    request = RequestFactory().get("/search/", REMOTE_ADDR=ip)
+    request.user = user or AnonymousUser()
+    return request
+
+
+def statuses(view, requests):
+    return [view(request).status_code for request in requests]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+alice = User(pk=1, username="alice")
+bob = User(pk=2, username="bob")
+
+
+class TestThrottleMixin:
+    """Test suite for `ThrottleMixin`."""
+
+    def test_over_limit_requests_get_429(self):
+        """Test that the third request in a minute is refused with a retry delay."""
+        view = make_view()
+        responses = [view(make_request()) for _ in range(3)]
+        assert [response.status_code for response in responses] == [200, 200, 429]
+        assert 1 <= int(responses[-1]["Retry-After"]) <= 60
+
+    def test_user_scope(self):
+        """Test that users are counted separately and anonymous users by IP."""
+        view = make_view(throttle_scope="user")
+        assert statuses(view, [make_request(alice)] * 3) == [200, 200, 429]
+        assert statuses(view, [make_request(bob)]) == [200]
+        assert statuses(view, [make_request(), make_request()]) == [200, 200]
+        assert statuses(view, [make_request(ip="10.0.0.2")]) == [200]
+        assert statuses(view, [make_request()]) == [429]
+
+    def test_ip_scope(self):
+        """Test that users behind one address share a counter."""
+        view = make_view(throttle_scope="ip")
+        requests = [make_request(alice), make_request(bob), make_request()]
+        assert statuses(view, requests) == [200, 200, 429]
+        assert statuses(view, [make_request(alice, ip="10.0.0.2")]) == [200]
+
+    def test_view_scope(self):
+        """Test that every client shares the view's counter."""
+        view = make_view(throttle_scope="view")
+        requests = [
+            make_request(alice),
+            make_request(ip="10.0.0.2"),
+            make_request(bob, ip="10.0.0.3"),
+        ]
+        assert statuses(view, requests) == [200, 200, 429]
+
+    def test_throttle_exception_class_is_raised(self):
+        """Test that an exception class is raised for throttled requests."""
+        view = make_view(throttle_exception=PermissionDenied)
+        statuses(view, [make_request()] * 2)
+        with pytest.raises(PermissionDenied):
+            view(make_request())
+
+    def test_throttle_exception_callable_response(self):
+        """Test that a callable's response is returned for throttled requests."""
+        calls = []
+
+        def throttled(request):
+            calls.append(request)
+            return HttpResponse("slow down", status=503)
+
+        view = make_view(throttle_exception=staticmethod(throttled))
+        response = [view(make_request()) for _ in range(3)][-1]
+        assert (response.status_code, response.content) == (503, b"slow down")
+        assert len(calls) == 1
+
+    def test_invalid_scope_fails_at_class_creation(self):
+        """Test that an unknown scope is rejected when the view is defined."""
+        with pytest.raises(ImproperlyConfigured, match="throttle_scope"):
+            make_view(throttle_scope="session")
+
+    def test_invalid_rate_fails_at_class_creation(self):
+        """Test that a malformed rate is rejected when the view is defined."""
+        with pytest.raises(ImproperlyConfigured):
+            make_view(throttle_rate="often")
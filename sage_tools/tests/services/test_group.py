@@ -0,0 +1,103 @@
+from unittest.mock import Mock
+
+import pytest
+from django.core.cache import cache
+from django.http import HttpRequest
+from django.test import override_settings
+
+from sage_tools.services.group import (
+    GroupMembershipService,
+    invalidate_group_membership,
+)
+
+
+def make_request(pk=1, groups=("editors",)):
+    """Builds a request whose user belongs to `groups`.
+
+    Parameters
+    ----------
+    pk : int
+        The primary key of the user.
+    groups : tuple of str
+        The names returned by the user's group query.
+
+    """
+    request = HttpRequest()
+    request.user = Mock(pk=pk)
+    request.user.groups.values_list.return_value = list(groups)
+    return request
+
+
+@pytest.fixture
+def shared_cache():
+    with override_settings(GROUP_MEMBERSHIP_CACHE_TIMEOUT=60):
+        cache.clear()
+        yield cache
+        cache.clear()
+
+
+class TestGroupMembershipService:
+    """Test suite for the `GroupMembershipService` class."""
+
+    def test_groups_are_queried_once_per_request(self):
+        """Test that repeated checks reuse the per-request memo."""
+        request = make_request()
+        assert GroupMembershipService(request).in_any(["editors", "admins"])
+        assert not GroupMembershipService(request).in_any(["admins"])
+        request.user.groups.values_list.assert_called_once_with("name", flat=True)
+
+    def test_shared_cache_serves_later_requests(self, shared_cache):
+        """Test that a second request for the same user does not query.
+
+        Parameters
+        ----------
+        shared_cache : BaseCache
+            The cleared default cache with the shared cache enabled.
+
+        """
+        GroupMembershipService(make_request()).get_group_names()
+        request = make_request(groups=())
+        assert GroupMembershipService(request).get_group_names() == {"editors"}
+        request.user.groups.values_list.assert_not_called()
+
+    def test_membership_change_invalidates_cache(self, shared_cache):
+        """Test that m2m_changed post actions bump the group version.
+
+        Parameters
+        ----------
+        shared_cache : BaseCache
+            The cleared default cache with the shared cache enabled.
+
+        """
+        GroupMembershipService(make_request()).get_group_names()
+        invalidate_group_membership(sender=None, action="pre_add")
+        assert GroupMembershipService(make_request(groups=())).in_any(["editors"])
+
+        invalidate_group_membership(sender=None, action="post_add")
+        request = make_request(groups=("admins",))
+        assert GroupMembershipService(request).get_group_names() == {"admins"}
+
+        # Group saves and deletes send no action
+        invalidate_group_membership(sender=None)
+        request = make_request(groups=())
+        assert GroupMembershipService(request).get_group_names() == frozenset()
+
+    def test_evicted_version_does_not_roll_back(self, shared_cache):
+        """Test that losing the version key never revives old entries.
+
+        Parameters
+        ----------
+        shared_cache : BaseCache
+            The cleared default cache with the shared cache enabled.
+
+        """
+        GroupMembershipService(make_request()).get_group_names()
+        shared_cache.delete(GroupMembershipService.version_key)
+        request = make_request(groups=())
+        assert GroupMembershipService(request).get_group_names() == frozenset()
+
+        GroupMembershipService.invalidate()
+        shared_cache.delete(GroupMembershipService.version_key)
+        GroupMembershipService.invalidate()
+        request = make_request(groups=("admins",))
+        assert GroupMembershipService(request).get_group_names() == {"admins"}
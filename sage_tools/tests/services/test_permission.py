@@ -0,0 +1,193 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from django.contrib import auth
+from django.contrib.auth.models import PermissionsMixin
+from django.core.exceptions import PermissionDenied
+from django.http import HttpRequest
+
+from sage_tools.services.permission import PermissionService
+
+
+class PermBackend:
+    """A backend answering one permission at a time."""
+
+    def __init__(self, granted):
+        self.granted = set(granted)
+        self.calls = []
+
+    def has_perm(self, user_obj, perm, obj=None):
+        self.calls.append(perm)
+        return perm in self.granted
+
+
+class BatchBackend(PermBackend):
+    """A backend implementing the batch hook."""
+
+    def has_perms_map(self, user_obj, perms, obj=None):
+        self.calls.append(tuple(perms))
+        return {perm: perm in self.granted for perm in perms}
+
+
+class Post:
+    """A stand-in for a model instance."""
+
+    def __init__(self, pk):
+        self.pk = pk
+
+
+class DefaultUser:
+    """A user whose `has_perm` is Django's."""
+
+    has_perm = PermissionsMixin.has_perm
+
+    def __init__(self, is_superuser=False):
+        self.pk = 1
+        self.is_active = True
+        self.is_superuser = is_superuser
+
+
+class AdminBypassUser(DefaultUser):
+    """A user model granting every permission to admins."""
+
+    is_admin = True
+
+    def has_perm(self, perm, obj=None):
+        return self.is_admin or super().has_perm(perm, obj)
+
+
+@pytest.fixture
+def batch_request():
+    request = HttpRequest()
+    request.user = DefaultUser()
+    return request
+
+
+@pytest.fixture
+def perm_request():
+    request = HttpRequest()
+    request.user = Mock(pk=1, is_active=True, is_superuser=False)
+    request.user.has_perm.side_effect = lambda perm, obj=None: perm == "app.view"
+    return request
+
+
+class TestPermissionService:
+    """Test suite for the `PermissionService` class."""
+
+    def test_results_are_memoized_per_request(self, perm_request):
+        """Test that a permission is resolved once per request.
+
+        Parameters
+        ----------
+        perm_request : HttpRequest
+            A request whose user only has `app.view`.
+
+        """
+        with patch.object(auth, "get_backends", return_value=[]):
+            for _ in range(3):
+                assert PermissionService(perm_request).has_perm("app.view")
+        perm_request.user.has_perm.assert_called_once_with("app.view", None)
+
+    def test_objects_are_cached_separately(self, perm_request):
+        """Test that object-level results are keyed by the object.
+
+        Parameters
+        ----------
+        perm_request : HttpRequest
+            A request whose user only has `app.view`.
+
+        """
+        service = PermissionService(perm_request)
+        service.has_perm("app.view", Post(1))
+        service.has_perm("app.view", Post(2))
+        service.has_perm("app.view", Post(1))
+        assert perm_request.user.has_perm.call_count == 2
+
+    def test_any_and_all_short_circuit(self, perm_request):
+        """Test that evaluation stops at the deciding permission.
+
+        Parameters
+        ----------
+        perm_request : HttpRequest
+            A request whose user only has `app.view`.
+
+        """
+        service = PermissionService(perm_request)
+        with patch.object(auth, "get_backends", return_value=[]):
+            assert service.has_any(["app.view", "app.add", "app.change"])
+            assert not service.has_all(["app.delete", "app.view"])
+        checked = [call.args[0] for call in perm_request.user.has_perm.call_args_list]
+        assert checked == ["app.view", "app.delete"]
+
+    def test_batch_hook_resolves_all_permissions_at_once(self, batch_request):
+        """Test that a backend with `has_perms_map` is called once.
+
+        Parameters
+        ----------
+        batch_request : HttpRequest
+            A request whose user has Django's `has_perm`.
+
+        """
+        batch = BatchBackend({"app.add"})
+        single = PermBackend({"app.change"})
+        service = PermissionService(batch_request)
+        with patch.object(auth, "get_backends", return_value=[batch, single]):
+            service.prefetch(["app.add", "app.change", "app.delete"])
+            assert service.has_all(["app.add", "app.change"])
+            assert not service.has_any(["app.delete"])
+        assert batch.calls == [("app.add", "app.change", "app.delete")]
+        assert single.calls == ["app.change", "app.delete"]
+
+    def test_permission_denied_stops_later_backends(self, batch_request):
+        """Test that a backend raising PermissionDenied denies its perms.
+
+        Parameters
+        ----------
+        batch_request : HttpRequest
+            A request whose user has Django's `has_perm`.
+
+        """
+        denying = BatchBackend(set())
+        denying.has_perms_map = Mock(side_effect=PermissionDenied)
+        granting = PermBackend({"app.add", "app.change"})
+        service = PermissionService(batch_request)
+        with patch.object(auth, "get_backends", return_value=[denying, granting]):
+            assert not service.has_any(["app.add", "app.change"])
+        assert granting.calls == []
+
+    def test_superusers_skip_backends(self, batch_request):
+        """Test that active superusers are granted everything.
+
+        Parameters
+        ----------
+        batch_request : HttpRequest
+            A request whose user has Django's `has_perm`.
+
+        """
+        batch_request.user = DefaultUser(is_superuser=True)
+        batch = BatchBackend(set())
+        with patch.object(auth, "get_backends", return_value=[batch]):
+            assert PermissionService(batch_request).has_all(["app.add", "app.change"])
+        assert batch.calls == []
+
+    def test_overridden_has_perm_is_not_bypassed(self, batch_request):
+        """Test that a custom `User.has_perm` still decides the outcome.
+
+        Parameters
+        ----------
+        batch_request : HttpRequest
+            A request whose user has Django's `has_perm`.
+
+        """
+        batch_request.user = AdminBypassUser()
+        batch = BatchBackend(set())
+        with patch.object(auth, "get_backends", return_value=[batch]):
+            assert PermissionService(batch_request).has_all(["app.add", "app.change"])
+        assert batch.calls == []
+
+        request = HttpRequest()
+        request.user = AdminBypassUser()
+        request.user.is_admin = False
+        with patch.object(auth, "get_backends", return_value=[batch]):
+            assert not PermissionService(request).has_any(["app.add", "app.change"])
+        assert batch.calls == ["app.add", "app.change"]
@@ -0,0 +1,187 @@
+from types import SimpleNamespace
+
+import pytest
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.template.response import SimpleTemplateResponse
+from django.test import RequestFactory
+
+from sage_tools.services.response_cache import ResponseCache
+
+
+class NameTemplate:
+    """A backend template rendering the `name` context variable."""
+
+    def render(self, context=None, request=None):
+        return context["name"]
+
+
+@pytest.fixture
+def response_cache():
+    cache.clear()
+    yield ResponseCache("test", timeout=60)
+    cache.clear()
+
+
+@pytest.fixture
+def rf():
+    return RequestFactory()
+
+
+class TestResponseCache:
+    """Test suite for the `ResponseCache` class."""
+
+    def test_stored_response_is_returned(self, response_cache, rf):
+        """Test that a stored response is served for the same key parts.
+
+        Parameters
+        ----------
+        response_cache : ResponseCache
+            A response cache with a 60 second timeout.
+        rf : RequestFactory
+            A factory for building requests.
+
+        """
+        request = rf.get("/articles/?page=2")
+        assert response_cache.get(request, ["/articles/?page=2", "en"]) is None
+        response_cache.set(request, ["/articles/?page=2", "en"], HttpResponse("hi"))
+
+        cached = response_cache.get(request, ["/articles/?page=2", "en"])
+        assert cached.content == b"hi"
+        assert response_cache.get(request, ["/articles/?page=2", "fr"]) is None
+
+    def test_vary_headers_are_part_of_the_key(self, response_cache, rf):
+        """Test that requests with other values of a Vary header miss.
+
+        Parameters
+        ----------
+        response_cache : ResponseCache
+            A response cache with a 60 second timeout.
+        rf : RequestFactory
+            A factory for building requests.
+
+        """
+        response = HttpResponse("json")
+        response["Vary"] = "Accept"
+        response_cache.set(rf.get("/", HTTP_ACCEPT="application/json"), ["/"], response)
+
+        assert response_cache.get(rf.get("/", HTTP_ACCEPT="application/json"), ["/"])
+        assert response_cache.get(rf.get("/", HTTP_ACCEPT="text/html"), ["/"]) is None
+
+    def test_template_responses_are_stored_once_rendered(self, response_cache, rf):
+        """Test that lazy template responses are cached after rendering.
+
+        Parameters
+        ----------
+        response_cache : ResponseCache
+            A response cache with a 60 second timeout.
+        rf : RequestFactory
+            A factory for building requests.
+
+        """
+        request = rf.get("/")
+        response = SimpleTemplateResponse(NameTemplate(), {"name": "page"})
+        response_cache.set(request, ["/"], response)
+        assert response_cache.get(request, ["/"]) is None
+
+        response.render()
+        assert response_cache.get(request, ["/"]).content == b"page"
+
+    @pytest.mark.parametrize(
+        "response, header",
+        [
+            (HttpResponse(status=404), None),
+            (HttpResponse(), ("Cache-Control", "private, max-age=60")),
+            (HttpResponse(), ("Cache-Control", "no-store")),
+            (HttpResponse(), ("Cache-Control", "max-age=0")),
+            (HttpResponse(), ("Vary", "*")),
+            (StreamingHttpResponse(iter([b"x"])), None),
+        ],
+    )
+    def test_unshareable_responses_are_skipped(
+        self, response_cache, rf, response, header
+    ):
+        """Test that responses which must not be shared are not stored.
+
+        Parameters
+        ----------
+        response_cache : ResponseCache
+            A response cache with a 60 second timeout.
+        rf : RequestFactory
+            A factory for building requests.
+        response : HttpResponse
+            The response to store.
+        header : tuple or None
+            A header to set on the response.
+
+        """
+        if header is not None:
+            response[header[0]] = header[1]
+        request = rf.get("/")
+        response_cache.set(request, ["/"], response)
+        assert response_cache.get(request, ["/"]) is None
+
+    def test_cookies_and_csrf_tokens_are_not_shared(self, response_cache, rf):
+        """Test that per-client responses are not stored.
+
+        Parameters
+        ----------
+        response_cache : ResponseCache
+            A response cache with a 60 second timeout.
+        rf : RequestFactory
+            A factory for building requests.
+
+        """
+        request = rf.get("/")
+        response = HttpResponse()
+        response.set_cookie("seen", "1")
+        response_cache.set(request, ["/"], response)
+
+        request.META["CSRF_COOKIE_NEEDS_UPDATE"] = True
+        response_cache.set(request, ["/"], HttpResponse())
+        assert response_cache.get(request, ["/"]) is None
+
+    @pytest.mark.parametrize(
+        "attribute, state",
+        [
+            ("session", SimpleNamespace(accessed=True, modified=False)),
+            ("session", SimpleNamespace(accessed=False, modified=True)),
+            ("_messages", SimpleNamespace(used=True, added_new=False)),
+            ("_messages", SimpleNamespace(used=False, added_new=True)),
+        ],
+    )
+    def test_session_and_message_use_prevents_sharing(
+        self, response_cache, rf, attribute, state
+    ):
+        """Test that responses built from per-client state are not stored.
+
+        Parameters
+        ----------
+        response_cache : ResponseCache
+            A response cache with a 60 second timeout.
+        rf : RequestFactory
+            A factory for building requests.
+        attribute : str
+            The request attribute holding the state.
+        state : SimpleNamespace
+            The session or message storage flags.
+
+        """
+        request = rf.get("/")
+        setattr(request, attribute, state)
+        response_cache.set(request, ["/"], HttpResponse())
+        assert response_cache.get(request, ["/"]) is None
+
+    def test_max_age_shortens_the_timeout(self, response_cache):
+        """Test that a shorter max-age takes precedence over the timeout.
+
+        Parameters
+        ----------
+        response_cache : ResponseCache
+            A response cache with a 60 second timeout.
+
+        """
+        response = HttpResponse()
+        assert response_cache.get_timeout(response) == 60
+        response["Cache-Control"] = "max-age=10"
+        assert response_cache.get_timeout(response) == 10
@@ -0,0 +1,80 @@
+import pytest
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+
+from sage_tools.services.throttle import RateLimiter
+
+
+@pytest.fixture
+def limiter():
+    cache.clear()
+    yield RateLimiter("3/m", key_prefix="test")
+    cache.clear()
+
+
+class TestRateLimiter:
+    """Test suite for the `RateLimiter` class."""
+
+    @pytest.mark.parametrize(
+        "rate, expected",
+        [
+            ("100/m", (100, 60)),
+            ("10/s", (10, 1)),
+            ("20/15m", (20, 900)),
+            ((5, 30), (5, 30)),
+        ],
+    )
+    def test_parse_rate(self, rate, expected):
+        """Test that string and tuple rates are parsed.
+
+        Parameters
+        ----------
+        rate : str or tuple
+            The configured rate.
+        expected : tuple
+            The expected `(count, seconds)` pair.
+
+        """
+        assert RateLimiter.parse_rate(rate) == expected
+
+    @pytest.mark.parametrize("rate", ["100", "x/m", "0/m", (1, 0), "5/w"])
+    def test_invalid_rate_raises(self, rate):
+        """Test that malformed rates are rejected.
+
+        Parameters
+        ----------
+        rate : str or tuple
+            The configured rate.
+
+        """
+        with pytest.raises(ImproperlyConfigured):
+            RateLimiter.parse_rate(rate)
+
+    def test_hits_over_the_limit_are_throttled(self, limiter):
+        """Test that the fourth hit in a window is refused with a retry delay.
+
+        Parameters
+        ----------
+        limiter : RateLimiter
+            A limiter allowing three hits per minute.
+
+        """
+        assert [limiter.hit("a", now=600.0) for _ in range(3)] == [None] * 3
+        assert limiter.hit("a", now=610.0) == 50
+        assert limiter.hit("b", now=610.0) is None
+
+    def test_previous_window_is_weighted(self, limiter):
+        """Test that the sliding window forgets old hits gradually.
+
+        Parameters
+        ----------
+        limiter : RateLimiter
+            A limiter allowing three hits per minute.
+
+        """
+        for _ in range(3):
+            limiter.hit("a", now=630.0)
+        # Early in the next window most of the previous hits still count
+        assert limiter.hit("a", now=665.0) is not None
+        # Near its end they have almost expired
+        assert limiter.hit("a", now=715.0) is None
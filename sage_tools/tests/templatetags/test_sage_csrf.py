@@ -0,0 +1,21 @@
+from django.template import Context, Engine
+from django.test import override_settings
+
+engine = Engine(libraries={"sage_csrf": "sage_tools.templatetags.sage_csrf"})
+template = engine.from_string("{% load sage_csrf %}{% secure_csrf_token %}")
+
+
+class TestSecureCsrfTokenTag:
+    """Test suite for the `secure_csrf_token` template tag."""
+
+    @override_settings(CSRF_INPUT_NAME="secure_token")
+    def test_renders_custom_field_name(self):
+        """Test that the hidden input uses `settings.CSRF_INPUT_NAME`."""
+        html = template.render(Context({"csrf_token": "abc<"}))
+        assert html == '<input type="hidden" name="secure_token" value="abc&lt;">'
+
+    @override_settings(CSRF_INPUT_NAME="secure_token")
+    def test_renders_nothing_without_token(self):
+        """Test that nothing is rendered when no token is available."""
+        assert template.render(Context({})) == ""
+        assert template.render(Context({"csrf_token": "NOTPROVIDED"})) == ""
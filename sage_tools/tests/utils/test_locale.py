@@ -0,0 +1,41 @@
+import pytest
+from django.test import override_settings
+
+from sage_tools.utils.locale import MultilingualService
+
+LANGUAGES = [("en", "English"), ("fa", "Persian"), ("zh-hans", "Chinese")]
+
+
+class TestMultilingualService:
+    """Test suite for the `MultilingualService` class."""
+
+    @pytest.fixture(autouse=True)
+    def languages(self):
+        with override_settings(LANGUAGES=LANGUAGES, LANGUAGE_CODE="en"):
+            yield
+
+    def test_remove_language_prefix(self):
+        """Test that only configured language prefixes are stripped."""
+        assert MultilingualService.remove_language_prefix("/fa/about/") == "/about/"
+        assert MultilingualService.remove_language_prefix("/zh-hans/") == "/"
+        assert MultilingualService.remove_language_prefix("/de/about/") == "/de/about/"
+        assert MultilingualService.remove_language_prefix("/fa") == "/fa"
+        assert MultilingualService.remove_language_prefix("/fashion/") == "/fashion/"
+
+    def test_split_language_prefix(self):
+        """Test that the prefix and the remaining path are returned."""
+        assert MultilingualService.split_language_prefix("/fa/a/b") == ("fa", "/a/b")
+        assert MultilingualService.split_language_prefix("/a/b") == (None, "/a/b")
+
+    def test_get_language_prefix(self):
+        """Test that non-default languages get a prefix and the default not."""
+        assert MultilingualService.get_language_prefix("/fa/about/", "en") == "/about/"
+        assert MultilingualService.get_language_prefix("/about/", "fa") == "/fa/about/"
+
+    def test_language_codes_follow_setting_changes(self):
+        """Test that the cached codes are rebuilt when `LANGUAGES` changes."""
+        assert "fa" in MultilingualService.get_language_codes()
+        with override_settings(LANGUAGES=[("de", "German")]):
+            assert MultilingualService.get_language_codes() == frozenset({"de"})
+            assert MultilingualService.remove_language_prefix("/fa/x/") == "/fa/x/"
+        assert "fa" in MultilingualService.get_language_codes()
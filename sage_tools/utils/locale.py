@@ -21,7 +21,11 @@ language context.
 
 """
 
+from typing import FrozenSet, Optional, Tuple
+
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 
 
 class MultilingualService:
@@ -40,6 +44,10 @@ class MultilingualService:
         Adds the specified language prefix to the given URL.
     remove_language_prefix(url)
         Removes any existing language prefix from the given URL.
+    split_language_prefix(url)
+        Splits the URL into its language prefix, if any, and the remaining path.
+    get_language_codes()
+        Returns the set of language codes from `settings.LANGUAGES`.
 
     Examples
     --------
@@ -50,8 +58,38 @@ class MultilingualService:
     >>> MultilingualService.remove_language_prefix('/de/example/')
     '/example/'
 
+    Notes
+    -----
+    The language codes are indexed in a frozenset the first time they are
+    needed, so prefix detection is a single set lookup on the first path
+    segment regardless of how many languages are configured. The index is
+    rebuilt when `LANGUAGES` changes through the `setting_changed` signal.
+
     """
 
+    _language_codes: Optional[FrozenSet[str]] = None
+
+    @classmethod
+    def get_language_codes(cls) -> FrozenSet[str]:
+        """Return the language codes configured in `settings.LANGUAGES`.
+
+        Returns
+        -------
+        frozenset of str
+            The configured language codes, built once and cached.
+
+        """
+        codes = cls._language_codes
+        if codes is None:
+            codes = frozenset(code for code, _ in settings.LANGUAGES)
+            cls._language_codes = codes
+        return codes
+
+    @classmethod
+    def clear_cache(cls):
+        """Drop the cached language codes so they are rebuilt on next use."""
+        cls._language_codes = None
+
     @classmethod
     def get_language_prefix(cls, url, language):
         """Process the given URL to add or remove the language prefix based on
@@ -103,9 +141,9 @@ class MultilingualService:
     def remove_language_prefix(cls, url):
         """Remove any existing language prefix from the given URL.
 
-        This method iterates through the available languages and removes the corresponding prefix
-        from the URL, if present. It is designed to strip language codes from URLs in a
-        language-agnostic manner.
+        This method strips a leading language code from the URL, if the first
+        path segment is one of the configured languages. It is designed to
+        strip language codes from URLs in a language-agnostic manner.
 
         Parameters
         ----------
@@ -118,8 +156,38 @@ class MultilingualService:
             The URL with any language prefix removed.
 
         """
-        for lang_code, _ in settings.LANGUAGES:
-            prefix = f"/{lang_code}/"
-            if url.startswith(prefix):
-                return url[len(prefix) - 1 :]
-        return url
+        return cls.split_language_prefix(url)[1]
+
+    @classmethod
+    def split_language_prefix(cls, url) -> Tuple[Optional[str], str]:
+        """Split the given URL into its language prefix and the remaining path.
+
+        Only a first path segment followed by a slash counts as a prefix, so
+        `/en/about/` yields `("en", "/about/")` while `/en` is left intact.
+
+        Parameters
+        ----------
+        url : str
+            The URL to split.
+
+        Returns
+        -------
+        tuple of (str or None, str)
+            The language code of the prefix, or None if there is none, and the
+            URL without the prefix.
+
+        """
+        if url.startswith("/"):
+            end = url.find("/", 1)
+            if end != -1:
+                language = url[1:end]
+                if language in cls.get_language_codes():
+                    return language, url[end:]
+        return None, url
+
+
+@receiver(setting_changed)
+def reset_language_codes(*, setting, **kwargs):
+    """Clears the cached language codes when `LANGUAGES` is changed."""
+    if setting == "LANGUAGES":
+        MultilingualService.clear_cache()